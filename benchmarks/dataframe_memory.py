@@ -0,0 +1,82 @@
+"""
+Memory used by a large Assignments dataframe, with and without the column types of
+`assignmentsColumnTypes` (see "Column Types" in docs/dataframes.rst).
+
+Usage (with veroviz installed, or with PYTHONPATH=. from the repository root):
+	python benchmarks/dataframe_memory.py [numRows]
+
+The "untyped" dataframe is built from the same columns with pandas' default type
+inference (as veroviz did before the column types were added): numeric columns are
+float64/int64 and every text column is an `object` column.
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from veroviz._params import assignmentsColumnList
+from veroviz._utilities import privInitDataframe
+
+def buildAssignmentsData(numRows):
+	# A fleet of 500 vehicles, each route leg with 50 shapepoints
+	rng = np.random.default_rng(0)
+	return {
+		'odID': np.arange(numRows) // 50,
+		'objectID': ['vehicle %d' % (i % 500) for i in range(numRows)],
+		'modelFile': ['/veroviz/models/ub_truck.gltf'] * numRows,
+		'modelScale': [100] * numRows,
+		'modelMinPxSize': [75] * numRows,
+		'startTimeSec': rng.random(numRows),
+		'startLat': rng.random(numRows),
+		'startLon': rng.random(numRows),
+		'startAltMeters': [0] * numRows,
+		'endTimeSec': rng.random(numRows),
+		'endLat': rng.random(numRows),
+		'endLon': rng.random(numRows),
+		'endAltMeters': [0] * numRows,
+		'leafletColor': ['orange'] * numRows,
+		'leafletWeight': [3] * numRows,
+		'leafletStyle': ['solid'] * numRows,
+		'leafletOpacity': [0.8] * numRows,
+		'leafletCurveType': ['straight'] * numRows,
+		'leafletCurvature': [0] * numRows,
+		'useArrows': [True] * numRows,
+		'cesiumColor': ['orange'] * numRows,
+		'cesiumWeight': [3] * numRows,
+		'cesiumStyle': ['solid'] * numRows,
+		'cesiumOpacity': [0.8] * numRows,
+		'ganttColor': ['darkgray'] * numRows,
+		'popupText': ['route %d' % (i // 50) for i in range(numRows)],
+		'startElevMeters': [None] * numRows,
+		'endElevMeters': [None] * numRows,
+		'wayname': ['Main St %d' % (i % 300) for i in range(numRows)],
+		'waycategory': [None] * numRows,
+		'surface': ['Paved'] * numRows,
+		'waytype': ['Road'] * numRows,
+		'steepness': [0] * numRows,
+		'tollway': [False] * numRows,
+	}
+
+def main(numRows):
+	data = buildAssignmentsData(numRows)
+
+	startTime = time.time()
+	untyped = pd.DataFrame(data, columns=assignmentsColumnList)
+	untypedSec = time.time() - startTime
+	untypedMB = untyped.memory_usage(deep=True).sum() / 1e6
+	del untyped
+
+	startTime = time.time()
+	typed = privInitDataframe('Assignments', data)
+	typedSec = time.time() - startTime
+	typedMB = typed.memory_usage(deep=True).sum() / 1e6
+
+	print("Assignments dataframe with %d rows" % (numRows))
+	print("  untyped: memory_usage(deep=True) = %8.1f MB  (built in %.1f s)" % (untypedMB, untypedSec))
+	print("  typed:   memory_usage(deep=True) = %8.1f MB  (built in %.1f s)" % (typedMB, typedSec))
+	print("  reduction: %.0f%%" % (100 * (1 - typedMB / untypedMB)))
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
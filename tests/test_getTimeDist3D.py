@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from veroviz._buildFlightProfile import buildNoLoiteringFlight
+from veroviz._buildFlightProfile import getTimeDistFromFlight
+from veroviz._buildFlightProfile import getTimeDistFromFlightArray
+
+ROUTE_TYPES = ['square', 'trapezoidal', 'triangular', 'straight']
+CRUISE_ALT = 100.0
+SPEEDS = dict(takeoffSpeedMPS=5.0, rateOfClimbMPS=2.0, cruiseSpeedMPS=20.0, landSpeedMPS=3.0, rateOfDescentMPS=2.0)
+
+def _perPair(routeType, startLoc, endLoc):
+	# `_buildFlightProfile()` cannot build some flights (e.g., starting above the cruise altitude)
+	try:
+		flight = buildNoLoiteringFlight(routeType, startLoc, CRUISE_ALT, endLoc, SPEEDS['takeoffSpeedMPS'], SPEEDS['rateOfClimbMPS'], SPEEDS['cruiseSpeedMPS'], SPEEDS['landSpeedMPS'], SPEEDS['rateOfDescentMPS'])
+		return getTimeDistFromFlight(flight)
+	except ValueError:
+		return [np.nan, np.nan, np.nan]
+
+@pytest.mark.filterwarnings('ignore::FutureWarning', 'ignore::DeprecationWarning')
+@pytest.mark.parametrize('routeType', ROUTE_TYPES)
+def test_flight_array_matches_flight_profile(routeType):
+	rng = np.random.default_rng(2024)
+	numPairs = 150
+	startLats = 42.8 + rng.uniform(-0.02, 0.02, numPairs)
+	startLons = -78.8 + rng.uniform(-0.02, 0.02, numPairs)
+	endLats = startLats + rng.choice([1e-4, 1e-3, 1e-2], numPairs) * rng.uniform(-1, 1, numPairs)
+	endLons = startLons + rng.choice([1e-4, 1e-3, 1e-2], numPairs) * rng.uniform(-1, 1, numPairs)
+	# Altitudes both below and above the cruise altitude
+	startAlts = rng.choice([0.0, 0.0, 30.0, 90.0, 150.0], numPairs)
+	endAlts = rng.choice([0.0, 0.0, 30.0, 90.0, 150.0], numPairs)
+
+	[time, groundDistance, flightDistance] = getTimeDistFromFlightArray(routeType, startLats, startLons, startAlts, endLats, endLons, endAlts, CRUISE_ALT, SPEEDS['takeoffSpeedMPS'], SPEEDS['rateOfClimbMPS'], SPEEDS['cruiseSpeedMPS'], SPEEDS['landSpeedMPS'], SPEEDS['rateOfDescentMPS'])
+
+	expected = np.array([_perPair(routeType, [startLats[i], startLons[i], startAlts[i]], [endLats[i], endLons[i], endAlts[i]]) for i in range(numPairs)], dtype=float)
+	np.testing.assert_allclose(time, expected[:, 0], rtol=1e-7, atol=1e-6)
+	np.testing.assert_allclose(groundDistance, expected[:, 1], rtol=1e-7, atol=1e-6)
+	np.testing.assert_allclose(flightDistance, expected[:, 2], rtol=1e-7, atol=1e-6)
+
+@pytest.mark.filterwarnings('ignore::FutureWarning', 'ignore::DeprecationWarning')
+def test_flight_array_end_above_cruise():
+	# End above the cruise altitude
+	[time, groundDistance, flightDistance] = getTimeDistFromFlightArray('trapezoidal', np.array([42.8]), np.array([-78.9]), np.array([0.0]), np.array([42.82]), np.array([-78.88]), np.array([150.0]), CRUISE_ALT, SPEEDS['takeoffSpeedMPS'], SPEEDS['rateOfClimbMPS'], SPEEDS['cruiseSpeedMPS'], SPEEDS['landSpeedMPS'], SPEEDS['rateOfDescentMPS'])
+	expected = _perPair('trapezoidal', [42.8, -78.9, 0.0], [42.82, -78.88, 150.0])
+	np.testing.assert_allclose([time[0], groundDistance[0], flightDistance[0]], expected, rtol=1e-7)
@@ -9,6 +9,7 @@ from veroviz.snapNodesToRoad import snapNodesToRoad
 from veroviz.snapNodesToRoad import getSnapLoc
 from veroviz.snapNodesToRoad import getSnapLocBatch
 from veroviz.getTimeDist2D import getTimeDist2D
+from veroviz.getTimeDist2D import extendTimeDist2D
 from veroviz.getTimeDistScalar2D import getTimeDistScalar2D
 from veroviz.getTimeDist3D import getTimeDist3D
 from veroviz.getTimeDistScalar3D import getTimeDistScalar3D
@@ -20,11 +21,20 @@ from veroviz.createAssignments import addStaticAssignment
 from veroviz.createAssignments import createAssignmentsFromArcs2D
 from veroviz.createAssignments import createAssignmentsFromNodeSeq2D
 from veroviz.createAssignments import createAssignmentsFromLocSeq2D
+from veroviz.createAssignments import AssignmentsBuilder
 
 # Utilities
 from veroviz.utilities import *
 from veroviz._utilities import *
 
+# Asynchronous versions of data provider queries
+from veroviz.asyncQueries import getTimeDist2DAsync
+from veroviz.asyncQueries import getShapepoints2DAsync
+from veroviz.asyncQueries import getSnapLocBatchAsync
+from veroviz.asyncQueries import geocodeAsync
+from veroviz.asyncQueries import getElevationLocsAsync
+from veroviz.asyncQueries import isochronesAsync
+
 # Visualize objects
 from veroviz.createLeaflet import createLeaflet
 from veroviz.createLeaflet import addLeafletCircle
@@ -47,6 +57,8 @@ from veroviz._geometry import *
 # pgRouting related
 from veroviz._queryPgRouting import pgrGetSnapToRoadLatLon
 from veroviz._queryPgRouting import pgrGetNearestStreet
+from veroviz._queryPgRouting import pgrGetNearestStreetBatch
+from veroviz._queryPgRouting import pgrGetSnapToRoadLatLonBatch
 from veroviz._queryPgRouting import pgrGetShapepointsTimeDist
 from veroviz._queryPgRouting import pgrGetTimeDist
 
@@ -101,6 +113,16 @@ from veroviz._buildFlightProfile import addLoiterTimeToFlight
 
 # Function related to travel matrices generating
 from veroviz._getTimeDistFromLocs2D import getTimeDistFromLocs2D
+from veroviz._timeDistMatrix import TimeDistMatrix
+from veroviz._timeDistMatrix import SparseTimeDistMatrix
+from veroviz._timeDistCache import getTimeDistCacheStats
+from veroviz._timeDistCache import clearTimeDistCache
+from veroviz._routeCache import getRouteCacheStats
+from veroviz._routeCache import clearRouteCache
+
+# Statistics for data provider requests
+from veroviz._httpClient import getHttpStats
+from veroviz._httpClient import privHttpRequest
 
 # Functions related to snapping nodes to road
 from veroviz._getSnapLoc import privGetSnapLocBatch
@@ -124,8 +146,7 @@ def checkVersion():
 	currentVersion = __version__
 	latestVersion = ""
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', "https://pypi.python.org/pypi/veroviz/json")
+		response = privHttpRequest('GET', "https://pypi.python.org/pypi/veroviz/json", maxRetries=0)
 		data = json.loads(response.data.decode('utf-8'))
 		latestVersion = data['info']['version']
 		if (currentVersion == latestVersion):
@@ -218,8 +239,34 @@ def setGlobal(newConfig):
 		config['VRV_SETTING_PGROUTING_HOST'] = newConfig['VRV_SETTING_PGROUTING_HOST']
 	if ('VRV_SETTING_PGROUTING_PASSWORD' in newConfig):
 		config['VRV_SETTING_PGROUTING_PASSWORD'] = newConfig['VRV_SETTING_PGROUTING_PASSWORD']
+	if ('VRV_SETTING_PGROUTING_MAX_CONNECTIONS' in newConfig):
+		config['VRV_SETTING_PGROUTING_MAX_CONNECTIONS'] = newConfig['VRV_SETTING_PGROUTING_MAX_CONNECTIONS']
 	if ('VRV_SETTING_SHOWOUTPUTMESSAGE' in newConfig):
 		config['VRV_SETTING_SHOWOUTPUTMESSAGE'] = newConfig['VRV_SETTING_SHOWOUTPUTMESSAGE']
 	if ('VRV_SETTING_SHOWWARNINGMESSAGE' in newConfig):
 		config['VRV_SETTING_SHOWWARNINGMESSAGE'] = newConfig['VRV_SETTING_SHOWWARNINGMESSAGE']
+	if ('VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE' in newConfig):
+		config['VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE'] = newConfig['VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE']
+	if ('VRV_SETTING_ORS_REQUESTS_PER_MINUTE' in newConfig):
+		config['VRV_SETTING_ORS_REQUESTS_PER_MINUTE'] = newConfig['VRV_SETTING_ORS_REQUESTS_PER_MINUTE']
+	if ('VRV_SETTING_HTTP_MAX_RETRIES' in newConfig):
+		config['VRV_SETTING_HTTP_MAX_RETRIES'] = newConfig['VRV_SETTING_HTTP_MAX_RETRIES']
+	if ('VRV_SETTING_HTTP_TIMEOUT_SECONDS' in newConfig):
+		config['VRV_SETTING_HTTP_TIMEOUT_SECONDS'] = newConfig['VRV_SETTING_HTTP_TIMEOUT_SECONDS']
+	if ('VRV_SETTING_HTTP_MAX_CONNECTIONS_PER_HOST' in newConfig):
+		config['VRV_SETTING_HTTP_MAX_CONNECTIONS_PER_HOST'] = newConfig['VRV_SETTING_HTTP_MAX_CONNECTIONS_PER_HOST']
+	if ('VRV_SETTING_ASYNC_MAX_WORKERS' in newConfig):
+		config['VRV_SETTING_ASYNC_MAX_WORKERS'] = newConfig['VRV_SETTING_ASYNC_MAX_WORKERS']
+	if ('VRV_SETTING_TIMEDIST_CACHE_FILE' in newConfig):
+		config['VRV_SETTING_TIMEDIST_CACHE_FILE'] = newConfig['VRV_SETTING_TIMEDIST_CACHE_FILE']
+	if ('VRV_SETTING_TIMEDIST_CACHE_TTL_SECONDS' in newConfig):
+		config['VRV_SETTING_TIMEDIST_CACHE_TTL_SECONDS'] = newConfig['VRV_SETTING_TIMEDIST_CACHE_TTL_SECONDS']
+	if ('VRV_SETTING_TIMEDIST_CACHE_MAX_ENTRIES' in newConfig):
+		config['VRV_SETTING_TIMEDIST_CACHE_MAX_ENTRIES'] = newConfig['VRV_SETTING_TIMEDIST_CACHE_MAX_ENTRIES']
+	if ('VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES' in newConfig):
+		config['VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES'] = newConfig['VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES']
+	if ('VRV_SETTING_ROUTE_CACHE_FILE' in newConfig):
+		config['VRV_SETTING_ROUTE_CACHE_FILE'] = newConfig['VRV_SETTING_ROUTE_CACHE_FILE']
+	if ('VRV_SETTING_ROUTE_CACHE_TTL_SECONDS' in newConfig):
+		config['VRV_SETTING_ROUTE_CACHE_TTL_SECONDS'] = newConfig['VRV_SETTING_ROUTE_CACHE_TTL_SECONDS']
 	return
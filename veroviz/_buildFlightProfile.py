@@ -5,6 +5,7 @@ from veroviz._utilities import privConvertSpeed    # FIXME -- Where is this used
 from veroviz._geometry import geoMileageInPath2D
 from veroviz._geometry import geoDistancePath2D
 from veroviz._geometry import geoDistance2D
+from veroviz._geometry import geoDistance2DArray
 
 from veroviz._internal import loc2Dict
 from veroviz._internal import locs2Dict
@@ -141,18 +142,18 @@ def _buildFlightProfile(startLoc, cruiseAltMetersAGL, endLoc, takeoffSpeedMPS, r
 	# Total ground distance
 	totalGroundDistance = geoDistancePath2D(markPath)
 
-	# Flight Profile dataframe
-	flight = pd.DataFrame(columns=['lat', 'lon', 'altAGL', 'accuGroundDistance', 'description', 'loiterTime'])
+	# Flight Profile rows, the dataframe is built once all waypoints are known
+	flightRows = []
 
 	# For the first location, add one row
-	flight = flight.append({
+	flightRows.append({
 		'lat': dicStartLoc['lat'],
 		'lon': dicStartLoc['lon'],
 		'altAGL': dicStartLoc['alt'],
 		'accuGroundDistance': 0.0,
 		'description': "beforeTakeoff",
 		'loiterTime': 0.0
-		}, ignore_index=True)	
+		})	
 
 	# Check if distance is enough for taking off and landing
 	if (totalGroundDistance > idealTakeoffGroundDistance + idealLandingGroundDistance):
@@ -161,22 +162,22 @@ def _buildFlightProfile(startLoc, cruiseAltMetersAGL, endLoc, takeoffSpeedMPS, r
 		landingMileage = geoMileageInPath2D(markPath, totalGroundDistance - idealLandingGroundDistance)
 
 		# if can cruise, it means we need two locations
-		flight = flight.append({
+		flightRows.append({
 			'lat': takeoffMileage['loc'][0],
 			'lon': takeoffMileage['loc'][1],
 			'altAGL': cruiseAltMetersAGL,
 			'accuGroundDistance': idealTakeoffGroundDistance,
 			'description': "takeoffAtAlt",
 			'loiterTime': 0.0
-			}, ignore_index=True)
-		flight = flight.append({
+			})
+		flightRows.append({
 			'lat': landingMileage['loc'][0],
 			'lon': landingMileage['loc'][1],
 			'altAGL': cruiseAltMetersAGL,
 			'accuGroundDistance': totalGroundDistance - idealLandingGroundDistance,
 			'description': "arrivalAtAlt",
 			'loiterTime': 0.0
-			}, ignore_index=True)
+			})
 	else:
 		# if can not reach cruise altitude, the profile is "triangle", i.e. the takeoffAt position are the same as arrivalAt position
 		deltaAGLTakeoffLanding = dicStartLoc['alt'] - dicEndLoc['alt']
@@ -190,26 +191,27 @@ def _buildFlightProfile(startLoc, cruiseAltMetersAGL, endLoc, takeoffSpeedMPS, r
 
 		takeoffMileage = geoMileageInPath2D(markPath, takeoffGroundDistance)
 
-		flight = flight.append({
+		flightRows.append({
 			'lat': takeoffMileage['loc'][0],
 			'lon': takeoffMileage['loc'][1],
 			'altAGL': deltaAGLCruiseTakeoff + dicStartLoc['alt'],
 			'accuGroundDistance': takeoffGroundDistance,
 			'description': "takeoffAtAlt and arrivalAtAlt",
 			'loiterTime': 0.0
-			}, ignore_index=True)
+			})
 
 	# For the last location, add one row
-	flight = flight.append({
+	flightRows.append({
 		'lat': dicEndLoc['lat'],
 		'lon': dicEndLoc['lon'],
 		'altAGL': dicEndLoc['alt'],
 		'accuGroundDistance': totalGroundDistance,
 		'description': "afterArrival",
 		'loiterTime': 0.0
-		}, ignore_index=True)
+		})
 
-	# Reorder flight in order
+	# Flight Profile dataframe, reordered
+	flight = pd.DataFrame(flightRows, columns=['lat', 'lon', 'altAGL', 'accuGroundDistance', 'description', 'loiterTime'])
 	flight = flight.sort_values('accuGroundDistance', ascending=True)
 	flight = flight.reset_index(drop=True)
 
@@ -278,8 +280,8 @@ def _buildFlightPath(path, speedMPS):
 		A dataframe to be interpreted into assignments dataframe.
 	"""
 
-	# Flight Profile dataframe
-	flight = pd.DataFrame(columns=['lat', 'lon', 'altAGL', 'accuGroundDistance', 'description', 'loiterTime', 'groundDistance', 'flightDistance', 'accuFlightDistance', 'timeFromPreviousPosition' ,'pathStartTimeSec', 'pathEndTimeSec'])
+	# Flight Profile rows, the dataframe is built once all waypoints are known
+	flightRows = []
 
 	# Check and guarantee that each point in path has 3 dimension
 	dicPath = locs2Dict(path)
@@ -303,7 +305,7 @@ def _buildFlightPath(path, speedMPS):
 		accuPathTime += timeFromPreviousPosition
 
 		# And one way point to the flight path
-		flight = flight.append({
+		flightRows.append({
 			'lat': dicPath[i]['lat'],
 			'lon': dicPath[i]['lon'],
 			'altAGL': dicPath[i]['alt'],
@@ -316,7 +318,10 @@ def _buildFlightPath(path, speedMPS):
 			'timeFromPreviousPosition': accuFlightDistance / speedMPS,
 			'pathStartTimeSec': accuPathTime, 
 			'pathEndTimeSec': accuPathTime
-			}, ignore_index=True)
+			})
+
+	# Flight Profile dataframe
+	flight = pd.DataFrame(flightRows, columns=['lat', 'lon', 'altAGL', 'accuGroundDistance', 'description', 'loiterTime', 'groundDistance', 'flightDistance', 'accuFlightDistance', 'timeFromPreviousPosition', 'pathStartTimeSec', 'pathEndTimeSec'])
 
 	return flight
 
@@ -344,6 +349,140 @@ def getTimeDistFromFlight(flight):
 	flightDistance = flight['accuFlightDistance'].max()
 	return [time, groundDistance, flightDistance]
 
+def getTimeDistFromFlightArray(routeType, startLats, startLons, startAlts, endLats, endLons, endAlts, cruiseAltMetersAGL, takeoffSpeedMPS, rateOfClimbMPS, cruiseSpeedMPS, landSpeedMPS, rateOfDescentMPS):
+	"""
+	Returns the total time, ground distance and flight distance of the flights that :meth:`buildNoLoiteringFlight` would build for many (start, end) pairs at once, without building any flight dataframes.  The results are those of calling :meth:`getTimeDistFromFlight` on each of those flights (ground distances are found with :meth:`~veroviz._geometry.geoDistance2DArray`).
+
+	Parameters
+	----------
+	routeType: string
+		Type of flight profile/path, options are 'square', 'triangular', 'trapezoidal', 'straight'.
+	startLats, startLons, startAlts: numpy arrays
+		Start locations.  These are broadcast against the end locations (e.g., use column vectors for the start locations and row vectors for the end locations to get matrices).
+	endLats, endLons, endAlts: numpy arrays
+		End locations.
+	cruiseAltMetersAGL: float
+		Cruise altitude, meters above sea level.
+	takeoffSpeedMPS, rateOfClimbMPS, cruiseSpeedMPS, landSpeedMPS, rateOfDescentMPS: float
+		As in :meth:`buildNoLoiteringFlight`
+
+	Returns
+	-------
+	time: numpy array
+		Total time of each flight.
+	groundDistance: numpy array
+		Total ground distance of each flight.
+	flightDistance: numpy array
+		Total flight distance of each flight.  For 'square' and 'trapezoidal' flights that :meth:`buildNoLoiteringFlight` cannot build (i.e., if one of the waypoints would come before the start, as when starting above the cruise altitude), the time and distances are NaN.
+	"""
+
+	try:
+		routeType = routeType.lower()
+	except:
+		pass
+
+	[startLats, startLons, startAlts, endLats, endLons, endAlts] = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in [startLats, startLons, startAlts, endLats, endLons, endAlts]])
+
+	if (routeType in ['square', 'trapezoidal']):
+		if (routeType == 'square'):
+			rateOfClimbMPS = takeoffSpeedMPS
+			rateOfDescentMPS = landSpeedMPS
+
+		return _getTimeDistFromFlightProfileArray(startLats, startLons, startAlts, endLats, endLons, endAlts, cruiseAltMetersAGL, takeoffSpeedMPS, rateOfClimbMPS, cruiseSpeedMPS, landSpeedMPS, rateOfDescentMPS)
+
+	elif (routeType == 'triangular'):
+		midLats = (startLats + endLats) / 2
+		midLons = (startLons + endLons) / 2
+		groundDistance1 = geoDistance2DArray(startLats, startLons, midLats, midLons)
+		groundDistance2 = geoDistance2DArray(midLats, midLons, endLats, endLons)
+		flightDistance1 = np.sqrt(groundDistance1 * groundDistance1 + (cruiseAltMetersAGL - startAlts) ** 2)
+		flightDistance2 = np.sqrt(groundDistance2 * groundDistance2 + (endAlts - cruiseAltMetersAGL) ** 2)
+
+		# As in `_buildFlightPath()`, the time to reach each waypoint is its accumulated flight distance over the speed
+		time = flightDistance1 / cruiseSpeedMPS + (flightDistance1 + flightDistance2) / cruiseSpeedMPS
+
+		return [time, groundDistance1 + groundDistance2, flightDistance1 + flightDistance2]
+
+	elif (routeType == 'straight'):
+		groundDistance = geoDistance2DArray(startLats, startLons, endLats, endLons)
+		flightDistance = np.sqrt(groundDistance * groundDistance + (endAlts - startAlts) ** 2)
+		time = flightDistance / cruiseSpeedMPS
+
+		return [time, groundDistance, flightDistance]
+
+	return
+
+def _getTimeDistFromFlightProfileArray(startLats, startLons, startAlts, endLats, endLons, endAlts, cruiseAltMetersAGL, takeoffSpeedMPS, rateOfClimbMPS, cruiseSpeedMPS, landSpeedMPS, rateOfDescentMPS):
+	# Array version of `_buildFlightProfile()` followed by `getTimeDistFromFlight()`.  Each flight has (up to) four waypoints, which are found, sorted by ground distance, and measured exactly as `_buildFlightProfile()` does.
+
+	# Calculate gradients of climbing and landing (exactly as `_buildFlightProfile()` does)
+	tanClimb = math.tan(math.radians(math.degrees(math.asin(rateOfClimbMPS / takeoffSpeedMPS))))
+	tanDescent = math.tan(math.radians(math.degrees(math.asin(rateOfDescentMPS / landSpeedMPS))))
+
+	idealTakeoffGroundDistance = (cruiseAltMetersAGL - startAlts) / tanClimb
+	idealLandingGroundDistance = (cruiseAltMetersAGL - endAlts) / tanDescent
+
+	totalGroundDistance = geoDistance2DArray(startLats, startLons, endLats, endLons)
+
+	# If cruise altitude is reached: beforeTakeoff, takeoffAtAlt, arrivalAtAlt, afterArrival.
+	# Otherwise, climbing and descending meet at a single peak: beforeTakeoff, "takeoffAtAlt and arrivalAtAlt", afterArrival.
+	canCruise = (totalGroundDistance > idealTakeoffGroundDistance + idealLandingGroundDistance)
+	deltaAGLTakeoffLanding = startAlts - endAlts
+	deltaAGLCruiseTakeoff = (totalGroundDistance - deltaAGLTakeoffLanding / tanDescent) * (tanClimb + tanDescent)
+	peakGroundDistance = deltaAGLCruiseTakeoff / tanClimb
+
+	# The missing arrivalAtAlt waypoint of a peaked flight is given an infinite ground distance, so it is sorted last and ignored
+	accuGroundDistance = np.stack([
+		np.zeros(totalGroundDistance.shape), 
+		np.where(canCruise, idealTakeoffGroundDistance, peakGroundDistance), 
+		np.where(canCruise, totalGroundDistance - idealLandingGroundDistance, np.inf), 
+		totalGroundDistance], axis=-1)
+	hasWaypoint = np.stack([np.ones(canCruise.shape, dtype=bool), np.ones(canCruise.shape, dtype=bool), canCruise, np.ones(canCruise.shape, dtype=bool)], axis=-1)
+	altAGL = np.stack([
+		startAlts, 
+		np.where(canCruise, cruiseAltMetersAGL, deltaAGLCruiseTakeoff + startAlts), 
+		np.full(startAlts.shape, float(cruiseAltMetersAGL)), 
+		endAlts], axis=-1)
+	# The speed used to reach each waypoint
+	speedMPS = np.array([np.nan, takeoffSpeedMPS, cruiseSpeedMPS, landSpeedMPS], dtype=float)
+
+	# The intermediate waypoints are located as `geoMileageInPath2D()` does
+	[takeoffLats, takeoffLons] = _getMileageLocArray(startLats, startLons, endLats, endLons, totalGroundDistance, accuGroundDistance[..., 1])
+	[arrivalLats, arrivalLons] = _getMileageLocArray(startLats, startLons, endLats, endLons, totalGroundDistance, accuGroundDistance[..., 2])
+	lats = np.stack([startLats, takeoffLats, arrivalLats, endLats], axis=-1)
+	lons = np.stack([startLons, takeoffLons, arrivalLons, endLons], axis=-1)
+
+	# Reorder waypoints by ground distance (a stable sort, as `sort_values()` is for so few rows)
+	order = np.argsort(accuGroundDistance, axis=-1, kind='stable')
+	[accuGroundDistance, hasWaypoint, altAGL, lats, lons] = [np.take_along_axis(x, order, axis=-1) for x in [accuGroundDistance, hasWaypoint, altAGL, lats, lons]]
+	speedMPS = speedMPS[order]
+
+	groundDistance = geoDistance2DArray(lats[..., :-1], lons[..., :-1], lats[..., 1:], lons[..., 1:])
+	deltaHeight = altAGL[..., 1:] - altAGL[..., :-1]
+	flightDistance = np.where(hasWaypoint[..., 1:], np.sqrt(deltaHeight * deltaHeight + groundDistance * groundDistance), 0.0)
+
+	time = np.sum(flightDistance / speedMPS[..., 1:], axis=-1)
+	groundDistance = np.max(np.where(hasWaypoint, accuGroundDistance, -np.inf), axis=-1)
+	flightDistance = np.sum(flightDistance, axis=-1)
+
+	# `_buildFlightProfile()` cannot build flights in which a waypoint comes before the start (e.g., if the start is above the cruise altitude)
+	noFlight = (order[..., 0] != 0)
+	time = np.where(noFlight, np.nan, time)
+	groundDistance = np.where(noFlight, np.nan, groundDistance)
+	flightDistance = np.where(noFlight, np.nan, flightDistance)
+
+	return [time, groundDistance, flightDistance]
+
+def _getMileageLocArray(startLats, startLons, endLats, endLons, totalGroundDistance, mileageInMeters):
+	# Array version of `geoMileageInPath2D()` for a path with two locations.  Mileages beyond the end are placed at the end location.
+	with np.errstate(divide='ignore', invalid='ignore'):
+		inPathFlag = (totalGroundDistance > mileageInMeters)
+		remainRatio = np.where(inPathFlag & (totalGroundDistance > 0), (totalGroundDistance - mileageInMeters) / totalGroundDistance, 0.0)
+	lats = np.where(inPathFlag, endLats + remainRatio * (startLats - endLats), endLats)
+	lons = np.where(inPathFlag, endLons + remainRatio * (startLons - endLons), endLons)
+
+	return [lats, lons]
+
 def addLoiterTimeToFlight(flight, loiterPosition, loiterTime):
 	"""
 	Given a flight profile, loiter position and loiter time, return a flight profile with loiter
@@ -1,6 +1,7 @@
 from veroviz._common import *
 from veroviz._internal import loc2Dict
 from veroviz._utilities import privInitDataframe
+from veroviz._utilities import privSetColumnTypes
 from veroviz._internal import replaceBackslashToSlash, addHeadSlash
 
 def privAddStaticAssignment(initAssignments=None, odID=1, objectID=None, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], loc=None, startTimeSec=None, endTimeSec=None, ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None):
@@ -11,12 +12,10 @@ def privAddStaticAssignment(initAssignments=None, odID=1, objectID=None, modelFi
 	# Ensure leading slash
 	modelFile = addHeadSlash(modelFile)
 
-	# assignment dataframe
-	assignments = privInitDataframe('Assignments')
-
 	dicLoc = loc2Dict(loc)
 	
-	assignments = assignments.append({
+	# assignment dataframe
+	assignments = privInitDataframe('Assignments', [{
 		'odID': odID,
 		'objectID': objectID,
 		'modelFile': modelFile,
@@ -51,10 +50,10 @@ def privAddStaticAssignment(initAssignments=None, odID=1, objectID=None, modelFi
 		'waytype' : None, 
 		'steepness' : None,
 		'tollway' : None
-		}, ignore_index=True, sort=False)
+		}])
 
 	if (type(initAssignments) is pd.core.frame.DataFrame):
-		assignments = pd.concat([initAssignments, assignments], ignore_index=True)
+		assignments = privSetColumnTypes(pd.concat([initAssignments, assignments], ignore_index=True), 'Assignments')
 				
 	return assignments
 	
\ No newline at end of file
@@ -1,7 +1,5 @@
 from veroviz._common import *
 
-from veroviz._utilities import privInitDataframe
-
 def deconstructAssignments(assignments=None, includeStationaryFlag=False, includeVerticalFlag=False):
 	"""
 	Given an Assignments dataframe, according to objectID and odID, separate it into a set of routes
@@ -36,32 +34,29 @@ def deconstructAssignments(assignments=None, includeStationaryFlag=False, includ
 		for i in range(0, len(verticalRows)):
 			lstSubAssignments.append(verticalRows.loc[i: i, :].copy())
 
+	# Re-index odID for the stationary and vertical rows
+	for i in range(0, len(lstSubAssignments)):
+		lstSubAssignments[i] = lstSubAssignments[i].reset_index(drop=True)
+		lstSubAssignments[i]['odID'] = i
+
 	collection = assignments.loc[(assignments['startLat'] != assignments['endLat']) | (assignments['startLon'] != assignments['endLon'])]
 	if (len(collection) > 0):
 		collection = collection.sort_values(by=['objectID', 'startTimeSec', 'modelFile', 'odID'], ascending=True)
 		collection = collection.reset_index(drop=True)
 
-		# Find consecutive routes
-		tmpSubAssignment = privInitDataframe('Assignments')
-		for i in range(len(collection)):
-			if (len(tmpSubAssignment) == 0):
-				tmpSubAssignment = pd.concat([tmpSubAssignment, collection.loc[i: i, :].copy()], ignore_index= True, sort=True)
-			else:
-				if (tmpSubAssignment.iloc[len(tmpSubAssignment) - 1]['endLat'] == collection.iloc[i]['startLat'] 
-					and tmpSubAssignment.iloc[len(tmpSubAssignment) - 1]['endLon'] == collection.iloc[i]['startLon'] 
-					and tmpSubAssignment.iloc[len(tmpSubAssignment) - 1]['endAltMeters'] == collection.iloc[i]['startAltMeters']
-					and tmpSubAssignment.iloc[len(tmpSubAssignment) - 1]['endTimeSec'] == collection.iloc[i]['startTimeSec']
-					and tmpSubAssignment.iloc[len(tmpSubAssignment) - 1]['odID'] == collection.iloc[i]['odID']):
-					tmpSubAssignment = pd.concat([tmpSubAssignment, collection.loc[i: i, :].copy()], ignore_index= True, sort=True)
-				else:
-					lstSubAssignments.append(tmpSubAssignment.copy())
-					tmpSubAssignment = privInitDataframe('Assignments')
-					tmpSubAssignment = pd.concat([tmpSubAssignment, collection.loc[i: i, :].copy()], ignore_index= True, sort=True)
-		lstSubAssignments.append(tmpSubAssignment.copy())
-
-	# Re-index odID for lstRoutes
-	for i in range(0, len(lstSubAssignments)):
-		lstSubAssignments[i] = lstSubAssignments[i].reset_index(drop=True)
-		lstSubAssignments[i]['odID'] = i
+		# Find consecutive routes: a row continues the previous route if it starts where (and when) the previous row ended, with the same odID
+		previous = collection[['endLat', 'endLon', 'endAltMeters', 'endTimeSec', 'odID']].shift(1)
+		continuousFlag = ((collection['startLat'] == previous['endLat'])
+			& (collection['startLon'] == previous['endLon'])
+			& (collection['startAltMeters'] == previous['endAltMeters'])
+			& (collection['startTimeSec'] == previous['endTimeSec'])
+			& (collection['odID'] == previous['odID']).fillna(False).astype(bool))
+		routeKey = (~continuousFlag).cumsum()
+
+		# Re-index odID for lstRoutes, continuing after the stationary and vertical rows
+		collection['odID'] = len(lstSubAssignments) + routeKey - 1
+		for _, subAssignment in collection.groupby(routeKey, sort=False):
+			subAssignment.index = pd.RangeIndex(len(subAssignment))
+			lstSubAssignments.append(subAssignment)
 
 	return lstSubAssignments
\ No newline at end of file
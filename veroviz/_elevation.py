@@ -32,7 +32,7 @@ def privGetElevationLocs(locs, dataProvider, dataProviderArgs):
 
 def privGetElevationNodes(dataframe, replaceOnlyNone, dataProvider, dataProviderArgs):
 	if (replaceOnlyNone):
-		df = dataframe[dataframe['elevMeters'].isin([None])][['lat', 'lon']]
+		df = dataframe[dataframe['elevMeters'].isnull()][['lat', 'lon']]
 	else:
 		df = dataframe[['lat', 'lon']]
 	indices = list(df.index)
@@ -56,7 +56,7 @@ def privGetElevationArcsAsgn(dataframe, replaceOnlyNone, dataProvider, dataProvi
 
 	# Start with starting location:
 	if (replaceOnlyNone):
-		df = dataframe[dataframe['startElevMeters'].isin([None])][['startLat', 'startLon']]
+		df = dataframe[dataframe['startElevMeters'].isnull()][['startLat', 'startLon']]
 	else:
 		df = dataframe[['startLat', 'startLon']]		
 	indices = list(df.index)
@@ -78,7 +78,7 @@ def privGetElevationArcsAsgn(dataframe, replaceOnlyNone, dataProvider, dataProvi
 
 	# Repeat the process for ending location:
 	if (replaceOnlyNone):
-		df = dataframe[dataframe['endElevMeters'].isin([None])][['endLat', 'endLon']]
+		df = dataframe[dataframe['endElevMeters'].isnull()][['endLat', 'endLon']]
 	else:	
 		df = dataframe[['endLat', 'endLon']]
 	indices = list(df.index)
@@ -473,6 +473,231 @@ def geoDistance3D(loc1, loc2):
 
 	return distMeters
 
+def geoDistance2DArray(lat1, lon1, lat2, lon2):
+	"""
+	Element-wise distance, in meters, between arrays of locations in 2D.  Inputs are broadcast against each other following the usual numpy rules, so `lat1[:, None]` against `lat2[None, :]` yields a full matrix in one call.
+
+	Parameters
+	----------
+	lat1: array-like
+		Latitudes of the first set of locations, in degrees
+	lon1: array-like
+		Longitudes of the first set of locations, in degrees
+	lat2: array-like
+		Latitudes of the second set of locations, in degrees
+	lon2: array-like
+		Longitudes of the second set of locations, in degrees
+
+	Return
+	------
+	numpy array
+		Distances, in meters, with the broadcast shape of the inputs.
+
+	Note
+	----
+	Distances are computed with Vincenty's inverse formula on the WGS-84 ellipsoid, iterated for all pairs at once.  Compared with `geopy.distance.distance()` (Karney's geodesic, used by :meth:`geoDistance2D`), the absolute difference is below 1 millimeter for every pair on which the iteration converges.  Vincenty's method does not converge for nearly antipodal points; those pairs (if any) are handed to geopy, so the result is never less accurate than the per-pair calculation.
+	"""
+
+	a = VRV_CONST_WGS84_SEMIMAJOR_AXIS
+	f = VRV_CONST_WGS84_FLATTENING
+	b = (1 - f) * a
+
+	[lat1, lon1, lat2, lon2] = np.broadcast_arrays(
+		np.asarray(lat1, dtype=float), np.asarray(lon1, dtype=float),
+		np.asarray(lat2, dtype=float), np.asarray(lon2, dtype=float))
+	shape = lat1.shape
+	[lat1, lon1, lat2, lon2] = [lat1.ravel(), lon1.ravel(), lat2.ravel(), lon2.ravel()]
+
+	L = np.radians(lon2 - lon1)
+	U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+	U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+	sinU1 = np.sin(U1)
+	cosU1 = np.cos(U1)
+	sinU2 = np.sin(U2)
+	cosU2 = np.cos(U2)
+
+	lam = L.copy()
+	converged = np.zeros(L.shape, dtype=bool)
+	with np.errstate(invalid='ignore', divide='ignore'):
+		for i in range(200):
+			sinLam = np.sin(lam)
+			cosLam = np.cos(lam)
+			sinSigma = np.sqrt((cosU2 * sinLam) ** 2 + (cosU1 * sinU2 - sinU1 * cosU2 * cosLam) ** 2)
+			cosSigma = sinU1 * sinU2 + cosU1 * cosU2 * cosLam
+			sigma = np.arctan2(sinSigma, cosSigma)
+			sinAlpha = np.where(sinSigma == 0, 0.0, cosU1 * cosU2 * sinLam / sinSigma)
+			cosSqAlpha = 1 - sinAlpha ** 2
+			# Equatorial lines have cosSqAlpha == 0
+			cos2SigmaM = np.where(cosSqAlpha == 0, 0.0, cosSigma - 2 * sinU1 * sinU2 / cosSqAlpha)
+			C = f / 16 * cosSqAlpha * (4 + f * (4 - 3 * cosSqAlpha))
+			lamPrev = lam
+			lam = L + (1 - C) * f * sinAlpha * (sigma + C * sinSigma * (cos2SigmaM + C * cosSigma * (-1 + 2 * cos2SigmaM ** 2)))
+			converged = np.abs(lam - lamPrev) < 1e-12
+			if (converged.all()):
+				break
+
+		uSq = cosSqAlpha * (a ** 2 - b ** 2) / (b ** 2)
+		A = 1 + uSq / 16384 * (4096 + uSq * (-768 + uSq * (320 - 175 * uSq)))
+		B = uSq / 1024 * (256 + uSq * (-128 + uSq * (74 - 47 * uSq)))
+		deltaSigma = B * sinSigma * (cos2SigmaM + B / 4 * (cosSigma * (-1 + 2 * cos2SigmaM ** 2) - B / 6 * cos2SigmaM * (-3 + 4 * sinSigma ** 2) * (-3 + 4 * cos2SigmaM ** 2)))
+		distMeters = b * A * (sigma - deltaSigma)
+
+	# Nearly antipodal pairs do not converge; fall back to geopy for those
+	distMeters = np.where(sinSigma == 0, 0.0, distMeters)
+	for k in np.nonzero(~converged | ~np.isfinite(distMeters))[0]:
+		distMeters[k] = geopy.distance.distance((lat1[k], lon1[k]), (lat2[k], lon2[k])).meters
+
+	return distMeters.reshape(shape)
+
+def geoSegmentDistances2D(path):
+	"""
+	Distances, in meters, between consecutive locations along a path in 2D.  This is the batched equivalent of calling :meth:`geoDistance2D` for each pair of neighboring locations.
+
+	Parameters
+	----------
+	path: list of lists
+		A list of locations, in [[lat, lon], [lat, lon], ...] format.  Altitudes, if provided, are ignored.
+
+	Return
+	------
+	numpy array
+		An array with one element per location in `path`.  The first element is 0; element i is the distance from location i-1 to location i.  See :meth:`geoDistance2DArray` for the accuracy relative to :meth:`geoDistance2D`.
+	"""
+
+	lats = np.array([loc[0] for loc in path], dtype=float)
+	lons = np.array([loc[1] for loc in path], dtype=float)
+
+	return np.concatenate(([0.0], geoDistance2DArray(lats[:-1], lons[:-1], lats[1:], lons[1:])))
+
+def geoSimplifyPath2D(path, toleranceMeters):
+	"""
+	Simplifies a path with the Douglas-Peucker algorithm.  A location is dropped if the simplified path passes within `toleranceMeters` of it.  The first and last locations are always kept.
+
+	Parameters
+	----------
+	path: list of lists
+		A list of locations, in [[lat, lon], [lat, lon], ...] format.  Altitudes, if provided, are ignored.
+	toleranceMeters: float
+		The largest allowed distance, in meters, between a dropped location and the simplified path.
+
+	Return
+	------
+	numpy array
+		The (increasing) indices of the locations in `path` that are kept.
+
+	Note
+	----
+	Distances are measured on a local flat-earth projection centered on the path, which is accurate for routes up to a few hundred kilometers long.  All of the segments at each level of the recursion are processed at once, with array operations.
+	"""
+
+	numLocs = len(path)
+	if (numLocs <= 2):
+		return np.arange(numLocs)
+
+	lats = np.radians(np.array([loc[0] for loc in path], dtype=float))
+	lons = np.radians(np.array([loc[1] for loc in path], dtype=float))
+	x = VRV_CONST_RADIUS_OF_EARTH * (lons - lons.mean()) * np.cos(lats.mean())
+	y = VRV_CONST_RADIUS_OF_EARTH * (lats - lats.mean())
+
+	keep = np.zeros(numLocs, dtype=bool)
+	keep[[0, -1]] = True
+
+	# Each pending segment runs from location starts[k] to location ends[k]
+	starts = np.array([0])
+	ends = np.array([numLocs - 1])
+	while (len(starts) > 0):
+		numInterior = ends - starts - 1
+		[starts, ends, numInterior] = [starts[numInterior > 0], ends[numInterior > 0], numInterior[numInterior > 0]]
+		if (len(starts) == 0):
+			break
+
+		# The interior locations of every segment, grouped by segment
+		segment = np.repeat(np.arange(len(starts)), numInterior)
+		first = np.cumsum(numInterior) - numInterior
+		interior = starts[segment] + 1 + np.arange(len(segment)) - first[segment]
+
+		# Distance from each interior location to its segment
+		[ax, ay] = [x[starts][segment], y[starts][segment]]
+		[dx, dy] = [x[ends][segment] - ax, y[ends][segment] - ay]
+		lengthSq = dx ** 2 + dy ** 2
+		with np.errstate(invalid='ignore', divide='ignore'):
+			t = np.where(lengthSq > 0, ((x[interior] - ax) * dx + (y[interior] - ay) * dy) / lengthSq, 0.0)
+		t = np.clip(t, 0, 1)
+		distMeters = np.hypot(x[interior] - (ax + t * dx), y[interior] - (ay + t * dy))
+
+		# The farthest location from each segment (the first one, if there's a tie)
+		order = np.lexsort((-distMeters, segment))
+		farthest = order[first]
+		split = (distMeters[farthest] > toleranceMeters)
+
+		# Keep the farthest locations that are out of tolerance, and split their segments there
+		splitLocs = interior[farthest[split]]
+		keep[splitLocs] = True
+		[starts, ends] = [np.concatenate((starts[split], splitLocs)), np.concatenate((splitLocs, ends[split]))]
+
+	return np.nonzero(keep)[0]
+
+def geoDistance2DMatrix(fromLocs, toLocs):
+	"""
+	Distance matrix, in meters, between two lists of locations in 2D.  This is the batched equivalent of calling :meth:`geoDistance2D` for every (from, to) pair.
+
+	Parameters
+	----------
+	fromLocs: list of lists
+		The origin locations, in [[lat, lon], [lat, lon], ...] format.  Altitudes, if provided, are ignored.
+	toLocs: list of lists
+		The destination locations, in [[lat, lon], [lat, lon], ...] format.  Altitudes, if provided, are ignored.
+
+	Return
+	------
+	numpy array
+		A `len(fromLocs)` x `len(toLocs)` array of distances, in meters.  See :meth:`geoDistance2DArray` for the accuracy relative to :meth:`geoDistance2D`.
+	"""
+
+	fromLats = np.array([loc[0] for loc in fromLocs], dtype=float)
+	fromLons = np.array([loc[1] for loc in fromLocs], dtype=float)
+	toLats = np.array([loc[0] for loc in toLocs], dtype=float)
+	toLons = np.array([loc[1] for loc in toLocs], dtype=float)
+
+	return geoDistance2DArray(fromLats[:, None], fromLons[:, None], toLats[None, :], toLons[None, :])
+
+def geoNearestNeighbors(locs, k):
+	"""
+	Finds the `k` geometrically nearest neighbors of each location, using a k-d tree.  Locations are mapped onto the unit sphere first, so the results are correct near the poles and across the antimeridian.
+
+	Parameters
+	----------
+	locs: list of lists
+		Locations, in [[lat, lon], [lat, lon], ...] format.  Altitudes, if provided, are ignored.
+	k: int
+		The number of neighbors to find for each location.  A location is not its own neighbor, so at most `len(locs) - 1` neighbors are returned.
+
+	Return
+	------
+	numpy array
+		A `len(locs)` x `min(k, len(locs) - 1)` integer array.  Row i contains the positions (in `locs`) of the neighbors of location i, sorted from nearest to farthest.
+	"""
+
+	lats = np.radians(np.array([loc[0] for loc in locs], dtype=float))
+	lons = np.radians(np.array([loc[1] for loc in locs], dtype=float))
+	points = np.column_stack((np.cos(lats) * np.cos(lons), np.cos(lats) * np.sin(lons), np.sin(lats)))
+
+	k = min(int(k), len(locs) - 1)
+	if (k <= 0):
+		return np.zeros((len(locs), 0), dtype=int)
+
+	# Query one extra neighbor, since each point is returned as its own nearest neighbor
+	[dists, neighbors] = scipy.spatial.cKDTree(points).query(points, k=k+1)
+	neighbors = neighbors.reshape(len(locs), k+1)
+
+	# Remove each point from its own row (duplicated coordinates may not be listed first)
+	rows = np.arange(len(locs))
+	isSelf = (neighbors == rows[:, None])
+	keep = ~isSelf
+	keep[~isSelf.any(axis=1), k] = False
+
+	return neighbors[keep].reshape(len(locs), k)
+
 def geoAreaOfTriangle(loc1, loc2, loc3):
 	"""
 	Calculates the area of triangle defined by three locations
@@ -554,7 +779,7 @@ def geoDistancePath2D(path):
 
 	dist = 0
 	for i in range(0, len(path) - 1):
-		dist += geoDistance2D([path[i]], path[i + 1])
+		dist += geoDistance2D(path[i], path[i + 1])
 
 	return dist
 
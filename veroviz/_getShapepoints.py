@@ -6,7 +6,11 @@ from veroviz._queryOSRM import osrmGetShapepointsTimeDist
 from veroviz._queryORS import orsGetShapepointsTimeDist, orsGetElevation
 from veroviz._queryORSlocal import orsLocalGetShapepointsTimeDist
 
+from veroviz._getTimeDistFromLocs2D import privGetProviderKey
+from veroviz._routeCache import privGetCachedRoute
+
 from veroviz._internal import distributeTimeDist
+from veroviz._internal import accumulate
 from veroviz._internal import locs2Dict
 from veroviz._internal import loc2Dict
 from veroviz._internal import replaceBackslashToSlash, addHeadSlash
@@ -17,13 +21,15 @@ from veroviz._buildFlightProfile import getTimeDistFromFlight
 from veroviz._buildFlightProfile import addLoiterTimeToFlight
 
 from veroviz._geometry import geoDistance2D
+from veroviz._geometry import geoSegmentDistances2D
+from veroviz._geometry import geoSimplifyPath2D
 # FIXME -- WAS IN LP'S CODE -- from veroviz._geometry import geoGetHeading
 # FIXME -- WAS IN LP'S CODE -- from veroviz._geometry import geoPointInDistance2D
 
 from veroviz._utilities import privConvertDistance    # FIXME -- Where is this used?
 from veroviz._utilities import privInitDataframe
 
-def privGetShapepoints2D(odID=1, objectID=None, modelFile=None, startLoc=None, endLoc=None, startTimeSec=0.0, expDurationSec=None, routeType='euclidean2D', speedMPS=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None, dataProvider=None, dataProviderArgs=None):
+def privGetShapepoints2D(odID=1, objectID=None, modelFile=None, startLoc=None, endLoc=None, startTimeSec=0.0, expDurationSec=None, routeType='euclidean2D', speedMPS=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None, dataProvider=None, dataProviderArgs=None, route=None, simplifyToleranceMeters=None):
 
 	# Replace backslash
 	modelFile = replaceBackslashToSlash(modelFile)
@@ -42,35 +48,14 @@ def privGetShapepoints2D(odID=1, objectID=None, modelFile=None, startLoc=None, e
 		pass
 			
 	if (startLoc != endLoc):
-		extras = {}
-		if (routeType == 'euclidean2d'):
-			[path, time, dist] = _eucGetShapepointsTimeDist(startLoc, endLoc, speedMPS, expDurationSec)
-		elif (routeType == 'manhattan'):
-			[path, time, dist] = _manGetShapepointsTimeDist(startLoc, endLoc, speedMPS, expDurationSec)
-		elif (routeType == 'fastest' and dataProviderDictionary[dataProvider] == 'pgrouting'):
-			databaseName = dataProviderArgs['databaseName']
-			[path, time, dist] = pgrGetShapepointsTimeDist(startLoc, endLoc, databaseName)
-		elif (routeType == 'fastest' and dataProviderDictionary[dataProvider] == 'osrm-online'):
-			[path, time, dist] = osrmGetShapepointsTimeDist(startLoc, endLoc)
-		elif (routeType in ['fastest', 'shortest', 'pedestrian'] and dataProviderDictionary[dataProvider] == 'mapquest'):
-			APIkey = dataProviderArgs['APIkey']
-			[path, time, dist] = mqGetShapepointsTimeDist(startLoc, endLoc, routeType, APIkey)
-		elif (routeType in ['fastest', 'pedestrian', 'cycling', 'truck', 'wheelchair'] and dataProviderDictionary[dataProvider] == 'ors-online'):
-			APIkey = dataProviderArgs['APIkey']
-			if ('requestExtras' in dataProviderArgs.keys()):
-				requestExtras = dataProviderArgs['requestExtras']
-			else:
-				requestExtras = True
-			[path, extras, time, dist] = orsGetShapepointsTimeDist(startLoc, endLoc, routeType, APIkey, requestExtras)
-		elif (routeType in ['fastest', 'pedestrian', 'cycling', 'truck'] and dataProviderDictionary[dataProvider] == 'ors-local'):
-			port = dataProviderArgs['port']
-			if ('requestExtras' in dataProviderArgs.keys()):
-				requestExtras = dataProviderArgs['requestExtras']
-			else:
-				requestExtras = True
-			[path, extras, time, dist] = orsLocalGetShapepointsTimeDist(startLoc, endLoc, routeType, port, requestExtras)
-		else:
+		if (route is None):
+			route = privGetRoute2D(startLoc, endLoc, routeType, speedMPS, expDurationSec, dataProvider, dataProviderArgs)
+		if (route is None):
 			return
+		[path, extras, time, dist] = route
+
+		if (simplifyToleranceMeters is not None):
+			[path, extras, time, dist] = _simplifyShapepoints(path, extras, time, dist, simplifyToleranceMeters)
 
 		# Check if the original point is too far away from the actual start point of the shapepoints from query
 		distOri = geoDistance2D(startLoc, path[0])
@@ -82,95 +67,60 @@ def privGetShapepoints2D(odID=1, objectID=None, modelFile=None, startLoc=None, e
 		if (distDes >= config['VRV_DEFAULT_DISTANCE_ERROR_TOLERANCE']): # Go back to 10m after testing
 			print("Message: The destination point (lat: %s, lon: %s) is %.1f meters away from the road. You might find a gap between destination point and the route." % (endLoc[0], endLoc[1], distDes))
 
-		# convert distance to accumulated distance
-		accDist = []
-		accDist.append(0)
-		for i in range(1, len(dist)):
-			accDist.append(accDist[i - 1] + dist[i])
-
 		# If `expDurationSec` is provided, override `speedMPS` and datasource, otherwise, if `speedMPS` is provided, override datasource
 		if (expDurationSec != None):
-			[newTime, newDist] = distributeTimeDist(path, expDurationSec)
-			time = newTime
-			dist = newDist
-		elif (speedMPS != None and expDurationSec == None):
-			newExpDurationSec = accDist[len(accDist) - 1] / speedMPS
-			[newTime, newDist] = distributeTimeDist(path, newExpDurationSec)
-			time = newTime
-			dist = newDist
+			[time, dist] = distributeTimeDist(path, expDurationSec)
+		elif (speedMPS != None):
+			[time, dist] = distributeTimeDist(path, accumulate(dist)[-1] / speedMPS)
 
 		# convert time to accumulated time
-		accTime = []
-		accTime.append(startTimeSec)
-		for i in range(1, len(dist)):
-			accTime.append(accTime[i - 1] + time[i])
+		accTime = accumulate(time[0:len(dist)], startTimeSec)
 
 		# For maintainability, convert locs into dictionary
 		dicPath = locs2Dict(path)
-
-		# shapepoint dataframe
-		assignments = privInitDataframe('Assignments')
-		
-		# generate assignments
-		for i in range(1, len(path)):
-			if (i-1) in extras:
-				startElev   = extras[i-1]['elev'] if 'elev' in extras[i-1] else None
-				wayname     = extras[i]['wayname'] if 'wayname' in extras[i] else None
-				waycategory = extras[i]['waycategory'] if 'waycategory' in extras[i] else None
-				surface     = extras[i]['surface'] if 'surface' in extras[i] else None
-				waytype     = extras[i]['waytype'] if 'waytype' in extras[i] else None
-				steepness   = extras[i]['steepness'] if 'steepness' in extras[i] else None
-				tollway     = extras[i]['tollway'] if 'tollway' in extras[i] else None
-			else:
-				startElev   = None
-				wayname     = None
-				waycategory = None
-				surface     = None
-				waytype     = None
-				steepness   = None
-				tollway     = None
-				
-			if i in extras:
-				endElev     = extras[i]['elev'] if 'elev' in extras[i] else None
-			else:
-				endElev     = None			
-			
-			assignments = assignments.append({
-				'odID' : odID,
-				'objectID' : objectID, 
-				'modelFile' : modelFile,
-				'startTimeSec' : accTime[i - 1],
-				'startLat' : dicPath[i - 1]['lat'],
-				'startLon' : dicPath[i - 1]['lon'],
-				'startAltMeters' : dicPath[i - 1]['alt'],
-				'endTimeSec' : accTime[i],
-				'endLat' : dicPath[i]['lat'],
-				'endLon' : dicPath[i]['lon'],
-				'endAltMeters' : dicPath[i]['alt'],
-				'leafletColor' : leafletColor,
-				'leafletWeight' : leafletWeight,
-				'leafletStyle' : leafletStyle,
-				'leafletCurveType' : leafletCurveType,
-				'leafletCurvature' : leafletCurvature,
-				'useArrows' : useArrows,
-				'leafletOpacity' : leafletOpacity,
-				'modelScale' : modelScale,
-				'modelMinPxSize' : modelMinPxSize,
-				'cesiumColor' : stripCesiumColor(cesiumColor),
-				'cesiumWeight' : cesiumWeight,
-				'cesiumStyle' : cesiumStyle,
-				'cesiumOpacity' : cesiumOpacity,
-				'ganttColor' : ganttColor, 
-				'popupText' : popupText,
-				'startElevMeters' : startElev,
-				'endElevMeters' : endElev,
-				'wayname' : wayname,
-				'waycategory' : waycategory,
-				'surface' : surface,
-				'waytype' : waytype, 
-				'steepness' : steepness,
-				'tollway' : tollway
-				}, ignore_index=True)
+		lats = [loc['lat'] for loc in dicPath]
+		lons = [loc['lon'] for loc in dicPath]
+		alts = [loc['alt'] for loc in dicPath]
+
+		# generate assignments, one row per segment of the path.
+		# Segment i goes from shapepoint i-1 to shapepoint i.
+		segments = range(1, len(path))
+		assignments = privInitDataframe('Assignments', {
+			'odID' : odID,
+			'objectID' : objectID, 
+			'modelFile' : modelFile,
+			'startTimeSec' : accTime[:-1],
+			'startLat' : lats[:-1],
+			'startLon' : lons[:-1],
+			'startAltMeters' : alts[:-1],
+			'endTimeSec' : accTime[1:],
+			'endLat' : lats[1:],
+			'endLon' : lons[1:],
+			'endAltMeters' : alts[1:],
+			'leafletColor' : leafletColor,
+			'leafletWeight' : leafletWeight,
+			'leafletStyle' : leafletStyle,
+			'leafletCurveType' : leafletCurveType,
+			'leafletCurvature' : leafletCurvature,
+			'useArrows' : useArrows,
+			'leafletOpacity' : leafletOpacity,
+			'modelScale' : modelScale,
+			'modelMinPxSize' : modelMinPxSize,
+			'cesiumColor' : stripCesiumColor(cesiumColor),
+			'cesiumWeight' : cesiumWeight,
+			'cesiumStyle' : cesiumStyle,
+			'cesiumOpacity' : cesiumOpacity,
+			'ganttColor' : ganttColor, 
+			'popupText' : popupText,
+			'startElevMeters' : _getExtrasColumn(extras, [i - 1 for i in segments], 'elev'),
+			'endElevMeters' : _getExtrasColumn(extras, segments, 'elev'),
+			'wayname' : _getExtrasColumn(extras, segments, 'wayname'),
+			'waycategory' : _getExtrasColumn(extras, segments, 'waycategory'),
+			'surface' : _getExtrasColumn(extras, segments, 'surface'),
+			'waytype' : _getExtrasColumn(extras, segments, 'waytype'), 
+			'steepness' : _getExtrasColumn(extras, segments, 'steepness'),
+			'tollway' : _getExtrasColumn(extras, segments, 'tollway')
+			})
 	else:
 		# For maintainability, convert locs into dictionary
 		dicStartLoc = loc2Dict(startLoc)
@@ -180,8 +130,7 @@ def privGetShapepoints2D(odID=1, objectID=None, modelFile=None, startLoc=None, e
 		else:
 			elev = None
 			
-		assignments = privInitDataframe('Assignments')
-		assignments = assignments.append({
+		assignments = privInitDataframe('Assignments', [{
 			'odID' : odID,
 			'objectID' : objectID, 
 			'modelFile' : modelFile,
@@ -216,11 +165,113 @@ def privGetShapepoints2D(odID=1, objectID=None, modelFile=None, startLoc=None, e
 			'waytype' : None, 
 			'steepness' : None,
 			'tollway' : None
-			}, ignore_index=True)
+			}])
 
 	return assignments
 
 
+def privGetRoute2D(startLoc, endLoc, routeType, speedMPS, expDurationSec, dataProvider, dataProviderArgs):
+	"""
+	Returns the route from `startLoc` to `endLoc` (which must be different), as `[path, extras, timeSecs, distMeters]`, or None if `routeType` isn't supported by `dataProvider` (or the query failed).  Routes from data providers come from the route cache if possible.  This is the part of `privGetShapepoints2D()` that may query a data provider; the result can be passed to `privGetShapepoints2D()` as `route`.
+	"""
+
+	try:
+		dataProvider = dataProvider.lower()
+	except:
+		pass
+
+	try:
+		routeType = routeType.lower()
+	except:
+		pass
+
+	extras = {}
+	if (routeType == 'euclidean2d'):
+		[path, time, dist] = _eucGetShapepointsTimeDist(startLoc, endLoc, speedMPS, expDurationSec)
+	elif (routeType == 'manhattan'):
+		[path, time, dist] = _manGetShapepointsTimeDist(startLoc, endLoc, speedMPS, expDurationSec)
+	else:
+		providerKey = privGetProviderKey(routeType, dataProvider, dataProviderArgs) if (dataProvider in dataProviderDictionary) else None
+		if (providerKey is None):
+			return
+
+		# ORS extras are only requested if `requestExtras` is True
+		requestExtras = False
+		if (dataProviderDictionary[dataProvider] in ['ors-online', 'ors-local']):
+			requestExtras = dataProviderArgs['requestExtras'] if ('requestExtras' in dataProviderArgs.keys()) else True
+		profile = '%s:%s' % (routeType, 'extras' if requestExtras else 'noextras')
+
+		return privGetCachedRoute(startLoc, endLoc, providerKey, profile, lambda: _getShapepointsFromProvider(startLoc, endLoc, routeType, dataProvider, dataProviderArgs, requestExtras))
+
+	return [path, extras, time, dist]
+
+def _simplifyShapepoints(path, extras, time, dist, toleranceMeters):
+	"""
+	Drops the shapepoints that are within `toleranceMeters` of the simplified path (see `geoSimplifyPath2D()`).  The time and distance of each remaining segment are the totals of the original segments it replaces, so the total time and distance are unchanged.  For the ORS extras of each remaining segment, 'tollway' is True if any of the original segments is a tollway; the other attributes (e.g., 'wayname' and 'surface') take the value that covers the most distance over the original segments.  Elevations are those of the remaining shapepoints.
+	"""
+
+	keep = geoSimplifyPath2D(path, toleranceMeters)
+	if (len(keep) == len(path)):
+		return [path, extras, time, dist]
+
+	newPath = [path[i] for i in keep]
+	newTime = np.concatenate(([0], np.diff(accumulate(time)[keep]))).tolist()
+	newDist = np.concatenate(([0], np.diff(accumulate(dist)[keep]))).tolist()
+
+	newExtras = {}
+	if (len(extras) > 0):
+		newExtras[0] = dict(extras[0]) if (0 in extras) else {}
+		for j in range(1, len(keep)):
+			# Original segments (k-1, k), for k in `merged`, make up the new segment (j-1, j)
+			merged = [k for k in range(keep[j-1] + 1, keep[j] + 1) if k in extras]
+			newExtras[j] = {}
+			if (keep[j] in extras and 'elev' in extras[keep[j]]):
+				newExtras[j]['elev'] = extras[keep[j]]['elev']
+			for key in ['wayname', 'waycategory', 'surface', 'waytype', 'steepness']:
+				# Total distance covered by each value of `key`
+				valueDist = {}
+				for k in merged:
+					if (key in extras[k]):
+						valueDist[extras[k][key]] = valueDist.get(extras[k][key], 0) + dist[k]
+				if (len(valueDist) > 0):
+					newExtras[j][key] = max(valueDist, key=valueDist.get)
+			tollways = [extras[k]['tollway'] for k in merged if 'tollway' in extras[k]]
+			if (len(tollways) > 0):
+				newExtras[j]['tollway'] = (True in tollways) if (True in tollways or False in tollways) else None
+
+	return [newPath, newExtras, newTime, newDist]
+
+def _getExtrasColumn(extras, indices, key):
+	# The `key` value of the extras for each shapepoint index in `indices` (None if there isn't one)
+	return [extras[i][key] if (i in extras and key in extras[i]) else None for i in indices]
+
+def _getShapepointsFromProvider(startLoc, endLoc, routeType, dataProvider, dataProviderArgs, requestExtras):
+	"""
+	Queries a road-network data provider for the route from `startLoc` to `endLoc`.  The data provider must support `routeType` (see `privGetProviderKey()`).  Returns `[path, extras, timeSecs, distMeters]`.
+	"""
+
+	extras = {}
+	if (dataProviderDictionary[dataProvider] == 'pgrouting'):
+		databaseName = dataProviderArgs['databaseName']
+		[path, time, dist] = pgrGetShapepointsTimeDist(startLoc, endLoc, databaseName)
+	elif (dataProviderDictionary[dataProvider] == 'osrm-online'):
+		[path, time, dist] = osrmGetShapepointsTimeDist(startLoc, endLoc)
+	elif (dataProviderDictionary[dataProvider] == 'osrm-local'):
+		port = dataProviderArgs['port']
+		host = dataProviderArgs['host'] if ('host' in dataProviderArgs) else None
+		[path, time, dist] = osrmGetShapepointsTimeDist(startLoc, endLoc, host, port)
+	elif (dataProviderDictionary[dataProvider] == 'mapquest'):
+		APIkey = dataProviderArgs['APIkey']
+		[path, time, dist] = mqGetShapepointsTimeDist(startLoc, endLoc, routeType, APIkey)
+	elif (dataProviderDictionary[dataProvider] == 'ors-online'):
+		APIkey = dataProviderArgs['APIkey']
+		[path, extras, time, dist] = orsGetShapepointsTimeDist(startLoc, endLoc, routeType, APIkey, requestExtras)
+	elif (dataProviderDictionary[dataProvider] == 'ors-local'):
+		port = dataProviderArgs['port']
+		[path, extras, time, dist] = orsLocalGetShapepointsTimeDist(startLoc, endLoc, routeType, port, requestExtras)
+
+	return [path, extras, time, dist]
+
 def privGetShapepoints3D(odID=1, objectID=None, modelFile=None, startTimeSec=0.0, startLoc=None, endLoc=None, takeoffSpeedMPS=None, cruiseSpeedMPS=None, landSpeedMPS=None, cruiseAltMetersAGL=None, routeType='square', climbRateMPS=None, descentRateMPS=None, earliestLandTime=-1, loiterPosition='arrivalAtAlt', leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], ganttColorLoiter=config['VRV_DEFAULT_GANTTCOLORLOITER'], popupText=None):
 
 	# Replace backslash
@@ -246,111 +297,84 @@ def privGetShapepoints3D(odID=1, objectID=None, modelFile=None, startTimeSec=0.0
 		loiterPosition=loiterPosition, 
 		loiterTime=remainLoiterTime)
 
-	# Build assignments dataframe
-	assignments = privInitDataframe('assignments')
-	for i in range(1, len(flight)):
-		# For all segments in flight profile, loitering happens AFTER arrival at that position
-		assignments = assignments.append({
-			'odID': odID,
-			'objectID': objectID,
-			'modelFile': modelFile,
-			'startTimeSec': startTimeSec + flight.iloc[i - 1]['pathEndTimeSec'],
-			'startLat': flight.iloc[i - 1]['lat'],
-			'startLon': flight.iloc[i - 1]['lon'],
-			'startAltMeters': flight.iloc[i - 1]['altAGL'],
-			'endTimeSec': startTimeSec + flight.iloc[i]['pathStartTimeSec'],
-			'endLat': flight.iloc[i]['lat'],
-			'endLon': flight.iloc[i]['lon'],
-			'endAltMeters': flight.iloc[i]['altAGL'],
-			'leafletColor': leafletColor,
-			'leafletWeight': leafletWeight,
-			'leafletStyle': leafletStyle,
-			'leafletOpacity': leafletOpacity,
-			'leafletCurveType' : leafletCurveType,
-			'leafletCurvature' : leafletCurvature,			
-			'useArrows': useArrows,
-			'modelScale' : modelScale,
-			'modelMinPxSize' : modelMinPxSize,
-			'cesiumColor': stripCesiumColor(cesiumColor),
-			'cesiumWeight': cesiumWeight,
-			'cesiumStyle': cesiumStyle,
-			'cesiumOpacity': cesiumOpacity,
-			'ganttColor': ganttColor, 
-			'popupText': popupText,
-			'startElevMeters' : None,
-			'endElevMeters' : None,
-			'wayname' : None,
-			'waycategory' : None,
-			'surface' : None,
-			'waytype' : None, 
-			'steepness' : None,
-			'tollway' : None
-			}, ignore_index=True)
-
-		# If they need loitering, add the line of loitering
-		if (flight.iloc[i]['loiterTime'] != 0):
-			assignments = assignments.append({
-				'odID': odID,
-				'objectID': objectID,
-				'modelFile': modelFile,
-				'startTimeSec': startTimeSec + flight.iloc[i]['pathStartTimeSec'],
-				'startLat': flight.iloc[i]['lat'],
-				'startLon': flight.iloc[i]['lon'],
-				'startAltMeters': flight.iloc[i]['altAGL'],
-				'endTimeSec': startTimeSec + flight.iloc[i]['pathEndTimeSec'],
-				'endLat': flight.iloc[i]['lat'],
-				'endLon': flight.iloc[i]['lon'],
-				'endAltMeters': flight.iloc[i]['altAGL'],
-				'leafletColor': leafletColor,
-				'leafletWeight': leafletWeight,
-				'leafletStyle': leafletStyle,
-				'leafletOpacity': leafletOpacity,
-				'leafletCurveType' : leafletCurveType,
-				'leafletCurvature' : leafletCurvature,				
-				'useArrows': useArrows,
-				'modelScale' : modelScale,
-				'modelMinPxSize' : modelMinPxSize,
-				'cesiumColor': stripCesiumColor(cesiumColor),
-				'cesiumWeight': cesiumWeight,
-				'cesiumStyle': cesiumStyle,
-				'cesiumOpacity': cesiumOpacity,
-				'ganttColor': ganttColorLoiter, 
-				'popupText': popupText,
-				'startElevMeters' : None,
-				'endElevMeters' : None,
-				'wayname' : None,
-				'waycategory' : None,
-				'surface' : None,
-				'waytype' : None, 
-				'steepness' : None,
-				'tollway' : None
-				}, ignore_index=True)
+	# Build assignments dataframe.
+	# For all segments in flight profile, loitering happens AFTER arrival at that position,
+	# so each segment that needs loitering is followed by a row for the loitering.
+	loiter = (flight['loiterTime'].values[1:] != 0)
+	position = np.repeat(np.arange(1, len(flight)), 1 + loiter.astype(int))
+	isLoiter = np.concatenate(([False], position[1:] == position[:-1]))
+
+	lat = flight['lat'].values.astype(float)
+	lon = flight['lon'].values.astype(float)
+	altAGL = flight['altAGL'].values.astype(float)
+	pathStartTimeSec = flight['pathStartTimeSec'].values.astype(float)
+	pathEndTimeSec = flight['pathEndTimeSec'].values.astype(float)
+
+	# Travel segments start at the previous position; loitering starts (and ends) at the current position
+	startPosition = np.where(isLoiter, position, position - 1)
+
+	assignments = privInitDataframe('assignments', {
+		'odID': odID,
+		'objectID': objectID,
+		'modelFile': modelFile,
+		'startTimeSec': startTimeSec + np.where(isLoiter, pathStartTimeSec[position], pathEndTimeSec[position - 1]),
+		'startLat': lat[startPosition],
+		'startLon': lon[startPosition],
+		'startAltMeters': altAGL[startPosition],
+		'endTimeSec': startTimeSec + np.where(isLoiter, pathEndTimeSec[position], pathStartTimeSec[position]),
+		'endLat': lat[position],
+		'endLon': lon[position],
+		'endAltMeters': altAGL[position],
+		'leafletColor': leafletColor,
+		'leafletWeight': leafletWeight,
+		'leafletStyle': leafletStyle,
+		'leafletOpacity': leafletOpacity,
+		'leafletCurveType' : leafletCurveType,
+		'leafletCurvature' : leafletCurvature,			
+		'useArrows': useArrows,
+		'modelScale' : modelScale,
+		'modelMinPxSize' : modelMinPxSize,
+		'cesiumColor': stripCesiumColor(cesiumColor),
+		'cesiumWeight': cesiumWeight,
+		'cesiumStyle': cesiumStyle,
+		'cesiumOpacity': cesiumOpacity,
+		'ganttColor': [ganttColorLoiter if loitering else ganttColor for loitering in isLoiter], 
+		'popupText': popupText,
+		'startElevMeters' : None,
+		'endElevMeters' : None,
+		'wayname' : None,
+		'waycategory' : None,
+		'surface' : None,
+		'waytype' : None, 
+		'steepness' : None,
+		'tollway' : None
+		})
 
 	return assignments
 
 
 def _eucGetShapepointsTimeDist(startLoc, endLoc, speedMPS, expDurationSec):
 	path = [startLoc, endLoc]
-	dist = [0, geoDistance2D(startLoc, endLoc)]
-	if (expDurationSec != None):
-		time = [0, expDurationSec]
-	else:
-		time = [0, dist[1] / speedMPS]	
-	return [path, time, dist]
+
+	return _getPathTimeDist(path, speedMPS, expDurationSec)
 
 
 def _manGetShapepointsTimeDist(startLoc, endLoc, speedMPS, expDurationSec, verticalFirst=True):
 	# if verticalFirst is true, it means go north/south first then go east/west
 	if verticalFirst:
 		path = [startLoc, [endLoc[0], startLoc[1]], endLoc]
-		dist = [0, geoDistance2D(startLoc, [endLoc[0], startLoc[1]]), geoDistance2D([endLoc[0], startLoc[1]], endLoc)]
 	else:
 		path = [startLoc, [startLoc[0], endLoc[1]], endLoc]
-		dist = [0, geoDistance2D(startLoc, [startLoc[0], endLoc[1]]), geoDistance2D([startLoc[0], endLoc[1]], endLoc)]
 
+	return _getPathTimeDist(path, speedMPS, expDurationSec)
+
+
+def _getPathTimeDist(path, speedMPS, expDurationSec):
+	# Times are proportional to the segment distances, and add up to `expDurationSec` (if provided)
 	if (expDurationSec != None):
-		time = [0, expDurationSec * dist[1] / (dist[1] + dist[2]), expDurationSec * dist[2] / (dist[1] + dist[2])]
+		[time, dist] = distributeTimeDist(path, expDurationSec)
 	else:
-		time = [0, dist[1] / speedMPS, dist[2] / speedMPS]
+		dist = geoSegmentDistances2D(path).tolist()
+		time = [d / speedMPS for d in dist]
 
 	return [path, time, dist]
@@ -1,12 +1,17 @@
 from veroviz._common import *
 
-from veroviz._queryPgRouting import pgrGetSnapToRoadLatLon
-from veroviz._queryPgRouting import pgrGetNearestStreet
+from veroviz._queryPgRouting import pgrGetSnapToRoadLatLonBatch
 from veroviz._queryORS import orsGetSnapToRoadLatLon
+from veroviz._queryORS import orsGetSnapToRoadLatLonBatch
 from veroviz._queryOSRM import osrmGetSnapToRoadLatLon
+from veroviz._queryOSRM import osrmGetSnapToRoadLatLonBatch
 from veroviz._queryMapQuest import mqGetSnapToRoadLatLon
 from veroviz._queryMapQuest import mqGetSnapToRoadLatLonBatch
 from veroviz._queryORSlocal import orsLocalGetSnapToRoadLatLon
+from veroviz._httpClient import privMapConcurrent
+
+# Number of concurrent requests to a self-hosted data provider, unless `dataProviderArgs` specifies 'maxWorkers'
+VRV_DEFAULT_LOCAL_MAX_WORKERS = 8
 
 def privGetSnapLocBatch(locs=None, dataProvider=None, dataProviderArgs=None):
 
@@ -45,27 +50,26 @@ def privGetSnapLocBatch(locs=None, dataProvider=None, dataProviderArgs=None):
 
 	elif (dataProviderDictionary[dataProvider] == 'pgrouting'):
 		databaseName = dataProviderArgs['databaseName']
-		for i in range(len(locs)):
-			street = pgrGetNearestStreet(locs[i], databaseName)
-			snapLoc = pgrGetSnapToRoadLatLon(street['gid'], locs[i], databaseName)
-			snapLocs.append(snapLoc)
+		snapLocs = pgrGetSnapToRoadLatLonBatch(locs, databaseName)
 
 	elif (dataProviderDictionary[dataProvider] == 'osrm-online'):
-		for i in range(len(locs)):
-			snapLoc = osrmGetSnapToRoadLatLon(locs[i])
-			snapLocs.append(snapLoc)
+		snapLocs = osrmGetSnapToRoadLatLonBatch(locs)
+
+	elif (dataProviderDictionary[dataProvider] == 'osrm-local'):
+		port = dataProviderArgs['port']
+		host = dataProviderArgs['host'] if ('host' in dataProviderArgs) else None
+		snapLocs = osrmGetSnapToRoadLatLonBatch(locs, host, port)
 
 	elif (dataProviderDictionary[dataProvider] == 'ors-online'):
 		APIkey = dataProviderArgs['APIkey']
-		for i in range(len(locs)):
-			snapLoc = orsGetSnapToRoadLatLon(locs[i], APIkey)
-			snapLocs.append(snapLoc)
+		maxWorkers = dataProviderArgs['maxWorkers'] if ('maxWorkers' in dataProviderArgs) else 1
+		snapLocs = orsGetSnapToRoadLatLonBatch(locs, APIkey, maxWorkers)
 
 	elif (dataProviderDictionary[dataProvider] == 'ors-local'):
+		# There is no batch service; snap the locations concurrently
 		port = dataProviderArgs['port']
-		for i in range(len(locs)):
-			snapLoc = orsLocalGetSnapToRoadLatLon(locs[i], port)
-			snapLocs.append(snapLoc)
+		maxWorkers = dataProviderArgs['maxWorkers'] if ('maxWorkers' in dataProviderArgs) else VRV_DEFAULT_LOCAL_MAX_WORKERS
+		snapLocs = privMapConcurrent(lambda loc: orsLocalGetSnapToRoadLatLon(loc, port), locs, maxWorkers)
 
 	for i in range(len(locs)):
 		if (len(locs[i]) == 3):
@@ -105,12 +109,16 @@ def privGetSnapLoc(loc=None, dataProvider=None, dataProviderArgs=None):
 
 	elif (dataProviderDictionary[dataProvider] == 'pgrouting'):
 		databaseName = dataProviderArgs['databaseName']
-		street = pgrGetNearestStreet(loc, databaseName)
-		snapLoc = pgrGetSnapToRoadLatLon(street['gid'], loc, databaseName)
+		snapLoc = pgrGetSnapToRoadLatLonBatch([loc], databaseName)[0]
 
 	elif (dataProviderDictionary[dataProvider] == 'osrm-online'):
 		snapLoc = osrmGetSnapToRoadLatLon(loc)			
 
+	elif (dataProviderDictionary[dataProvider] == 'osrm-local'):
+		port = dataProviderArgs['port']
+		host = dataProviderArgs['host'] if ('host' in dataProviderArgs) else None
+		snapLoc = osrmGetSnapToRoadLatLon(loc, host, port)
+
 	elif (dataProviderDictionary[dataProvider] == 'ors-online'):
 		APIkey = dataProviderArgs['APIkey']
 		snapLoc = orsGetSnapToRoadLatLon(loc, APIkey)			
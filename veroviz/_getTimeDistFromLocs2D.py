@@ -3,9 +3,14 @@ from veroviz._common import *
 from veroviz._utilities import privConvertDistance
 from veroviz._utilities import privConvertTime
 
-from veroviz._geometry import geoDistance2D
-from veroviz._internal import locs2Dict
-from veroviz._internal import loc2Dict
+from veroviz._geometry import geoDistance2DMatrix
+from veroviz._geometry import geoDistance2DArray
+
+from veroviz._timeDistMatrix import privCreateTimeDistMatrix
+from veroviz._timeDistMatrix import privTimeDistToArray
+from veroviz._timeDistMatrix import privCreateSparseTimeDistMatrix
+from veroviz._timeDistCache import privTimeDistCacheEnabled
+from veroviz._timeDistCache import privGetCachedTimeDist
 
 from veroviz._queryPgRouting import pgrGetTimeDist
 from veroviz._queryORS import orsGetTimeDistAll2All
@@ -19,7 +24,33 @@ from veroviz._queryMapQuest import mqGetTimeDistAll2All
 from veroviz._queryMapQuest import mqGetTimeDistMany2One
 from veroviz._queryMapQuest import mqGetTimeDistOne2Many
 
-def getTimeDistFromLocs2D(fromLocs=None, fromRows=None, toLocs=None, toCols=None, outputDistUnits='meters', outputTimeUnits='seconds', routeType='euclidean2d', speedMPS=None, dataProvider=None, dataProviderArgs=None):
+def getTimeDistFromLocs2D(fromLocs=None, fromRows=None, toLocs=None, toCols=None, outputDistUnits='meters', outputTimeUnits='seconds', routeType='euclidean2d', speedMPS=None, dataProvider=None, dataProviderArgs=None, outputFormat='dict'):
+
+	try:
+		dataProvider = dataProvider.lower()
+	except:
+		pass
+
+	try:
+		routeType = routeType.lower()
+	except:
+		pass
+
+	result = _getTimeDistArrays(fromLocs, toLocs, routeType, speedMPS, dataProvider, dataProviderArgs)
+	if (result is None):
+		return
+	[timeSecs, distMeters] = result
+
+	# Reset output units and rename the keyvalues by fromRows and toCols
+	dist = privCreateTimeDistMatrix(distMeters * privConvertDistance(1.0, 'm', outputDistUnits), fromRows, toCols, outputDistUnits, 'distance', outputFormat)
+	time = privCreateTimeDistMatrix(timeSecs * privConvertTime(1.0, 's', outputTimeUnits), fromRows, toCols, outputTimeUnits, 'time', outputFormat)
+
+	return [time, dist]
+
+def getTimeDistNeighbors2D(locs=None, nodeIDs=None, neighbors=None, outputDistUnits='meters', outputTimeUnits='seconds', routeType='euclidean2d', speedMPS=None, dataProvider=None, dataProviderArgs=None, outputFormat='dict'):
+	"""
+	Like `getTimeDistFromLocs2D()`, but only for the pairs from each location to its neighbors (e.g., as found by `geoNearestNeighbors()`).  Returns sparse matrices; see `privCreateSparseTimeDistMatrix()`.
+	"""
 
 	try:
 		dataProvider = dataProvider.lower()
@@ -31,43 +62,122 @@ def getTimeDistFromLocs2D(fromLocs=None, fromRows=None, toLocs=None, toCols=None
 	except:
 		pass
 
-	# Do queries to find DICTIONARIES of distance and time matrices
+	[numLocs, k] = neighbors.shape
+
+	if (routeType in ['euclidean2d', 'manhattan']):
+		# Every pair is solved at once
+		lats = np.array([loc[0] for loc in locs], dtype=float)
+		lons = np.array([loc[1] for loc in locs], dtype=float)
+		fromLats = np.repeat(lats[:, None], k, axis=1)
+		fromLons = np.repeat(lons[:, None], k, axis=1)
+		toLats = lats[neighbors]
+		toLons = lons[neighbors]
+		if (routeType == 'euclidean2d'):
+			distMeters = geoDistance2DArray(fromLats, fromLons, toLats, toLons)
+		else:
+			distMeters = geoDistance2DArray(fromLats, fromLons, fromLats, toLons) + geoDistance2DArray(fromLats, toLons, toLats, toLons)
+		timeSecs = distMeters / speedMPS
+	else:
+		# One one2many query per location, covering only its neighbors
+		distMeters = np.empty((numLocs, k), dtype=np.float64)
+		timeSecs = np.empty((numLocs, k), dtype=np.float64)
+		for i in range(numLocs):
+			if (k == 0):
+				break
+			result = _getTimeDistArrays([locs[i]], [locs[j] for j in neighbors[i]], routeType, speedMPS, dataProvider, dataProviderArgs)
+			if (result is None):
+				return
+			timeSecs[i, :] = result[0][0, :]
+			distMeters[i, :] = result[1][0, :]
+
+	dist = privCreateSparseTimeDistMatrix(distMeters * privConvertDistance(1.0, 'm', outputDistUnits), neighbors, nodeIDs, outputDistUnits, 'distance', outputFormat)
+	time = privCreateSparseTimeDistMatrix(timeSecs * privConvertTime(1.0, 's', outputTimeUnits), neighbors, nodeIDs, outputTimeUnits, 'time', outputFormat)
+
+	return [time, dist]
+
+def _getTimeDistArrays(fromLocs, toLocs, routeType, speedMPS, dataProvider, dataProviderArgs):
+	"""
+	Returns travel time (in seconds) and distance (in meters) arrays from each of `fromLocs` to each of `toLocs`, or None if `routeType` isn't supported by `dataProvider`.  `routeType` and `dataProvider` should already be lower case.
+	"""
+
+	# Do queries to find distance and time matrices (either arrays or DICTIONARIES keyed by (i, j))
 	distMeters = {}
 	timeSecs = {}
 	if (routeType == 'euclidean2d'):
 		[timeSecs, distMeters] = _getTimeDistEuclidean2D(fromLocs, toLocs, speedMPS)
 	elif (routeType == 'manhattan'):
 		[timeSecs, distMeters] = _getTimeDistManhattan(fromLocs, toLocs, speedMPS)
-	elif (routeType == 'fastest' and dataProviderDictionary[dataProvider] == 'pgrouting'):
+	elif (privGetProviderKey(routeType, dataProvider, dataProviderArgs) is None):
+		return
+	elif (privTimeDistCacheEnabled()):
+		# Only query the data provider for pairs that aren't in the cache.
+		# Cached values never include `speedMPS`; it is applied afterwards.
+		providerKey = privGetProviderKey(routeType, dataProvider, dataProviderArgs)
+		[timeSecs, distMeters] = privGetCachedTimeDist(fromLocs, toLocs, providerKey, routeType, 
+			lambda subFromLocs, subToLocs: _getTimeDistFromProvider(subFromLocs, subToLocs, routeType, None, dataProvider, dataProviderArgs))
+		if (timeSecs is None):
+			return
+		if (speedMPS != None):
+			timeSecs = distMeters / speedMPS
+	else:
+		[timeSecs, distMeters] = _getTimeDistFromProvider(fromLocs, toLocs, routeType, speedMPS, dataProvider, dataProviderArgs)
+
+	distMeters = privTimeDistToArray(distMeters, len(fromLocs), len(toLocs))
+	timeSecs = privTimeDistToArray(timeSecs, len(fromLocs), len(toLocs))
+
+	return [timeSecs, distMeters]
+
+def privGetProviderKey(routeType, dataProvider, dataProviderArgs):
+	"""
+	Returns a string identifying the data provider (and, for local providers, the server or database) for the travel time/distance and route caches.  Returns None if `routeType` isn't supported by `dataProvider`.
+	"""
+
+	if (routeType == 'fastest' and dataProviderDictionary[dataProvider] == 'pgrouting'):
+		return 'pgrouting:%s' % (dataProviderArgs['databaseName'])
+	elif (routeType == 'fastest' and dataProviderDictionary[dataProvider] == 'osrm-online'):
+		return 'osrm-online'
+	elif (routeType == 'fastest' and dataProviderDictionary[dataProvider] == 'osrm-local'):
+		host = dataProviderArgs['host'] if ('host' in dataProviderArgs) else 'localhost'
+		return 'osrm-local:%s:%s' % (host, dataProviderArgs['port'])
+	elif (routeType in ['fastest', 'shortest', 'pedestrian'] and dataProviderDictionary[dataProvider] == 'mapquest'):
+		return 'mapquest'
+	elif (routeType in ['fastest', 'pedestrian', 'cycling', 'truck', 'wheelchair'] and dataProviderDictionary[dataProvider] == 'ors-online'):
+		return 'ors-online'
+	elif (routeType in ['fastest', 'pedestrian', 'cycling', 'truck'] and dataProviderDictionary[dataProvider] == 'ors-local'):
+		return 'ors-local:localhost:%s' % (dataProviderArgs['port'])
+
+	return None
+
+def _getTimeDistFromProvider(fromLocs, toLocs, routeType, speedMPS, dataProvider, dataProviderArgs):
+	"""
+	Queries a road-network data provider for travel time and distance matrices.  The data provider must support `routeType` (see `privGetProviderKey()`).
+	"""
+
+	if (dataProviderDictionary[dataProvider] == 'pgrouting'):
 		databaseName = dataProviderArgs['databaseName']
 		[timeSecs, distMeters] = _getTimeDistPgRouting(fromLocs, toLocs, databaseName, speedMPS)
-	elif (routeType == 'fastest' and dataProviderDictionary[dataProvider] == 'osrm-online'):
+	elif (dataProviderDictionary[dataProvider] == 'osrm-online'):
 		[timeSecs, distMeters] = _getTimeDistOSRM(fromLocs, toLocs, speedMPS)
-	elif (routeType in ['fastest', 'shortest', 'pedestrian'] and dataProviderDictionary[dataProvider] == 'mapquest'):
+	elif (dataProviderDictionary[dataProvider] == 'osrm-local'):
+		port = dataProviderArgs['port']
+		host = dataProviderArgs['host'] if ('host' in dataProviderArgs) else None
+		[timeSecs, distMeters] = _getTimeDistOSRM(fromLocs, toLocs, speedMPS, host, port)
+	elif (dataProviderDictionary[dataProvider] == 'mapquest'):
 		APIkey = dataProviderArgs['APIkey']
 		[timeSecs, distMeters] = _getTimeDistMapQuest(fromLocs, toLocs, routeType, APIkey, speedMPS)
-	elif (routeType in ['fastest', 'pedestrian', 'cycling', 'truck', 'wheelchair'] and dataProviderDictionary[dataProvider] == 'ors-online'):
+	elif (dataProviderDictionary[dataProvider] == 'ors-online'):
 		APIkey = dataProviderArgs['APIkey']
-		[timeSecs, distMeters] = _getTimeDistORS(fromLocs, toLocs, routeType, APIkey, speedMPS)
-	elif (routeType in ['fastest', 'pedestrian', 'cycling', 'truck'] and dataProviderDictionary[dataProvider] == 'ors-local'):
+		maxWorkers = dataProviderArgs['maxWorkers'] if ('maxWorkers' in dataProviderArgs) else 1
+		[timeSecs, distMeters] = _getTimeDistORS(fromLocs, toLocs, routeType, APIkey, speedMPS, maxWorkers)
+	elif (dataProviderDictionary[dataProvider] == 'ors-local'):
 		port = dataProviderArgs['port']
 		[timeSecs, distMeters] = _getTimeDistORSlocal(fromLocs, toLocs, routeType, port, speedMPS)
-	else:
-		return
 
-	# Rename the keyvalues by fromRows and toCols and reset output units
-	dist = {}
-	time = {}
-	for i in range(len(fromRows)):
-		for j in range(len(toCols)):
-			dist[fromRows[i], toCols[j]] = distMeters[i, j] * privConvertDistance(1.0, 'm', outputDistUnits)
-			time[fromRows[i], toCols[j]] = timeSecs[i, j] * privConvertTime(1.0, 's', outputTimeUnits)
-
-	return [time, dist]
+	return [timeSecs, distMeters]
 
 def _getTimeDistEuclidean2D(fromLocs, toLocs, speedMPS):
 	"""
-	Generate two dictionaries, one for time, another for distance, using euclidean (in 2D)
+	Generate two arrays, one for time, another for distance, using euclidean (in 2D)
 
 	Parameters
 	----------
@@ -80,25 +190,22 @@ def _getTimeDistEuclidean2D(fromLocs, toLocs, speedMPS):
 
 	returns
 	-------
-	timeSecs: dictionary
-		A dictionary for time from nodes to nodes, unit is in [seconds]
-	distMeters: dictionary
-		A dictionary for distance from nodes to nodes, unit is in [meters]
+	timeSecs: numpy array
+		An array for time from nodes to nodes, unit is in [seconds]
+	distMeters: numpy array
+		An array for distance from nodes to nodes, unit is in [meters]
 	
 	"""
 
-	distMeters = {}
-	timeSecs = {}
-	for i in range(len(fromLocs)):
-		for j in range(len(toLocs)):
-			eucDist = geoDistance2D(fromLocs[i], toLocs[j])
-			distMeters[i, j] = eucDist
-			timeSecs[i, j] = eucDist / speedMPS
+	# All pairs are solved in a single vectorized call; see `geoDistance2DArray()` for accuracy
+	distMeters = geoDistance2DMatrix(fromLocs, toLocs)
+	timeSecs = distMeters / speedMPS
+
 	return [timeSecs, distMeters]
 
 def _getTimeDistManhattan(fromLocs, toLocs, speedMPS):
 	"""
-	Generate two dictionaries, one for time, another for distance, using Manhattan
+	Generate two arrays, one for time, another for distance, using Manhattan
 
 	Parameters
 	----------
@@ -111,25 +218,26 @@ def _getTimeDistManhattan(fromLocs, toLocs, speedMPS):
 
 	returns
 	-------
-	timeSecs: dictionary
-		A dictionary for time from nodes to nodes, unit is in [seconds]
-	distMeters: dictionary
-		A dictionary for distance from nodes to nodes, unit is in [meters]
+	timeSecs: numpy array
+		An array for time from nodes to nodes, unit is in [seconds]
+	distMeters: numpy array
+		An array for distance from nodes to nodes, unit is in [meters]
 	
 	"""
 
-	distMeters = {}
-	timeSecs = {}
-	for i in range(len(fromLocs)):
-		for j in range(len(toLocs)):
-			fromLocsDict = locs2Dict(fromLocs)
-			toLocsDict = locs2Dict(toLocs)
-			manDist = geoDistance2D(fromLocs[i], (fromLocsDict[i]['lat'], toLocsDict[j]['lon'])) + geoDistance2D((fromLocsDict[i]['lat'], toLocsDict[j]['lon']), toLocs[j])
-			distMeters[i, j] = manDist
-			timeSecs[i, j] = manDist / speedMPS
+	fromLats = np.array([loc[0] for loc in fromLocs], dtype=float)[:, None]
+	fromLons = np.array([loc[1] for loc in fromLocs], dtype=float)[:, None]
+	toLats = np.array([loc[0] for loc in toLocs], dtype=float)[None, :]
+	toLons = np.array([loc[1] for loc in toLocs], dtype=float)[None, :]
+
+	# Each trip travels along the origin's latitude to the corner (fromLat, toLon), 
+	# then along the destination's longitude.  Both legs are solved for the whole matrix at once.
+	distMeters = geoDistance2DArray(fromLats, fromLons, fromLats, toLons) + geoDistance2DArray(fromLats, toLons, toLats, toLons)
+	timeSecs = distMeters / speedMPS
+
 	return [timeSecs, distMeters]
 
-def _getTimeDistOSRM(fromLocs, toLocs, speedMPS):
+def _getTimeDistOSRM(fromLocs, toLocs, speedMPS, host=None, port=None):
 	"""
 	Generate two dictionaries, one for time, another for distance, using OSRM
 
@@ -141,6 +249,10 @@ def _getTimeDistOSRM(fromLocs, toLocs, speedMPS):
 		The End node coordinates in format of [[lat, lon], [lat, lon], ... ]
 	speedMPS: float, Required
 		A constant speed for calculation
+	host: string, Optional
+		Host name of a self-hosted OSRM server ('OSRM-local')
+	port: string, Optional
+		Port of a self-hosted OSRM server ('OSRM-local').  If None, the online OSRM server is used.
 
 	returns
 	-------
@@ -151,7 +263,7 @@ def _getTimeDistOSRM(fromLocs, toLocs, speedMPS):
 	
 	"""
 
-	[timeSecs, distMeters] = osrmGetTimeDist(fromLocs, toLocs)
+	[timeSecs, distMeters] = osrmGetTimeDist(fromLocs, toLocs, host, port)
 
 	if (speedMPS != None):
 		for i in range(len(fromLocs)):
@@ -162,7 +274,7 @@ def _getTimeDistOSRM(fromLocs, toLocs, speedMPS):
 
 def _getTimeDistPgRouting(fromLocs, toLocs, databaseName, speedMPS):
 	"""
-	Generate two dictionaries, one for time, another for distance, using pgRouting
+	Generate two matrices, one for time, another for distance, using pgRouting
 
 	Parameters
 	----------
@@ -177,10 +289,10 @@ def _getTimeDistPgRouting(fromLocs, toLocs, databaseName, speedMPS):
 
 	returns
 	-------
-	timeSecs: dictionary
-		A dictionary for time from nodes to nodes, unit is in [seconds]
-	distMeters: dictionary
-		A dictionary for distance from nodes to nodes, unit is in [meters]
+	timeSecs: numpy array
+		An array for time from nodes to nodes, unit is in [seconds]
+	distMeters: numpy array
+		An array for distance from nodes to nodes, unit is in [meters]
 	
 	"""
 	
@@ -229,8 +341,10 @@ def _getTimeDistMapQuest(fromLocs, toLocs, travelMode, APIkey, speedMPS):
 		toLoc = toLocs[0]
 		[timeSecs, distMeters] = mqGetTimeDistMany2One(fromLocs, toLoc, travelMode, APIkey)
 	else:
+		distMeters = {}
+		timeSecs = {}
 		for i in range(len(fromLocs)):
-			[timeRow, distRow] = mqGetTimeDistOne2Many(fromLocs[i], toLocs, routeType, APIkey)
+			[timeRow, distRow] = mqGetTimeDistOne2Many(fromLocs[i], toLocs, travelMode, APIkey)
 			for j in range(len(toLocs)):
 				distMeters[i, j] = distRow[0, j]
 				timeSecs[i, j] = timeRow[0, j]
@@ -242,7 +356,7 @@ def _getTimeDistMapQuest(fromLocs, toLocs, travelMode, APIkey, speedMPS):
 
 	return [timeSecs, distMeters]
 
-def _getTimeDistORS(fromLocs, toLocs, travelMode, APIkey, speedMPS):
+def _getTimeDistORS(fromLocs, toLocs, travelMode, APIkey, speedMPS, maxWorkers=1):
 	"""
 	Generate two dictionaries, one for time, another for distance, using ORS-online
 
@@ -258,6 +372,8 @@ def _getTimeDistORS(fromLocs, toLocs, travelMode, APIkey, speedMPS):
 		Some data providers require an API key (which you'll need to register for). See :ref:`Data Providers`
 	speedMPS: float, Required
 		A constant speed for calculation
+	maxWorkers: int, Optional
+		The number of matrix blocks that may be requested concurrently (all-to-all matrices only)
 
 	returns
 	-------
@@ -270,7 +386,7 @@ def _getTimeDistORS(fromLocs, toLocs, travelMode, APIkey, speedMPS):
 
 	if (fromLocs == toLocs):
 		locs = fromLocs.copy()
-		[timeSecs, distMeters] = orsGetTimeDistAll2All(locs, travelMode, APIkey)
+		[timeSecs, distMeters] = orsGetTimeDistAll2All(locs, travelMode, APIkey, maxWorkers)
 	elif (len(fromLocs) == 1):
 		fromLoc = fromLocs[0]
 		[timeSecs, distMeters] = orsGetTimeDistOne2Many(fromLoc, toLocs, travelMode, APIkey)
@@ -278,8 +394,10 @@ def _getTimeDistORS(fromLocs, toLocs, travelMode, APIkey, speedMPS):
 		toLoc = toLocs[0]
 		[timeSecs, distMeters] = orsGetTimeDistMany2One(fromLocs, toLoc, travelMode, APIkey)
 	else:
+		distMeters = {}
+		timeSecs = {}
 		for i in range(len(fromLocs)):
-			[timeRow, distRow] = orsGetTimeDistOne2Many(fromLocs[i], toLocs, routeType, APIkey)
+			[timeRow, distRow] = orsGetTimeDistOne2Many(fromLocs[i], toLocs, travelMode, APIkey)
 			for j in range(len(toLocs)):
 				distMeters[i, j] = distRow[0, j]
 				timeSecs[i, j] = timeRow[0, j]
@@ -327,8 +445,10 @@ def _getTimeDistORSlocal(fromLocs, toLocs, travelMode, port, speedMPS):
 		toLoc = toLocs[0]
 		[timeSecs, distMeters] = orsLocalGetTimeDistMany2One(fromLocs, toLoc, travelMode, port)
 	else:
+		distMeters = {}
+		timeSecs = {}
 		for i in range(len(fromLocs)):
-			[timeRow, distRow] = orsLocalGetTimeDistOne2Many(fromLocs[i], toLocs, routeType, port)
+			[timeRow, distRow] = orsLocalGetTimeDistOne2Many(fromLocs[i], toLocs, travelMode, port)
 			for j in range(len(toLocs)):
 				distMeters[i, j] = distRow[0, j]
 				timeSecs[i, j] = timeRow[0, j]
@@ -0,0 +1,214 @@
+from veroviz._common import *
+import threading
+import concurrent.futures
+
+# HTTP status codes that are worth retrying (rate limited, or a transient server problem)
+VRV_HTTP_RETRY_STATUS = [429, 500, 502, 503, 504]
+
+# One keep-alive connection pool is shared by all requests (and all threads).  It keeps a separate
+# pool for each host.  `urllib3.PoolManager` is thread-safe.
+_poolManager = None
+_poolManagerSize = None
+_poolManagerLock = threading.Lock()
+
+# Request counters, keyed by host
+_httpStats = {}
+_httpStatsLock = threading.Lock()
+
+# Rate limiters, keyed by name (e.g., 'ors-online-matrix')
+_rateLimiters = {}
+_rateLimitersLock = threading.Lock()
+
+class _TokenBucket(object):
+	"""
+	A thread-safe token-bucket rate limiter.  Up to `capacity` requests may be issued back-to-back; after that, requests are released at `requestsPerMinute`.
+	"""
+
+	def __init__(self, requestsPerMinute, capacity=None):
+		self._lock = threading.Lock()
+		self.setRate(requestsPerMinute, capacity)
+		self._tokens = float(self.capacity)
+		self._lastRefill = time.monotonic()
+
+	def setRate(self, requestsPerMinute, capacity=None):
+		self.requestsPerMinute = float(requestsPerMinute)
+		self.capacity = max(1, int(capacity if (capacity is not None) else requestsPerMinute))
+
+	def _refill(self):
+		now = time.monotonic()
+		self._tokens = min(float(self.capacity), self._tokens + (now - self._lastRefill) * self.requestsPerMinute / 60.0)
+		self._lastRefill = now
+
+	def acquire(self):
+		while True:
+			with self._lock:
+				self._refill()
+				if (self._tokens >= 1.0):
+					self._tokens -= 1.0
+					return
+				waitSec = (1.0 - self._tokens) * 60.0 / self.requestsPerMinute
+			time.sleep(waitSec)
+
+def privGetPoolManager():
+	"""
+	Returns the `urllib3.PoolManager` shared by all data provider queries.  Each host gets its own pool of up to `config['VRV_SETTING_HTTP_MAX_CONNECTIONS_PER_HOST']` keep-alive connections; requests beyond that wait for a free connection.  If the setting has changed (e.g., via `setGlobal()`), a new `PoolManager` is created.
+	"""
+
+	global _poolManager, _poolManagerSize
+	maxConnections = config['VRV_SETTING_HTTP_MAX_CONNECTIONS_PER_HOST']
+	if (_poolManager is None or _poolManagerSize != maxConnections):
+		with _poolManagerLock:
+			if (_poolManager is None or _poolManagerSize != maxConnections):
+				_poolManager = urllib3.PoolManager(num_pools=10, maxsize=maxConnections, block=True)
+				_poolManagerSize = maxConnections
+
+	return _poolManager
+
+def _getTimeout():
+	timeoutSecs = config['VRV_SETTING_HTTP_TIMEOUT_SECONDS']
+	if (timeoutSecs is None):
+		return urllib3.Timeout(connect=None, read=None)
+
+	return urllib3.Timeout(connect=min(10.0, timeoutSecs), read=timeoutSecs)
+
+def _recordRequest(host, seconds, retried, failed):
+	with _httpStatsLock:
+		if (host not in _httpStats):
+			_httpStats[host] = {'requests': 0, 'retries': 0, 'failures': 0, 'seconds': 0.0}
+		_httpStats[host]['requests'] += 1
+		_httpStats[host]['seconds'] += seconds
+		if (retried):
+			_httpStats[host]['retries'] += 1
+		if (failed):
+			_httpStats[host]['failures'] += 1
+
+def privGetRateLimiter(name, requestsPerMinute):
+	"""
+	Returns the rate limiter registered under `name`, creating it if necessary.  If `requestsPerMinute` has changed since the limiter was created (e.g., via `setGlobal()`), the limiter is updated.  Returns None if `requestsPerMinute` is None (no limit).
+	"""
+
+	if (requestsPerMinute is None):
+		return None
+
+	with _rateLimitersLock:
+		if (name not in _rateLimiters):
+			_rateLimiters[name] = _TokenBucket(requestsPerMinute)
+		elif (_rateLimiters[name].requestsPerMinute != float(requestsPerMinute)):
+			_rateLimiters[name].setRate(requestsPerMinute)
+
+		return _rateLimiters[name]
+
+def privHttpRequest(method, url, headers=None, body=None, rateLimiter=None, maxRetries=None):
+	"""
+	Issues an HTTP request through the shared connection pool.  All data provider queries should use this function.  If `rateLimiter` is provided, the request waits for a token first.  Requests that fail with a 429 or 5xx status (or a connection error or timeout) are retried up to `maxRetries` times, with exponential backoff.  A `Retry-After` header, if provided by the server, is honored.  Responses may be gzip-compressed; they are decompressed automatically.
+
+	Parameters
+	----------
+	method: string
+		'GET' or 'POST'
+	url: string
+		The request URL
+	headers: dictionary, Optional
+		Request headers
+	body: string, Optional
+		The (encoded) request body
+	rateLimiter: _TokenBucket, Optional
+		As returned by `privGetRateLimiter()`
+	maxRetries: int, Optional
+		Defaults to `config['VRV_SETTING_HTTP_MAX_RETRIES']`
+
+	Returns
+	-------
+	urllib3.HTTPResponse
+		The final response.  The caller is responsible for checking its status.
+	"""
+
+	if (maxRetries is None):
+		maxRetries = config['VRV_SETTING_HTTP_MAX_RETRIES']
+
+	http = privGetPoolManager()
+	host = urllib3.util.parse_url(url).host
+
+	requestHeaders = {'Accept-Encoding': 'gzip'}
+	if (headers is not None):
+		requestHeaders.update(headers)
+
+	attempt = 0
+	while True:
+		if (rateLimiter is not None):
+			rateLimiter.acquire()
+
+		startTime = time.monotonic()
+		try:
+			response = http.request(method, url, headers=requestHeaders, body=body, retries=False, timeout=_getTimeout())
+		except (urllib3.exceptions.ProtocolError, urllib3.exceptions.NewConnectionError, urllib3.exceptions.TimeoutError):
+			_recordRequest(host, time.monotonic() - startTime, (attempt > 0), True)
+			if (attempt >= maxRetries):
+				raise
+			response = None
+
+		if (response is not None):
+			_recordRequest(host, time.monotonic() - startTime, (attempt > 0), (response.status >= 400))
+			if (response.status not in VRV_HTTP_RETRY_STATUS or attempt >= maxRetries):
+				return response
+
+		waitSec = 2.0 ** attempt
+		if (response is not None):
+			try:
+				waitSec = max(waitSec, float(response.headers.get('Retry-After')))
+			except (TypeError, ValueError):
+				pass
+
+		time.sleep(min(waitSec, 60.0))
+		attempt += 1
+
+def privMapConcurrent(function, items, maxWorkers=1):
+	"""
+	Returns `[function(item) for item in items]`, calling `function` from up to `maxWorkers` threads at once.  The results are in the order of `items`.  If any call raises an exception, the calls that have not started yet are cancelled and the exception is raised.
+	"""
+
+	if (maxWorkers is None or maxWorkers <= 1 or len(items) <= 1):
+		return [function(item) for item in items]
+
+	results = [None] * len(items)
+	futures = {}
+	executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(int(maxWorkers), len(items)))
+	try:
+		futures = {executor.submit(function, items[i]): i for i in range(len(items))}
+		for future in concurrent.futures.as_completed(futures):
+			results[futures[future]] = future.result()
+	finally:
+		for future in futures:
+			future.cancel()
+		executor.shutdown(wait=True)
+
+	return results
+
+def getHttpStats(resetStats=False):
+	"""
+	Returns statistics for the HTTP requests made to data providers during this session.
+
+	Parameters
+	----------
+	resetStats: boolean, Optional, default as False
+		If True, the counters are reset to zero after they are returned.
+
+	Returns
+	-------
+	dictionary
+		Keyed by host name (e.g., 'api.openrouteservice.org').  For each host, 'requests' gives the number of requests sent (including retries), 'retries' the number of those that were retries, 'failures' the number that failed (with an error status, a timeout, or a connection error), and 'seconds' the total time spent waiting for responses.
+
+	Example
+	-------
+		>>> import veroviz as vrv
+		>>> [time, dist] = vrv.getTimeDist2D(nodes=myNodes, routeType='fastest', dataProvider='OSRM-online')
+		>>> vrv.getHttpStats()
+		{'router.project-osrm.org': {'requests': 1, 'retries': 0, 'failures': 0, 'seconds': 0.41}}
+	"""
+
+	with _httpStatsLock:
+		stats = {host: dict(hostStats) for [host, hostStats] in _httpStats.items()}
+		if (resetStats):
+			_httpStats.clear()
+
+	return stats
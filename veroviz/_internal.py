@@ -1,5 +1,6 @@
 from veroviz._common import *
 from veroviz._geometry import geoDistance2D
+from veroviz._geometry import geoSegmentDistances2D
 
 def distributeTimeDist(path, totalTime):
 	"""
@@ -20,20 +21,36 @@ def distributeTimeDist(path, totalTime):
 		Distance between neighboring coordinates in meters.
 	"""
 
-	timeSecs = []
-	distMeters = []
-	totalDistMeters = 0
-	distMeters.append(0)
-	timeSecs.append(0)
-	for i in range(1, len(path)):
-		d = geoDistance2D(path[i - 1], path[i])
-		distMeters.append(d)
-		totalDistMeters += d
+	distMeters = geoSegmentDistances2D(path)
+	totalDistMeters = accumulate(distMeters)[-1]
 
-	for i in range(1, len(path)):
-		timeSecs.append(totalTime * float(distMeters[i]) / float(totalDistMeters))
+	if (totalDistMeters > 0):
+		timeSecs = totalTime * distMeters / totalDistMeters
+	else:
+		# All of the shapepoints are at the same location; split the time evenly
+		timeSecs = np.full(len(path), float(totalTime) / max(len(path) - 1, 1))
+		timeSecs[0] = 0
+
+	return [timeSecs.tolist(), distMeters.tolist()]
+
+def accumulate(values, initial=0):
+	"""
+	Converts per-shapepoint values (e.g., the time or distance from the previous shapepoint, as returned by `distributeTimeDist()`) into accumulated values.  The first element of `values` is ignored, as it is 0 by definition.
+
+	Parameters
+	----------
+	values: list
+		The value for each shapepoint, relative to the previous shapepoint
+	initial: float, Optional, default as 0
+		The accumulated value at the first shapepoint (e.g., the start time)
+
+	Returns
+	-------
+	numpy array
+		The accumulated value at each shapepoint
+	"""
 
-	return [timeSecs, distMeters]
+	return np.cumsum(np.concatenate(([initial], np.asarray(values[1:], dtype=float))))
 
 def randomPick(coefficients):
 	"""
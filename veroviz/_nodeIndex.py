@@ -0,0 +1,122 @@
+from veroviz._common import *
+import weakref
+
+# Node-coordinate indices, keyed by id() of the Nodes dataframe they were built from.
+# Entries are dropped automatically when the dataframe is garbage collected.
+_nodeIndexCache = {}
+
+def _buildNodeIndex(nodes):
+	ids = nodes['id'].values
+	lats = nodes['lat'].values.astype(float)
+	lons = nodes['lon'].values.astype(float)
+	if ('altMeters' in nodes.columns):
+		altValues = nodes['altMeters'].values.copy()
+		alts = pd.to_numeric(nodes['altMeters'], errors='coerce').fillna(0).values.astype(float)
+	else:
+		altValues = None
+		alts = np.zeros(len(nodes))
+
+	# If an ID appears more than once, the first row wins (consistent with `.values[0]` lookups)
+	firstMask = ~pd.Index(ids).duplicated(keep='first')
+
+	return {
+		'ids': ids.copy(),
+		'altValues': altValues,
+		'lats': lats,
+		'lons': lons,
+		'alts': alts,
+		'index': pd.Index(ids[firstMask]),
+		'rows': np.nonzero(firstMask)[0]
+	}
+
+def _isNodeIndexCurrent(nodeIndex, nodes):
+	# The dataframe may have been edited in place since the index was built.
+	# The columns are compared as they are stored, without the conversions (and copies) made by `_buildNodeIndex()`.
+	if (len(nodeIndex['ids']) != len(nodes)):
+		return False
+	if (not np.array_equal(nodeIndex['ids'], nodes['id'].values)):
+		return False
+	if (not np.array_equal(nodeIndex['lats'], nodes['lat'].values)):
+		return False
+	if (not np.array_equal(nodeIndex['lons'], nodes['lon'].values)):
+		return False
+	if (('altMeters' in nodes.columns) != (nodeIndex['altValues'] is not None)):
+		return False
+	if (nodeIndex['altValues'] is not None and not np.array_equal(nodeIndex['altValues'], nodes['altMeters'].values)):
+		return False
+
+	return True
+
+def privGetNodeIndex(nodes):
+	"""
+	Returns the coordinate index of a :ref:`Nodes` dataframe.  The index is built once and cached against the dataframe; it is rebuilt only if the `id`, `lat`, `lon`, or `altMeters` columns have changed since.
+
+	Parameters
+	----------
+	nodes: :ref:`Nodes`
+		A Nodes dataframe
+
+	Returns
+	-------
+	dictionary
+		Contains the node coordinates as arrays ('lats', 'lons', 'alts') and a hash index from node ID to row position ('index' and 'rows').
+	"""
+
+	key = id(nodes)
+	if (key in _nodeIndexCache):
+		[nodesRef, nodeIndex] = _nodeIndexCache[key]
+		if (nodesRef() is nodes and _isNodeIndexCurrent(nodeIndex, nodes)):
+			return nodeIndex
+
+	nodeIndex = _buildNodeIndex(nodes)
+	try:
+		nodesRef = weakref.ref(nodes, lambda ref, key=key: _nodeIndexCache.pop(key, None))
+		_nodeIndexCache[key] = [nodesRef, nodeIndex]
+	except TypeError:
+		# Not weak-referenceable; use the index without caching it
+		pass
+
+	return nodeIndex
+
+def privGetNodeCoords(nodes, nodeIDs):
+	"""
+	Gathers the coordinates of the given node IDs in one vectorized lookup.
+
+	Parameters
+	----------
+	nodes: :ref:`Nodes`
+		A Nodes dataframe
+	nodeIDs: list
+		Node IDs (from the `id` column of `nodes`).  IDs may repeat.
+
+	Returns
+	-------
+	lats: numpy array
+		Latitudes, in the order of `nodeIDs`
+	lons: numpy array
+		Longitudes, in the order of `nodeIDs`
+	alts: numpy array
+		Altitudes (from the `altMeters` column, 0 if missing), in the order of `nodeIDs`
+	"""
+
+	nodeIndex = privGetNodeIndex(nodes)
+
+	positions = nodeIndex['index'].get_indexer(list(nodeIDs))
+	if ((positions < 0).any()):
+		missingIDs = [nodeIDs[i] for i in np.nonzero(positions < 0)[0]]
+		raise KeyError("Node ID(s) %s not found in the `nodes` dataframe." % (missingIDs))
+	rows = nodeIndex['rows'][positions]
+
+	return [nodeIndex['lats'][rows], nodeIndex['lons'][rows], nodeIndex['alts'][rows]]
+
+def privGetNodeLocs(nodes, nodeIDs, includeAlt=False):
+	"""
+	Like :meth:`privGetNodeCoords`, but returns a list of locations, in [[lat, lon], [lat, lon], ...] format (or [[lat, lon, alt], ...] if `includeAlt` is True).
+	"""
+
+	[lats, lons, alts] = privGetNodeCoords(nodes, nodeIDs)
+
+	if (includeAlt):
+		return np.column_stack((lats, lons, alts)).tolist()
+
+	return np.column_stack((lats, lons)).tolist()
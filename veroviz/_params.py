@@ -21,6 +21,10 @@ VRV_CONST_SQFT_PER_SQMETER = 10.7639
 # Standard const
 VRV_CONST_RADIUS_OF_EARTH = 6378100.0	# [meters]
 
+# WGS-84 ellipsoid (same ellipsoid geopy uses by default)
+VRV_CONST_WGS84_SEMIMAJOR_AXIS = 6378137.0	# [meters]
+VRV_CONST_WGS84_FLATTENING = 1 / 298.257223563
+
 # # Default error tolerance of distance between origin/destin to snapped loc
 # VRV_DEFAULT_DISTANCE_ERROR_TOLERANCE = 10 # [meters]
 
@@ -72,10 +76,26 @@ VRV_CONST_RADIUS_OF_EARTH = 6378100.0	# [meters]
 # VRV_SETTING_PGROUTING_USERNAME = 'user'
 # VRV_SETTING_PGROUTING_HOST = 'localhost'
 # VRV_SETTING_PGROUTING_PASSWORD = ''
+# VRV_SETTING_PGROUTING_MAX_CONNECTIONS = 8
 
 # VRV_SETTING_SHOWOUTPUTMESSAGE = True
 # VRV_SETTING_SHOWWARNINGMESSAGE = True
 
+# VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE = 40
+# VRV_SETTING_ORS_REQUESTS_PER_MINUTE = 40
+# VRV_SETTING_HTTP_MAX_RETRIES = 3
+# VRV_SETTING_HTTP_TIMEOUT_SECONDS = 60
+# VRV_SETTING_HTTP_MAX_CONNECTIONS_PER_HOST = 8
+# VRV_SETTING_ASYNC_MAX_WORKERS = 16
+
+# VRV_SETTING_TIMEDIST_CACHE_FILE = None
+# VRV_SETTING_TIMEDIST_CACHE_TTL_SECONDS = 2592000
+# VRV_SETTING_TIMEDIST_CACHE_MAX_ENTRIES = 5000000
+
+# VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES = 1000
+# VRV_SETTING_ROUTE_CACHE_FILE = None
+# VRV_SETTING_ROUTE_CACHE_TTL_SECONDS = 2592000
+
 config = {
 	"VRV_DEFAULT_DISTANCE_ERROR_TOLERANCE" : 10,
 	"VRV_DEFAULT_LEAFLET_OBJECT_COLOR_LINE" : 'red',
@@ -112,8 +132,21 @@ config = {
 	"VRV_SETTING_PGROUTING_USERNAME" : 'user',
 	"VRV_SETTING_PGROUTING_HOST" : 'localhost',
 	"VRV_SETTING_PGROUTING_PASSWORD" : '',
+	"VRV_SETTING_PGROUTING_MAX_CONNECTIONS" : 8,
 	"VRV_SETTING_SHOWOUTPUTMESSAGE" : True,
-	"VRV_SETTING_SHOWWARNINGMESSAGE" : True
+	"VRV_SETTING_SHOWWARNINGMESSAGE" : True,
+	"VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE" : 40,
+	"VRV_SETTING_ORS_REQUESTS_PER_MINUTE" : 40,
+	"VRV_SETTING_HTTP_MAX_RETRIES" : 3,
+	"VRV_SETTING_HTTP_TIMEOUT_SECONDS" : 60,
+	"VRV_SETTING_HTTP_MAX_CONNECTIONS_PER_HOST" : 8,
+	"VRV_SETTING_ASYNC_MAX_WORKERS" : 16,
+	"VRV_SETTING_TIMEDIST_CACHE_FILE" : None,
+	"VRV_SETTING_TIMEDIST_CACHE_TTL_SECONDS" : 2592000,
+	"VRV_SETTING_TIMEDIST_CACHE_MAX_ENTRIES" : 5000000,
+	"VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES" : 1000,
+	"VRV_SETTING_ROUTE_CACHE_FILE" : None,
+	"VRV_SETTING_ROUTE_CACHE_TTL_SECONDS" : 2592000
 }
 
 # For validation
@@ -195,6 +228,85 @@ assignmentsColumnList = [
 	'tollway'
 ]
 
+# Column types of the nodes, arcs, and assignments dataframes.  The style and model columns repeat a few values in every row, so they are stored as categories.
+nodesColumnTypes = {
+	'id': 'Int64', 
+	'lat': 'float64', 
+	'lon': 'float64', 
+	'altMeters': 'float64', 
+	'nodeName': 'object', 
+	'nodeType': 'category', 
+	'popupText': 'category',
+	'leafletIconPrefix': 'category', 
+	'leafletIconType': 'category', 
+	'leafletColor': 'category', 
+	'leafletIconText': 'object', 
+	'cesiumIconType': 'category', 
+	'cesiumColor': 'category', 
+	'cesiumIconText': 'object',
+	'elevMeters': 'float64'
+}
+
+arcsColumnTypes = {
+	'odID': 'Int64',
+	'objectID': 'object', 
+	'startLat': 'float64', 
+	'startLon': 'float64',
+	'endLat': 'float64', 
+	'endLon': 'float64',
+	'leafletColor': 'category', 
+	'leafletWeight': 'float64', 
+	'leafletStyle': 'category', 
+	'leafletOpacity': 'float64', 
+	'leafletCurveType': 'category',
+	'leafletCurvature': 'float64',	
+	'useArrows': 'object', 
+	'cesiumColor': 'category', 
+	'cesiumWeight': 'float64', 
+	'cesiumStyle': 'category', 
+	'cesiumOpacity': 'float64',
+	'popupText': 'category',
+	'startElevMeters': 'float64',
+	'endElevMeters': 'float64'
+}
+
+assignmentsColumnTypes = {
+	'odID': 'Int64', 
+	'objectID': 'object', 
+	'modelFile': 'category', 
+	'modelScale': 'float64',
+	'modelMinPxSize': 'float64',
+	'startTimeSec': 'float64', 
+	'startLat': 'float64', 
+	'startLon': 'float64', 
+	'startAltMeters': 'float64',
+	'endTimeSec': 'float64', 
+	'endLat': 'float64', 
+	'endLon': 'float64', 
+	'endAltMeters': 'float64',
+	'leafletColor': 'category', 
+	'leafletWeight': 'float64', 
+	'leafletStyle': 'category', 
+	'leafletOpacity': 'float64',
+	'leafletCurveType': 'category',
+	'leafletCurvature': 'float64',
+	'useArrows': 'object', 
+	'cesiumColor': 'category', 
+	'cesiumWeight': 'float64', 
+	'cesiumStyle': 'category', 
+	'cesiumOpacity': 'float64', 
+	'ganttColor': 'category',
+	'popupText': 'category',
+	'startElevMeters': 'float64',
+	'endElevMeters': 'float64',
+	'wayname': 'category',
+	'waycategory': 'category',
+	'surface': 'category',
+	'waytype': 'category', 
+	'steepness': 'category',
+	'tollway': 'object'
+}
+
 timeUnitsDictionary = {
 	'seconds': 's',
 	'second': 's',
@@ -335,6 +447,9 @@ dataProviderDictionary = {
 	'osrm-online': 'osrm-online',
 	'osrm-ol': 'osrm-online',
 
+	'osrm-local': 'osrm-local',
+	'osrm-l': 'osrm-local',
+
 	'openrouteservice-online': 'ors-online',
 	'openrouteservice-ol': 'ors-online',
 	'ors-online': 'ors-online',
@@ -401,7 +516,14 @@ weatherDataProviderDictionary = {
 matrixTypeList = [
 	'all2all', 
 	'one2many', 
-	'many2one'
+	'many2one',
+	'knn'
+]
+
+matrixOutputFormatList = [
+	'dict',
+	'matrix',
+	'matrix32'
 ]
 
 nodeDistribList = [
@@ -0,0 +1,155 @@
+from veroviz._common import *
+import threading
+import contextlib
+import psycopg2.extensions
+import psycopg2.pool
+
+# Pooled connections that have been idle for longer than this are checked (with `select 1`) before they are reused
+VRV_PGROUTING_HEALTHCHECK_IDLE_SECONDS = 60
+
+# Connection pools, keyed by (database, host, user, password)
+_pools = {}
+_poolsLock = threading.Lock()
+
+class _PgrConnection(psycopg2.extensions.connection):
+	"""
+	A psycopg2 connection that remembers which statements have been prepared on it, and when it was last used.
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super(_PgrConnection, self).__init__(*args, **kwargs)
+		self.prepared = set()
+		self.lastUsed = time.monotonic()
+
+class _PgrPool(object):
+	"""
+	A thread-safe pool of read-only connections to one database.  Unlike `psycopg2.pool.ThreadedConnectionPool`, callers wait for a free connection (rather than getting an error) when all of them are in use.
+	"""
+
+	def __init__(self, dsn, maxConnections):
+		self._pool = psycopg2.pool.ThreadedConnectionPool(0, maxConnections, dsn, connection_factory=_PgrConnection)
+		self._available = threading.BoundedSemaphore(maxConnections)
+
+	def getconn(self):
+		self._available.acquire()
+		try:
+			conn = self._pool.getconn()
+			if (not _isHealthy(conn)):
+				self._pool.putconn(conn, close=True)
+				conn = self._pool.getconn()
+			if (conn.autocommit is False):
+				conn.set_session(readonly=True, autocommit=True)
+		except:
+			self._available.release()
+			raise
+
+		return conn
+
+	def putconn(self, conn, close=False):
+		try:
+			conn.lastUsed = time.monotonic()
+			self._pool.putconn(conn, close=(close or conn.closed != 0))
+		finally:
+			self._available.release()
+
+	def closeall(self):
+		self._pool.closeall()
+
+def _isHealthy(conn):
+	if (conn.closed != 0):
+		return False
+	if (time.monotonic() - conn.lastUsed < VRV_PGROUTING_HEALTHCHECK_IDLE_SECONDS):
+		return True
+	try:
+		cur = conn.cursor()
+		cur.execute("select 1;")
+		cur.close()
+		return True
+	except psycopg2.Error:
+		return False
+
+def _getPool(databaseName):
+	key = (databaseName, config['VRV_SETTING_PGROUTING_HOST'], config['VRV_SETTING_PGROUTING_USERNAME'], config['VRV_SETTING_PGROUTING_PASSWORD'])
+	with _poolsLock:
+		if (key not in _pools):
+			dsn = "dbname='%s' user='%s' host='%s' password='%s'" % (
+				databaseName,
+				config['VRV_SETTING_PGROUTING_USERNAME'],
+				config['VRV_SETTING_PGROUTING_HOST'],
+				config['VRV_SETTING_PGROUTING_PASSWORD'])
+			_pools[key] = _PgrPool(dsn, config['VRV_SETTING_PGROUTING_MAX_CONNECTIONS'])
+
+		return _pools[key]
+
+@contextlib.contextmanager
+def privPgrConnection(databaseName):
+	"""
+	Borrows a (read-only, autocommit) connection to a pgRouting database from the process-wide pool, for use in a `with` statement.  The connection is returned to the pool afterwards; if the connection failed, it is discarded instead.
+
+	Parameters
+	----------
+	databaseName: string
+		The name of the local pgRouting database.  The host, user, and password are taken from `config`.
+
+	Example
+	-------
+		>>> with privPgrConnection('myDatabase') as conn:
+		...     cur = conn.cursor()
+		...     cur.execute("select count(*) from ways;")
+	"""
+
+	pool = _getPool(databaseName)
+	conn = pool.getconn()
+	try:
+		yield conn
+	except (psycopg2.OperationalError, psycopg2.InterfaceError):
+		pool.putconn(conn, close=True)
+		raise
+	except:
+		pool.putconn(conn)
+		raise
+	else:
+		pool.putconn(conn)
+
+def privPgrExecute(cur, name, argTypes, sqlCommand, params):
+	"""
+	Executes `sqlCommand` as a server-side prepared statement called `name`.  The statement is prepared (with `PREPARE`) the first time it is used on each connection; after that, each call is a single `EXECUTE` round trip.
+
+	Parameters
+	----------
+	cur: psycopg2 cursor
+		A cursor on a connection from :meth:`privPgrConnection`
+	name: string
+		The name of the prepared statement
+	argTypes: list of strings
+		The PostgreSQL types of the parameters (e.g., ['float8', 'float8'])
+	sqlCommand: string
+		The statement, with parameters given as $1, $2, ...
+	params: tuple
+		The parameter values
+	"""
+
+	conn = cur.connection
+	if (name not in conn.prepared):
+		if (len(argTypes) > 0):
+			cur.execute("prepare %s (%s) as %s" % (name, ", ".join(argTypes), sqlCommand))
+		else:
+			cur.execute("prepare %s as %s" % (name, sqlCommand))
+		conn.prepared.add(name)
+
+	if (len(params) > 0):
+		cur.execute("execute %s (%s)" % (name, ", ".join(["%s"] * len(params))), params)
+	else:
+		cur.execute("execute %s" % (name))
+
+def privClosePgrConnections():
+	"""
+	Closes every pooled connection to pgRouting databases.  Connections are opened again as needed.
+	"""
+
+	with _poolsLock:
+		for pool in _pools.values():
+			pool.closeall()
+		_pools.clear()
+
+	return
@@ -1,4 +1,5 @@
 from veroviz._common import *
+from veroviz._httpClient import privHttpRequest
 
 def elevapiGetElevation(locs, APIkey):
 	"""
@@ -32,8 +33,7 @@ def elevapiGetElevation(locs, APIkey):
 
 	try:
 		
-		http = urllib3.PoolManager()
-		response = http.request('POST', elevUrl, headers=headers, body=encoded_body)
+		response = privHttpRequest('POST', elevUrl, headers=headers, body=encoded_body)
 
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
@@ -2,6 +2,7 @@ from veroviz._common import *
 from veroviz._internal import distributeTimeDist
 from veroviz._internal import locs2Dict
 from veroviz._internal import loc2Dict
+from veroviz._httpClient import privHttpRequest
 
 def mqGetSnapToRoadLatLon(loc, APIkey):
 	"""
@@ -25,8 +26,7 @@ def mqGetSnapToRoadLatLon(loc, APIkey):
 	snapToRoadUrl = ('http://www.mapquestapi.com/geocoding/v1/batch?key=%s&thumbMaps=false&outFormat=json&location=%s,%s') % (APIkey, dicLoc['lat'], dicLoc['lon'])
 	data = []
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', snapToRoadUrl)
+		response = privHttpRequest('GET', snapToRoadUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		snapLoc = [data['results'][0]['locations'][0]['latLng']['lat'], data['results'][0]['locations'][0]['latLng']['lng']]
@@ -65,8 +65,7 @@ def mqGetSnapToRoadLatLonBatch(locs, APIkey):
 				snapToRoadUrl += ('&location=%s,%s') % (dicLocs[i]['lat'], dicLocs[i]['lon'])
 			data = []
 		
-			http = urllib3.PoolManager()
-			response = http.request('GET', snapToRoadUrl)
+			response = privHttpRequest('GET', snapToRoadUrl)
 			data = json.loads(response.data.decode('utf-8'))
 			
 			snapLocs = [[data['results'][j]['locations'][0]['latLng']['lat'], data['results'][j]['locations'][0]['latLng']['lng']] for j in range(0, len(data['results']))]
@@ -119,8 +118,7 @@ def mqGetShapepointsTimeDist(startLoc, endLoc, routeType='fastest', APIkey=None)
 	data = []
 	
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', shapepointsUrl)
+		response = privHttpRequest('GET', shapepointsUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		path = []
@@ -184,8 +182,7 @@ def mqGetTimeDistAll2All(locs, routeType='fastest', APIkey=None):
 			all2AllUrl += ("],options:{all2All:true,routeType:%s,doReverseGeocode:false}}") % (routeType) 
 			data = []
 
-			http = urllib3.PoolManager()
-			response = http.request('GET', all2AllUrl)
+			response = privHttpRequest('GET', all2AllUrl)
 			data = json.loads(response.data.decode('utf-8'))
 
 			distBatch = data['distance']
@@ -253,8 +250,7 @@ def mqGetTimeDistOne2Many(fromLoc, toLocs, routeType='fastest', APIkey=None):
 			one2ManyUrl += ("],options:{oneToMany:true,routeType:%s,doReverseGeocode:false}}") % (routeType)
 			data = []
 			
-			http = urllib3.PoolManager()
-			response = http.request('GET', one2ManyUrl)
+			response = privHttpRequest('GET', one2ManyUrl)
 			data = json.loads(response.data.decode('utf-8'))
 
 			distBatch = data['distance']
@@ -315,8 +311,7 @@ def mqGetTimeDistMany2One(fromLocs, toLoc, routeType='fastest', APIkey=None):
 			many2OneUrl += ("],options:{manyToOne:true,routeType:%s,doReverseGeocode:false}}") % (routeType)
 			data = []
 
-			http = urllib3.PoolManager()
-			response = http.request('GET', many2OneUrl)
+			response = privHttpRequest('GET', many2OneUrl)
 			data = json.loads(response.data.decode('utf-8'))
 
 			distBatch = data['distance']
@@ -347,8 +342,7 @@ def mqGeocode(text, APIkey):
 	geocodeUrl = ('http://www.mapquestapi.com/geocoding/v1/address?key=%s&maxResults=1&thumbMaps=false&outFormat=json&location=%s') % (APIkey, text)
 	
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', geocodeUrl)
+		response = privHttpRequest('GET', geocodeUrl)
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
 		if (data['info']['statuscode'] == 0):
@@ -383,8 +377,7 @@ def mqReverseGeocode(loc, APIkey):
 	
 	geocodeUrl = ('http://www.mapquestapi.com/geocoding/v1/reverse?key=%s&thumbMaps=false&outFormat=json&includeNearestIntersection=true&includeRoadMetadata=true&location=%s,%s') % (APIkey, loc[0], loc[1])
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', geocodeUrl)
+		response = privHttpRequest('GET', geocodeUrl)
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
 		if (data['info']['statuscode'] == 0):
@@ -2,6 +2,12 @@ from veroviz._common import *
 from veroviz._internal import distributeTimeDist
 from veroviz._internal import loc2Dict
 from veroviz._internal import locs2Dict, bitFieldDecomp
+from veroviz._httpClient import privGetRateLimiter, privHttpRequest, privMapConcurrent
+import concurrent.futures
+
+# The ORS `snap` service: maximum locations per request, and search radius
+VRV_ORS_MAX_SNAP_LOCATIONS = 500
+VRV_ORS_SNAP_RADIUS_METERS = 350
 
 
 def orsGetSnapToRoadLatLon(loc, APIkey):
@@ -43,8 +49,8 @@ def orsGetSnapToRoadLatLon(loc, APIkey):
 			"instructions": "false",
 			"radiuses": radiuses})
 
-		http = urllib3.PoolManager()
-		response = http.request('POST', snapToRoadUrl, headers=headers, body=encoded_body)
+		rateLimiter = privGetRateLimiter('ors-online', config['VRV_SETTING_ORS_REQUESTS_PER_MINUTE'])
+		response = privHttpRequest('POST', snapToRoadUrl, headers=headers, body=encoded_body, rateLimiter=rateLimiter)
     
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
@@ -65,6 +71,63 @@ def orsGetSnapToRoadLatLon(loc, APIkey):
 		print("Error: ", sys.exc_info()[1])
 		raise 
 
+def orsGetSnapToRoadLatLonBatch(locs, APIkey, maxWorkers=1):
+	"""
+	A function to get snapped latlng for a list of coordinates using ORS.  The locations are sent to the ORS `snap` service, in blocks of up to 500 locations.  Any location that the `snap` service can't place on a road within 350 meters (or all of them, if the `snap` service is unavailable) is snapped individually, with :meth:`orsGetSnapToRoadLatLon`.
+
+	Parameters
+	----------
+	locs: list of lists
+		The locations to be snapped to road, in the format of [[lat, lon], [lat, lon], ...]
+	APIkey: string
+		ORS API key
+	maxWorkers: int, Optional, default as 1
+		The number of locations that may be snapped individually at once.  Requests are throttled to `config['VRV_SETTING_ORS_REQUESTS_PER_MINUTE']`.
+
+	Returns
+	-------
+	list of lists
+		The snapped locations, in the format of [[lat, lon], [lat, lon], ...].  Note that this function will lose the info of altitude of the locations.
+	"""
+
+	snapUrl = ('https://api.openrouteservice.org/v2/snap/driving-car/json')
+
+	headers = {
+				'Accept': 'application/json; charset=utf-8',
+				'Authorization': APIkey,
+				'Content-Type': 'application/json'}
+
+	rateLimiter = privGetRateLimiter('ors-online', config['VRV_SETTING_ORS_REQUESTS_PER_MINUTE'])
+
+	snapLocs = [None] * len(locs)
+	for start in range(0, len(locs), VRV_ORS_MAX_SNAP_LOCATIONS):
+		batchLocs = locs[start : start + VRV_ORS_MAX_SNAP_LOCATIONS]
+
+		# ORS uses [lon, lat] order:
+		encoded_body = json.dumps({
+			"locations": [[loc2Dict(loc)['lon'], loc2Dict(loc)['lat']] for loc in batchLocs],
+			"radius": VRV_ORS_SNAP_RADIUS_METERS})
+
+		try:
+			response = privHttpRequest('POST', snapUrl, headers=headers, body=encoded_body, rateLimiter=rateLimiter)
+			if (response.status != 200):
+				continue
+			data = json.loads(response.data.decode('utf-8'))
+		except (urllib3.exceptions.HTTPError, ValueError):
+			continue
+
+		for i in range(0, len(batchLocs)):
+			if (data['locations'][i] is not None):
+				snapLocs[start + i] = [data['locations'][i]['location'][1], data['locations'][i]['location'][0]]
+
+	# Fall back to snapping the remaining locations individually
+	missing = [i for i in range(0, len(locs)) if (snapLocs[i] is None)]
+	missingLocs = privMapConcurrent(lambda loc: orsGetSnapToRoadLatLon(loc, APIkey), [locs[i] for i in missing], maxWorkers)
+	for k in range(0, len(missing)):
+		snapLocs[missing[k]] = missingLocs[k]
+
+	return snapLocs
+
 
 def orsGetShapepointsTimeDist(startLoc, endLoc, travelMode='fastest', APIkey=None, requestExtras=True):
 	"""
@@ -161,8 +224,8 @@ def orsGetShapepointsTimeDist(startLoc, endLoc, travelMode='fastest', APIkey=Non
 			"radiuses": radiuses,
 			"units": units})
 
-		http = urllib3.PoolManager()
-		response = http.request('POST', shapepointsUrl, headers=headers, body=encoded_body)
+		rateLimiter = privGetRateLimiter('ors-online', config['VRV_SETTING_ORS_REQUESTS_PER_MINUTE'])
+		response = privHttpRequest('POST', shapepointsUrl, headers=headers, body=encoded_body, rateLimiter=rateLimiter)
 
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
@@ -260,7 +323,7 @@ def orsGetShapepointsTimeDist(startLoc, endLoc, travelMode='fastest', APIkey=Non
 		print("Error: ", sys.exc_info()[1])
 		raise
 
-def orsGetTimeDistAll2All(locs, travelMode='fastest', APIkey=None):
+def orsGetTimeDistAll2All(locs, travelMode='fastest', APIkey=None, maxWorkers=1):
 	"""
 	A function to generate distance and time matrices between given coordinates.
 	Parameters
@@ -271,6 +334,8 @@ def orsGetTimeDistAll2All(locs, travelMode='fastest', APIkey=None):
 		ORS provides multiple types of routing.  VeRoViz implements the following: 'fastest' (for car), 'pedestrian', 'cycling', and 'truck'.
 	APIkey: string, Required
 		Enables access to ORS server.
+	maxWorkers: int, Optional, default as 1
+		The matrix is requested in blocks of 50 x 50 locations.  If `maxWorkers` is greater than 1, up to `maxWorkers` blocks are requested concurrently.  In either case, requests are throttled to `config['VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE']` and are retried (with backoff) if ORS responds with a 429 or 5xx status.
 	
 	Returns
 	-------
@@ -326,69 +391,92 @@ def orsGetTimeDistAll2All(locs, travelMode='fastest', APIkey=None):
 				'Authorization': APIkey,
 				'Content-Type': 'application/json'}
 
+	rateLimiter = privGetRateLimiter('ors-online-matrix', config['VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE'])
+
 	distMeters = {}
 	timeSecs = {}
 
+	# Build the request for each block
+	tiles = []
+	for rowBatch in range(0, numBatches):
+		sourceLocs = []
+		sources = []
+
+		# ORS uses [lon, lat] order:
+		for i in range(maxBatchSize * rowBatch, min(len(locs), maxBatchSize * (rowBatch + 1))):
+			sources.append(len(sourceLocs))
+			sourceLocs.append([locs[i][1],locs[i][0]])
+
+		for colBatch in range(0, numBatches):
+			destinations = []
+			locations = list(sourceLocs)
+			if (colBatch == rowBatch):
+				# We're on the diagonal. Sources and Destinations are the same (all-to-all).
+				encoded_body = json.dumps({
+					"locations": sourceLocs,
+					"metrics": ["distance","duration"],
+					"units": "m"})
+			else:
+				# We're off-diagonal.  Sources and Destinations differ.
+				for i in range(maxBatchSize * colBatch, min(len(locs), maxBatchSize * (colBatch + 1))):
+					destinations.append(len(locations))
+					locations.append([locs[i][1],locs[i][0]])
+
+				encoded_body = json.dumps({
+					"locations": locations,
+					"sources": sources,
+					"destinations": destinations,
+					"metrics": ["distance","duration"],
+					"units": "m"})
+
+			if (len(locations) <= 1):
+				# We have a 1x1 matrix.  Nothing to do. 
+				row = maxBatchSize * rowBatch
+				col = maxBatchSize * colBatch
+				distMeters[row, col] = 0.0
+				timeSecs[row, col] = 0.0
+			else:
+				tiles.append([maxBatchSize * rowBatch, maxBatchSize * colBatch, encoded_body])
+
+	def _requestTile(tile):
+		response = privHttpRequest('POST', all2AllUrl, headers=headers, body=tile[2], rateLimiter=rateLimiter)
+		return [tile, response]
+
 	try:
-		for rowBatch in range(0, numBatches):
-			sourceLocs = []
-			sources = []
+		if (maxWorkers is None or maxWorkers <= 1 or len(tiles) <= 1):
+			results = map(_requestTile, tiles)
+			executor = None
+		else:
+			executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(int(maxWorkers), len(tiles)))
+			futures = [executor.submit(_requestTile, tile) for tile in tiles]
+			results = (future.result() for future in concurrent.futures.as_completed(futures))
 
-			# ORS uses [lon, lat] order:
-			for i in range(maxBatchSize * rowBatch, min(len(locs), maxBatchSize * (rowBatch + 1))):
-				sources.append(len(sourceLocs))
-				sourceLocs.append([locs[i][1],locs[i][0]])
-
-			for colBatch in range(0, numBatches):
-				destinations = []
-				locations = list(sourceLocs)
-				if (colBatch == rowBatch):
-					# We're on the diagonal. Sources and Destinations are the same (all-to-all).
-					encoded_body = json.dumps({
-						"locations": sourceLocs,
-						"metrics": ["distance","duration"],
-						"units": "m"})
-				else:
-					# We're off-diagonal.  Sources and Destinations differ.
-					for i in range(maxBatchSize * colBatch, min(len(locs), maxBatchSize * (colBatch + 1))):
-						destinations.append(len(locations))
-						locations.append([locs[i][1],locs[i][0]])
-
-					encoded_body = json.dumps({
-						"locations": locations,
-						"sources": sources,
-						"destinations": destinations,
-						"metrics": ["distance","duration"],
-						"units": "m"})
-
-				if (len(locations) <= 1):
-					# We have a 1x1 matrix.  Nothing to do. 
-					row = maxBatchSize * rowBatch
-					col = maxBatchSize * colBatch
-					distMeters[row, col] = 0.0
-					timeSecs[row, col] = 0.0
-				else:
-					http = urllib3.PoolManager()
-					response = http.request('POST', all2AllUrl, headers=headers, body=encoded_body)
+		try:
+			for [tile, response] in results:
+				http_status = response.status
 
+				if (http_status == 200):
+					# OK
 					data = json.loads(response.data.decode('utf-8'))
-					http_status = response.status
-
-					if (http_status == 200):
-						# OK
-						row = maxBatchSize * rowBatch
-						for i in range(0, len(data['durations'])):
-							col = maxBatchSize * colBatch
-							for j in range(0, len(data['durations'][i])):
-								distMeters[row, col] = data['distances'][i][j]
-								timeSecs[row, col] = data['durations'][i][j]
-								col += 1
-							row += 1    
-					else:
-						# Error of some kind
-						http_status_description = responses[http_status]
-						print("Error Code %s: %s" % (http_status, http_status_description))
-						return
+					row = tile[0]
+					for i in range(0, len(data['durations'])):
+						col = tile[1]
+						for j in range(0, len(data['durations'][i])):
+							distMeters[row, col] = data['distances'][i][j]
+							timeSecs[row, col] = data['durations'][i][j]
+							col += 1
+						row += 1    
+				else:
+					# Error of some kind
+					http_status_description = responses[http_status]
+					print("Error Code %s: %s" % (http_status, http_status_description))
+					return
+		finally:
+			if (executor is not None):
+				# Don't issue any blocks that haven't started yet
+				for future in futures:
+					future.cancel()
+				executor.shutdown(wait=True)
 
 		return [timeSecs, distMeters]
 
@@ -488,8 +576,8 @@ def orsGetTimeDistOne2Many(fromLoc, toLocs, travelMode='fastest', APIkey=None):
 				"metrics": ["distance","duration"],
 				"units": "m"})
 
-			http = urllib3.PoolManager()
-			response = http.request('POST', one2ManyUrlBase, headers=headers, body=encoded_body)
+			rateLimiter = privGetRateLimiter('ors-online-matrix', config['VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE'])
+			response = privHttpRequest('POST', one2ManyUrlBase, headers=headers, body=encoded_body, rateLimiter=rateLimiter)
 
 			data = json.loads(response.data.decode('utf-8'))
 			http_status = response.status
@@ -609,8 +697,8 @@ def orsGetTimeDistMany2One(fromLocs, toLoc, travelMode='fastest', APIkey=None):
 				"metrics": ["distance","duration"],
 				"units": "m"})
 
-			http = urllib3.PoolManager()
-			response = http.request('POST', many2OneUrlBase, headers=headers, body=encoded_body)
+			rateLimiter = privGetRateLimiter('ors-online-matrix', config['VRV_SETTING_ORS_MATRIX_REQUESTS_PER_MINUTE'])
+			response = privHttpRequest('POST', many2OneUrlBase, headers=headers, body=encoded_body, rateLimiter=rateLimiter)
 
 			data = json.loads(response.data.decode('utf-8'))
 			http_status = response.status
@@ -659,8 +747,7 @@ def orsGeocode(text, APIkey):
 	geocodeUrl = ('https://api.openrouteservice.org/geocode/search?api_key=%s&text=%s&size=1' % (APIkey, text))
     
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', geocodeUrl)
+		response = privHttpRequest('GET', geocodeUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		http_status = response.status
@@ -702,8 +789,7 @@ def orsReverseGeocode(loc, APIkey):
 	# ORS uses [lon, lat] order:
 	geocodeUrl = ('https://api.openrouteservice.org/geocode/reverse?api_key=%s&point.lon=%s&point.lat=%s&size=1' % (APIkey, loc[1], loc[0]))
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', geocodeUrl)
+		response = privHttpRequest('GET', geocodeUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		http_status = response.status
@@ -795,8 +881,7 @@ def orsIsochrones(loc, locType, travelMode, rangeType, rangeSize, interval, smoo
 			"area_units": areaUnits,
 			"units": units})
 
-		http = urllib3.PoolManager()
-		response = http.request('POST', isoUrl, headers=headers, body=encoded_body)
+		response = privHttpRequest('POST', isoUrl, headers=headers, body=encoded_body)
 
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
@@ -906,8 +991,7 @@ def orsGetElevation(locs, APIkey):
 
 	try:
 		
-		http = urllib3.PoolManager()
-		response = http.request('POST', elevUrl, headers=headers, body=encoded_body)
+		response = privHttpRequest('POST', elevUrl, headers=headers, body=encoded_body)
 
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
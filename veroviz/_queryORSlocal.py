@@ -2,6 +2,7 @@ from veroviz._common import *
 from veroviz._internal import distributeTimeDist
 from veroviz._internal import loc2Dict
 from veroviz._internal import locs2Dict, bitFieldDecomp
+from veroviz._httpClient import privHttpRequest
 
 
 def orsLocalGetSnapToRoadLatLon(loc, port):
@@ -25,8 +26,7 @@ def orsLocalGetSnapToRoadLatLon(loc, port):
 	snapToRoadUrl = ('http://localhost:%s/ors/directions?profile=driving-car&geometry_format=geojson&coordinates=%s,%s|%s,%s&elevation=false' % (port, dicLoc['lon'], dicLoc['lat'], dicLoc['lon'], dicLoc['lat']))
  
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', snapToRoadUrl)
+		response = privHttpRequest('GET', snapToRoadUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		http_status = response.status
@@ -128,8 +128,7 @@ def orsLocalGetShapepointsTimeDist(startLoc, endLoc, travelMode='fastest', port=
 		
 	try:
 
-		http = urllib3.PoolManager()
-		response = http.request('GET', spUrl)
+		response = privHttpRequest('GET', spUrl)
 
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
@@ -342,8 +341,7 @@ def orsLocalGetTimeDistAll2All(locs, travelMode='fastest', port=8081):
 					distMeters[row, col] = 0.0
 					timeSecs[row, col] = 0.0
 				else:
-					http = urllib3.PoolManager()
-					response = http.request('GET', all2AllUrl)
+					response = privHttpRequest('GET', all2AllUrl)
 
 					data = json.loads(response.data.decode('utf-8'))
 					http_status = response.status
@@ -457,8 +455,7 @@ def orsLocalGetTimeDistOne2Many(fromLoc, toLocs, travelMode='fastest', port=8081
 			one2ManyUrl += '&sources=%s' % ('|'.join(sources))
 			one2ManyUrl += '&destinations=%s' % ('|'.join(destinations))
 									
-			http = urllib3.PoolManager()
-			response = http.request('GET', one2ManyUrl)
+			response = privHttpRequest('GET', one2ManyUrl)
 
 			data = json.loads(response.data.decode('utf-8'))
 			http_status = response.status
@@ -573,8 +570,7 @@ def orsLocalGetTimeDistMany2One(fromLocs, toLoc, travelMode='fastest', port=8081
 			many2OneUrl += '&sources=%s' % ('|'.join(sources))
 			many2OneUrl += '&destinations=%s' % ('|'.join(destinations))
 
-			http = urllib3.PoolManager()
-			response = http.request('GET', many2OneUrl)
+			response = privHttpRequest('GET', many2OneUrl)
 
 			data = json.loads(response.data.decode('utf-8'))
 			http_status = response.status
@@ -665,8 +661,7 @@ def orsLocalIsochrones(loc, locType, travelMode, rangeType, rangeSize, interval,
 	
 	try:
 	
-		http = urllib3.PoolManager()
-		response = http.request('GET', isoUrl)
+		response = privHttpRequest('GET', isoUrl)
 		data = json.loads(response.data.decode('utf-8'))
 		http_status = response.status
 
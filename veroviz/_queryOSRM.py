@@ -2,8 +2,35 @@ from veroviz._common import *
 from veroviz._internal import distributeTimeDist
 from veroviz._internal import loc2Dict
 from veroviz._internal import locs2Dict
+from veroviz._httpClient import privHttpRequest
 
-def osrmGetSnapToRoadLatLon(loc):
+# The OSRM demo server (and `osrm-routed` by default) rejects /table requests with more than 100 coordinates
+VRV_OSRM_MAX_TABLE_SIZE = 100
+
+def _osrmBaseUrl(host=None, port=None):
+	"""
+	Returns the base url of an OSRM server.  If `port` is None, the online OSRM demo server is used; otherwise, a self-hosted ('OSRM-local') server at `host`:`port` is used.
+	"""
+
+	if (port is None):
+		return 'http://router.project-osrm.org'
+	if (host is None):
+		host = 'localhost'
+
+	return 'http://%s:%s' % (host, port)
+
+def _osrmRequestError(http_status, data):
+	"""
+	Returns an exception describing a failed OSRM request, including the message returned by the server (if any).
+	"""
+
+	errorMessage = "OSRM Error Code %s: %s" % (http_status, responses.get(http_status, 'Unknown'))
+	if ('message' in data):
+		errorMessage += ".  Message: %s" % (data['message'])
+
+	return RuntimeError(errorMessage)
+
+def osrmGetSnapToRoadLatLon(loc, host=None, port=None):
 	"""
 	A function to get snapped latlng for one coordinate using OSRM
 
@@ -11,6 +38,10 @@ def osrmGetSnapToRoadLatLon(loc):
 	----------
 	loc: list
 		The location to be snapped to road
+	host: string, Optional, default as None
+		Host name of a self-hosted OSRM server.  Defaults to 'localhost' if `port` is provided.
+	port: string, Optional, default as None
+		Port of a self-hosted OSRM server.  If None, the online OSRM demo server is used.
 
 	Returns
 	-------
@@ -19,12 +50,11 @@ def osrmGetSnapToRoadLatLon(loc):
 	"""
 
 	dicLoc = loc2Dict(loc)
-	snapToRoadUrl = ('http://router.project-osrm.org/nearest/v1/driving/%s,%s') % (dicLoc['lon'], dicLoc['lat']) # OSRM use lon/lat
+	snapToRoadUrl = ('%s/nearest/v1/driving/%s,%s') % (_osrmBaseUrl(host, port), dicLoc['lon'], dicLoc['lat']) # OSRM use lon/lat
 	data = []
 
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', snapToRoadUrl)
+		response = privHttpRequest('GET', snapToRoadUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		snapLoc = [data['waypoints'][0]['location'][1], data['waypoints'][0]['location'][0]] # OSRM use lon/lat
@@ -33,7 +63,58 @@ def osrmGetSnapToRoadLatLon(loc):
 
 	return snapLoc
 
-def osrmGetShapepointsTimeDist(startLoc, endLoc):
+def osrmGetSnapToRoadLatLonBatch(locs, host=None, port=None, maxTableSize=VRV_OSRM_MAX_TABLE_SIZE):
+	"""
+	A function to get snapped latlng for a list of coordinates using OSRM.  The `nearest` service accepts only one coordinate per request, so the locations are instead sent (in blocks of up to `maxTableSize`) as the sources of a one-column `table` request; OSRM snaps every source to the road network in the same way as `nearest`, and returns the snapped locations.  A RuntimeError, carrying the server's message, is raised if OSRM rejects a request.
+
+	Parameters
+	----------
+	locs: list of lists
+		The locations to be snapped to road, in the format of [[lat, lon], [lat, lon], ...]
+	host: string, Optional, default as None
+		Host name of a self-hosted OSRM server.  Defaults to 'localhost' if `port` is provided.
+	port: string, Optional, default as None
+		Port of a self-hosted OSRM server.  If None, the online OSRM demo server is used.
+	maxTableSize: int, Optional, default as 100
+		The maximum number of coordinates the server accepts in one `table` request.  This is set by the `--max-table-size` option of `osrm-routed`.
+
+	Returns
+	-------
+	list of lists
+		The snapped locations, in the format of [[lat, lon], [lat, lon], ...].  Notice that this function will lose the info of altitude of the locations.
+	"""
+
+	snapLocs = []
+
+	try:
+		for start in range(0, len(locs), maxTableSize):
+			batchLocs = locs[start : start + maxTableSize]
+
+			# OSRM uses lon/lat.  Every location is a source; the first is also the (only) destination.
+			coordinates = ';'.join(['%s,%s' % (loc[1], loc[0]) for loc in batchLocs])
+			sources = ';'.join([str(i) for i in range(0, len(batchLocs))])
+			tableUrl = ('%s/table/v1/driving/%s?sources=%s&destinations=0&annotations=duration') % (_osrmBaseUrl(host, port), coordinates, sources)
+
+			response = privHttpRequest('GET', tableUrl)
+			data = json.loads(response.data.decode('utf-8'))
+			http_status = response.status
+
+			if (http_status == 200 and data['code'] == 'Ok'):
+				for i in range(0, len(batchLocs)):
+					snapLocs.append([data['sources'][i]['location'][1], data['sources'][i]['location'][0]]) # OSRM use lon/lat
+			else:
+				# Error of some kind
+				raise _osrmRequestError(http_status, data)
+
+	except RuntimeError:
+		raise
+	except:
+		print ("Message: OSRM is currently not available, please try again later.")
+		raise
+
+	return snapLocs
+
+def osrmGetShapepointsTimeDist(startLoc, endLoc, host=None, port=None):
 	"""
 	A function to get a list of shapepoints from start coordinate to end coordinate, the result of this function is not as detailed as mpqGetShapepointTimeDist, however, it is faster.
 
@@ -43,6 +124,10 @@ def osrmGetShapepointsTimeDist(startLoc, endLoc):
 		Start location, the format is [lat, lon] (altitude, above sea level, set to be 0) or [lat, lon, alt]
 	endLoc: list
 		End location, the format is [lat, lon] (altitude, above sea level, set to be 0) or [lat, lon, alt]
+	host: string, Optional, default as None
+		Host name of a self-hosted OSRM server.  Defaults to 'localhost' if `port` is provided.
+	port: string, Optional, default as None
+		Port of a self-hosted OSRM server.  If None, the online OSRM demo server is used.
 
 	Returns
 	-------
@@ -56,12 +141,11 @@ def osrmGetShapepointsTimeDist(startLoc, endLoc):
 
 	dicStartLoc = loc2Dict(startLoc)
 	dicEndLoc = loc2Dict(endLoc)
-	shapepointsUrl = ('http://router.project-osrm.org/route/v1/driving/%s,%s;%s,%s?steps=true') % (dicStartLoc['lon'], dicStartLoc['lat'], dicEndLoc['lon'], dicEndLoc['lat']) # OSRM use lon/lat
+	shapepointsUrl = ('%s/route/v1/driving/%s,%s;%s,%s?steps=true') % (_osrmBaseUrl(host, port), dicStartLoc['lon'], dicStartLoc['lat'], dicEndLoc['lon'], dicEndLoc['lat']) # OSRM use lon/lat
 	data = []
 
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', shapepointsUrl)
+		response = privHttpRequest('GET', shapepointsUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		path = []
@@ -77,7 +161,7 @@ def osrmGetShapepointsTimeDist(startLoc, endLoc):
 
 	return [path, timeInSeconds, distInMeters]
 
-def osrmGetTimeDistOnePair(startLoc, endLoc):
+def osrmGetTimeDistOnePair(startLoc, endLoc, host=None, port=None):
 	"""
 	A function to get a total time and total distance between two given coordinates
 
@@ -87,6 +171,10 @@ def osrmGetTimeDistOnePair(startLoc, endLoc):
 		Start location, the format is [lat, lon] (altitude, above sea level, set to be 0) or [lat, lon, alt]
 	endLoc: list
 		End location, the format is [lat, lon] (altitude, above sea level, set to be 0) or [lat, lon, alt]
+	host: string, Optional, default as None
+		Host name of a self-hosted OSRM server.  Defaults to 'localhost' if `port` is provided.
+	port: string, Optional, default as None
+		Port of a self-hosted OSRM server.  If None, the online OSRM demo server is used.
 
 	Returns
 	-------
@@ -98,12 +186,11 @@ def osrmGetTimeDistOnePair(startLoc, endLoc):
 
 	dicStartLoc = loc2Dict(startLoc)
 	dicEndLoc = loc2Dict(endLoc)
-	timeDistUrl = ('http://router.project-osrm.org/route/v1/driving/%s,%s;%s,%s') % (dicStartLoc['lon'], dicStartLoc['lat'], dicEndLoc['lon'], dicEndLoc['lat']) # OSRM use lon/lat
+	timeDistUrl = ('%s/route/v1/driving/%s,%s;%s,%s') % (_osrmBaseUrl(host, port), dicStartLoc['lon'], dicStartLoc['lat'], dicEndLoc['lon'], dicEndLoc['lat']) # OSRM use lon/lat
 	data = []
 
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', timeDistUrl)
+		response = privHttpRequest('GET', timeDistUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		timeSeconds = data['routes'][0]['duration']
@@ -113,9 +200,9 @@ def osrmGetTimeDistOnePair(startLoc, endLoc):
 
 	return [timeSeconds, distMeters]
 
-def osrmGetTimeDist(fromLocs, toLocs):
+def osrmGetTimeDist(fromLocs, toLocs, host=None, port=None, maxTableSize=VRV_OSRM_MAX_TABLE_SIZE):
 	"""
-	A function to get distance and time matrices between a list of starting coordinates and a list of ending coordinates
+	A function to get distance and time matrices between a list of starting coordinates and a list of ending coordinates, using OSRM's `table` service.  Inputs that exceed the server's table size limit are split into blocks of sources and destinations, with one request per block.  A RuntimeError, carrying the server's message, is raised if OSRM rejects a request.
 
 	Parameters
 	----------
@@ -123,20 +210,87 @@ def osrmGetTimeDist(fromLocs, toLocs):
 		A list of starting coordinates, the format is [[lat1, lon1], [lat2, lon2], ...]
 	toLocs: list of lists
 		A list of ending coordinates, the format is [[lat1, lon1], [lat2, lon2], ...]
+	host: string, Optional, default as None
+		Host name of a self-hosted OSRM server.  Defaults to 'localhost' if `port` is provided.
+	port: string, Optional, default as None
+		Port of a self-hosted OSRM server.  If None, the online OSRM demo server is used.
+	maxTableSize: int, Optional, default as 100
+		The maximum number of coordinates (sources plus destinations) the server accepts in one `table` request.  This is set by the `--max-table-size` option of `osrm-routed`.
 
 	Returns
 	-------
-	timeInSeconds: double
-		time between current shapepoint and previous shapepoint, the first element should be 0
-	distInMeters: double
-		distance between current shapepoint and previous shapepoint, the first element should be 0
+	timeSeconds: dictionary
+		A matrix, which provides the travel time from each starting coordinate to each ending coordinate.  Units are in seconds.  Unreachable pairs are given a value of infinity.
+	distMeters: dictionary
+		A matrix, which provides the distance from each starting coordinate to each ending coordinate.  Units are in meters.  Unreachable pairs are given a value of infinity.
 	"""
+
 	timeSeconds = {}
 	distMeters = {}
-	for i in range(len(fromLocs)):
-		for j in range(len(toLocs)):
-			[time, dist] = osrmGetTimeDistOnePair(fromLocs[i], toLocs[j])
-			timeSeconds[i, j] = time
-			distMeters[i, j] = dist
 
-	return [timeSeconds, distMeters]
\ No newline at end of file
+	# Nothing to query (OSRM rejects a `table` request with no sources or no destinations)
+	if (len(fromLocs) == 0 or len(toLocs) == 0):
+		return [timeSeconds, distMeters]
+
+	# Choose block sizes so that (sources + destinations) fit within one request.
+	# If one side is small (e.g., one2many), give the remaining capacity to the other side.
+	halfSize = max(1, int(maxTableSize / 2))
+	if (len(fromLocs) <= halfSize):
+		rowBatchSize = len(fromLocs)
+		colBatchSize = max(1, maxTableSize - rowBatchSize)
+	elif (len(toLocs) <= halfSize):
+		colBatchSize = len(toLocs)
+		rowBatchSize = max(1, maxTableSize - colBatchSize)
+	else:
+		rowBatchSize = halfSize
+		colBatchSize = halfSize
+
+	numRowBatches = int(math.ceil(len(fromLocs) / float(rowBatchSize)))
+	numColBatches = int(math.ceil(len(toLocs) / float(colBatchSize)))
+
+	numUnreachable = 0
+
+	try:
+		for rowBatch in range(0, numRowBatches):
+			rowStart = rowBatchSize * rowBatch
+			sourceLocs = fromLocs[rowStart : rowStart + rowBatchSize]
+
+			for colBatch in range(0, numColBatches):
+				colStart = colBatchSize * colBatch
+				destinationLocs = toLocs[colStart : colStart + colBatchSize]
+
+				# OSRM uses lon/lat
+				coordinates = ';'.join(['%s,%s' % (loc[1], loc[0]) for loc in (sourceLocs + destinationLocs)])
+				sources = ';'.join([str(i) for i in range(0, len(sourceLocs))])
+				destinations = ';'.join([str(len(sourceLocs) + j) for j in range(0, len(destinationLocs))])
+				tableUrl = ('%s/table/v1/driving/%s?sources=%s&destinations=%s&annotations=duration,distance') % (_osrmBaseUrl(host, port), coordinates, sources, destinations)
+
+				response = privHttpRequest('GET', tableUrl)
+				data = json.loads(response.data.decode('utf-8'))
+				http_status = response.status
+
+				if (http_status == 200 and data['code'] == 'Ok'):
+					for i in range(0, len(sourceLocs)):
+						for j in range(0, len(destinationLocs)):
+							duration = data['durations'][i][j]
+							distance = data['distances'][i][j]
+							if (duration is None or distance is None):
+								numUnreachable += 1
+								duration = float('inf')
+								distance = float('inf')
+							timeSeconds[rowStart + i, colStart + j] = duration
+							distMeters[rowStart + i, colStart + j] = distance
+				else:
+					# Error of some kind
+					raise _osrmRequestError(http_status, data)
+
+	except RuntimeError:
+		raise
+	except:
+		print ("Message: OSRM is currently not available, please try again later.")
+		raise
+
+	if (numUnreachable > 0):
+		print("Message: OSRM could not find a route for %s pair(s) of locations.  Their travel time and distance are set to infinity." % (numUnreachable))
+
+	return [timeSeconds, distMeters]
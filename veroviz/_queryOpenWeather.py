@@ -1,4 +1,5 @@
 from veroviz._common import *
+from veroviz._httpClient import privHttpRequest
 
 def owGetWeather(location, id, metricUnits, APIkey):		
 	if (metricUnits):
@@ -9,8 +10,7 @@ def owGetWeather(location, id, metricUnits, APIkey):
 	weatherUrl = ('https://api.openweathermap.org/data/2.5/onecall?lat=%s&lon=%s&appid=%s&units=%s' % (location[0], location[1], APIkey, units))
 	
 	try:
-		http = urllib3.PoolManager()
-		response = http.request('GET', weatherUrl)
+		response = privHttpRequest('GET', weatherUrl)
 		data = json.loads(response.data.decode('utf-8'))
 
 		http_status = response.status
@@ -2,6 +2,29 @@ from veroviz._common import *
 from veroviz._internal import locs2Dict
 from veroviz._internal import loc2Dict
 from veroviz._geometry import geoDistance2D
+from veroviz._pgrConnection import privPgrConnection
+from veroviz._pgrConnection import privPgrExecute
+
+# Number of nearest streets (by bounding box distance, using the spatial index) that are compared
+# (by distance in meters) when snapping a location
+VRV_PGROUTING_SNAP_CANDIDATES = 10
+
+# Edges for pgr_withPoints (and other pgRouting functions)
+_pgrEdgesSQL = "select gid as id, source, target, cost_s as cost, reverse_cost_s as reverse_cost from ways"
+
+# The distance of each row returned by _pgrTraversalSQL() (as `a`, joined to `ways` as `b`).  Rows on 
+# partial edges (from/to a virtual point) are pro-rated by the cost of the edge in the direction it is 
+# traversed: from its source if the row starts at its source or ends at its target, and from its target 
+# if the row starts at its target or ends at its source.  A route between two virtual points on the same 
+# edge runs from its source if the start point's fraction is the smaller.
+_pgrEdgeDirectionCostSQL  = "case"
+_pgrEdgeDirectionCostSQL += " when a.node = b.source then b.cost_s"
+_pgrEdgeDirectionCostSQL += " when a.node = b.target then b.reverse_cost_s"
+_pgrEdgeDirectionCostSQL += " when a.next_node = b.target then b.cost_s"
+_pgrEdgeDirectionCostSQL += " when a.next_node = b.source then b.reverse_cost_s"
+_pgrEdgeDirectionCostSQL += " when a.fraction <= a.next_fraction then b.cost_s"
+_pgrEdgeDirectionCostSQL += " else b.reverse_cost_s end"
+_pgrEdgeDistSQL = "coalesce(b.length_m * least(1.0, a.cost / nullif(%s, 0)), 0)" % (_pgrEdgeDirectionCostSQL)
 
 def pgrGetSnapToRoadLatLon(gid, loc, databaseName):
 	"""
@@ -22,13 +45,6 @@ def pgrGetSnapToRoadLatLon(gid, loc, databaseName):
 		A snapped locations in the format of [lat, lon], notice that this function will lost the info of altitude of the location.
 	"""
 
-	conn = psycopg2.connect("dbname='%s' user='%s' host='%s' password='%s'" % (
-		databaseName, 
-		config['VRV_SETTING_PGROUTING_USERNAME'], 
-		config['VRV_SETTING_PGROUTING_HOST'], 
-		config['VRV_SETTING_PGROUTING_PASSWORD']))
-	cur = conn.cursor()
-
 	# For maintainability
 	dicLoc = loc2Dict(loc)
 
@@ -36,15 +52,16 @@ def pgrGetSnapToRoadLatLon(gid, loc, databaseName):
 	sqlCommand += " from ("
 	sqlCommand += " 	select ST_ClosestPoint("
 	sqlCommand += " 		ST_GeomFromEWKT(CONCAT('SRID=4326; LINESTRING(',x1,' ',y1,', ',x2,' ',y2,')')),"
-	sqlCommand += " 		ST_GeomFromEWKT('SRID=4326;POINT(%s %s)')) as point" % (dicLoc['lon'], dicLoc['lat']) # Be very careful about lon and lat
+	sqlCommand += " 		ST_SetSRID(ST_MakePoint($2, $3), 4326)) as point" # Be very careful about lon and lat
 	sqlCommand += " 	from ways"
-	sqlCommand += " 	where gid=%s" % (gid)
-	sqlCommand += " ) a;"
-	cur.execute(sqlCommand)
-	row = cur.fetchone()
-	snapLoc = [row[1], row[0]]
+	sqlCommand += " 	where gid = $1"
+	sqlCommand += " ) a"
 
-	conn.close()
+	with privPgrConnection(databaseName) as conn:
+		cur = conn.cursor()
+		privPgrExecute(cur, 'vrv_snap_to_road', ['bigint', 'float8', 'float8'], sqlCommand, (int(gid), float(dicLoc['lon']), float(dicLoc['lat'])))
+		row = cur.fetchone()
+	snapLoc = [row[1], row[0]]
 
 	return snapLoc
 
@@ -82,78 +99,48 @@ def pgrGetNearestStreet(loc, databaseName):
 	one_way: int
 		one_way from Ways table, indicate if it is one way street
 	"""
-	conn = psycopg2.connect("dbname='%s' user='%s' host='%s' password='%s'" % (
-		databaseName, 
-		config['VRV_SETTING_PGROUTING_USERNAME'], 
-		config['VRV_SETTING_PGROUTING_HOST'], 
-		config['VRV_SETTING_PGROUTING_PASSWORD']))
-	cur = conn.cursor()
-
 	# For maintainability
 	dicLoc = loc2Dict(loc)
 
-	try:
-		sqlCommand  = " select gid, source, target, y1, x1, y2, x2, cost_s, reverse_cost_s, one_way"
-		sqlCommand += " from "
-		sqlCommand += " 	ways"
-		sqlCommand += "	where"
-		sqlCommand += "		x1 >= %s - 0.01 and x1 <= %s + 0.01" % (dicLoc['lon'], dicLoc['lon']) # Eliminate most of the ways there
-		sqlCommand += " order by"
-		sqlCommand += " 	ST_Distance("
-		sqlCommand += "			ST_GeogFromText('SRID=4326; POINT(%s %s)')," % (dicLoc['lon'], dicLoc['lat'])  # Be very careful about lon and lat
-		sqlCommand += "			ST_GeogFromText(CONCAT('SRID=4326; LINESTRING(',x1,' ',y1,', ',x2,' ',y2,')')))"
-		sqlCommand += "	limit 1;"
-		cur.execute(sqlCommand)
-		row = cur.fetchone()
-		street = {
-			"gid" : int(row[0]),
-			"source" : int(row[1]),
-			"target" : int(row[2]),
-			"sourceLoc" : [row[3], row[4]],
-			"targetLoc" : [row[5], row[6]],
-			"cost_s" : row[7],
-			"reverse_cost_s" : row[8],
-			"one_way" : row[9]
-		}
-
-	except:
-		sqlCommand  = " select gid, source, target, y1, x1, y2, x2, length_m, cost_s, reverse_cost_s, one_way"
-		sqlCommand += " from "
-		sqlCommand += " 	ways"
-		sqlCommand += " order by"
-		sqlCommand += " 	ST_Distance("
-		sqlCommand += "			ST_GeogFromText('SRID=4326; POINT(%s %s)')," % (dicLoc['lon'], dicLoc['lat'])  # Be very careful about lon and lat
-		sqlCommand += "			ST_GeogFromText(CONCAT('SRID=4326; LINESTRING(',x1,' ',y1,', ',x2,' ',y2,')')))"
-		sqlCommand += "	limit 1;"
-		cur.execute(sqlCommand)
+	# The GiST index on `the_geom` gives the nearest candidates (by `<->`); the nearest of those (in meters) wins
+	sqlCommand  = " select gid, source, target, y1, x1, y2, x2, cost_s, reverse_cost_s, one_way"
+	sqlCommand += " from ("
+	sqlCommand += " 	select *"
+	sqlCommand += " 	from ways"
+	sqlCommand += " 	order by the_geom <-> ST_SetSRID(ST_MakePoint($1, $2), 4326)"  # Be very careful about lon and lat
+	sqlCommand += " 	limit %s" % (VRV_PGROUTING_SNAP_CANDIDATES)
+	sqlCommand += " ) c"
+	sqlCommand += " order by ST_Distance(c.the_geom::geography, ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography)"
+	sqlCommand += " limit 1"
+
+	with privPgrConnection(databaseName) as conn:
+		cur = conn.cursor()
+		privPgrExecute(cur, 'vrv_nearest_street', ['float8', 'float8'], sqlCommand, (float(dicLoc['lon']), float(dicLoc['lat'])))
 		row = cur.fetchone()
-		street = {
-			"gid" : int(row[0]),
-			"source" : int(row[1]),
-			"target" : int(row[2]),
-			"sourceLoc" : [row[3], row[4]],
-			"targetLoc" : [row[5], row[6]],
-			"cost_s" : row[7],
-			"reverse_cost_s" : row[8],
-			"one_way" : row[9]
-		}
 
-	conn.close()
+	street = {
+		"gid" : int(row[0]),
+		"source" : int(row[1]),
+		"target" : int(row[2]),
+		"sourceLoc" : [row[3], row[4]],
+		"targetLoc" : [row[5], row[6]],
+		"cost_s" : row[7],
+		"reverse_cost_s" : row[8],
+		"one_way" : row[9]
+	}
 
 	return street
 
 def pgrGetShapepointsTimeDist(startLoc, endLoc, databaseName):
 	"""
-	A function to get a list of shapepoints from start coordinate to end coordinate.
+	A function to get a list of shapepoints from start coordinate to end coordinate.  The start and end locations are snapped to their nearest streets and routed as virtual points with `pgr_withPoints`, so nothing is written to the database (and routes may be computed in parallel).
 
 	Parameters
 	----------
 	startLoc: list
 		Start location, the format is [lat, lon] (altitude, above sea level, set to be 0) or [lat, lon, alt]
-	endLat: float
-		Required, latitude of end coordinate
-	endLon: float
-		Required, longitude of end coordinate
+	endLoc: list
+		End location, the format is [lat, lon] (altitude, above sea level, set to be 0) or [lat, lon, alt]
 	databaseName: string, Require
 		If you are hosting a data provider on your local machine (e.g., pgRouting), you'll need to specify the name of the local database.
 
@@ -167,291 +154,238 @@ def pgrGetShapepointsTimeDist(startLoc, endLoc, databaseName):
 		distance between current shapepoint and previous shapepoint, the first element should be 0
 	"""
 
-	conn = psycopg2.connect("dbname='%s' user='%s' host='%s' password='%s'" % (
-		databaseName, 
-		config['VRV_SETTING_PGROUTING_USERNAME'], 
-		config['VRV_SETTING_PGROUTING_HOST'], 
-		config['VRV_SETTING_PGROUTING_PASSWORD']))
-	conn.autocommit = True
-	cur = conn.cursor()
-
-	# Calculate the distance between snapped location and source/target of closest street for the START coordinate
-	startStreet = pgrGetNearestStreet(startLoc, databaseName)
-	snapStartLoc = pgrGetSnapToRoadLatLon(startStreet['gid'], startLoc, databaseName)
-	dicSnapStartLoc = loc2Dict(snapStartLoc)
-	distSnapStart2Source = geoDistance2D(snapStartLoc, startStreet['sourceLoc'])
-	distSnapStart2Target = geoDistance2D(snapStartLoc, startStreet['targetLoc'])
-
-	# Calculate the distance between snapped location and source/target of closest street for the END coordinate
-	endStreet = pgrGetNearestStreet(endLoc, databaseName)
-	snapEndLoc = pgrGetSnapToRoadLatLon(endStreet['gid'], endLoc, databaseName)
-	dicSnapEndLoc = loc2Dict(snapEndLoc)
-	distSnapEnd2Source = geoDistance2D(snapEndLoc, endStreet['sourceLoc'])
-	distSnapEnd2Target = geoDistance2D(snapEndLoc, endStreet['targetLoc'])
-
-	# Find the number of vertices in the pgRouting database
-	sqlCommand  = "	select count(*) from ways_vertices_pgr;"
-	cur.execute(sqlCommand)
-	row = cur.fetchone()
-	newlyInsertVidNum = int(row[0]) + 1
-
-	# Testify and find a dummyClassID to put temp vertices and segments
-	dummyClassID = 821 # Hard-coded number, no specific meaning
-	# FIXME! For database security reason, we need to testify if class_id = 821 is not used in the original database
-
-	# insert the snapped location for START coordinate, and two segments from the coordinate to source/target of the closest street
-	sqlCommand  = "	insert into ways_vertices_pgr (id, lon, lat) values (%s, %s, %s);" % (
-		newlyInsertVidNum, 
-		dicSnapStartLoc['lon'], 
-		dicSnapStartLoc['lat'])
-	sqlCommand += "	insert into ways (class_id, source, target, length_m, x1, y1, x2, y2, cost_s, reverse_cost_s) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);" % (
-		dummyClassID, 
-		newlyInsertVidNum, 
-		startStreet['target'], 
-		distSnapStart2Target, 
-		dicSnapStartLoc['lon'],
-		dicSnapStartLoc['lat'],
-		startStreet['targetLoc'][1], 
-		startStreet['targetLoc'][0], 
-		startStreet['cost_s'] * distSnapStart2Target / (distSnapStart2Target + distSnapStart2Source), 
-		startStreet['reverse_cost_s'] * distSnapStart2Target / (distSnapStart2Target + distSnapStart2Source))
-	sqlCommand += "	insert into ways (class_id, source, target, length_m, x1, y1, x2, y2, cost_s, reverse_cost_s) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);" % (
-		dummyClassID, 
-		startStreet['source'], 
-		newlyInsertVidNum, 
-		distSnapStart2Source, 
-		startStreet['sourceLoc'][1], 
-		startStreet['sourceLoc'][0], 
-		dicSnapStartLoc['lon'],
-		dicSnapStartLoc['lat'],
-		startStreet['cost_s'] * distSnapStart2Source / (distSnapStart2Target + distSnapStart2Source), 
-		startStreet['reverse_cost_s'] * distSnapStart2Source / (distSnapStart2Target + distSnapStart2Source))
-
-	# insert the snapped location for END coordinate, and two segments from the coordinate to source/target of the closest street
-	sqlCommand += "	insert into ways_vertices_pgr (id, lon, lat) values (%s, %s, %s);" % (
-		newlyInsertVidNum + 1, 
-		dicSnapEndLoc['lon'], 
-		dicSnapEndLoc['lat'])
-	sqlCommand += "	insert into ways (class_id, source, target, length_m, x1, y1, x2, y2, cost_s, reverse_cost_s) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);" % (
-		dummyClassID, 
-		newlyInsertVidNum + 1, 
-		endStreet['target'], 
-		distSnapEnd2Target, 
-		dicSnapEndLoc['lon'],
-		dicSnapEndLoc['lat'],
-		endStreet['targetLoc'][1], 
-		endStreet['targetLoc'][0], 
-		endStreet['cost_s'] * distSnapEnd2Target / (distSnapEnd2Target + distSnapEnd2Source), 
-		endStreet['reverse_cost_s'] * distSnapEnd2Target / (distSnapEnd2Target + distSnapEnd2Source))
-	sqlCommand += "	insert into ways (class_id, source, target, length_m, x1, y1, x2, y2, cost_s, reverse_cost_s) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);" % (
-		dummyClassID, 
-		endStreet['source'], 
-		newlyInsertVidNum + 1, 
-		distSnapEnd2Source, 
-		endStreet['sourceLoc'][1], 
-		endStreet['sourceLoc'][0], 
-		dicSnapEndLoc['lon'],
-		dicSnapEndLoc['lat'],
-		endStreet['cost_s'] * distSnapEnd2Source / (distSnapEnd2Target + distSnapEnd2Source), 
-		endStreet['reverse_cost_s'] * distSnapEnd2Source / (distSnapEnd2Target + distSnapEnd2Source))
-
-	# Do dijstra algorithm to find shortest path
-	sqlCommand += " select b.gid as gid, b.y1 as lats1, b.x1 as lons1, b.y2 as lats2, b.x2 as lons2, a.cost as secs, b.length_m as dist "
-	sqlCommand += "	from "
-	sqlCommand += "		pgr_dijkstra("
-	sqlCommand += "			'select gid as id, source, target, cost_s as cost, reverse_cost_s as reverse_cost from ways',"
-	sqlCommand += "			%s," % (newlyInsertVidNum)
-	sqlCommand += "			%s," % (newlyInsertVidNum + 1)
-	sqlCommand += "			directed := true"
-	sqlCommand += "		) a"
-	sqlCommand += "	left join"
-	sqlCommand += "		ways b"
-	sqlCommand += "	on a.edge = b.gid"
-	sqlCommand += "	order by a.path_seq"
-
-	# Return the shapepoint result from dijstra algorithm
-	cur.execute(sqlCommand)
-	row = cur.fetchall()
-	summary = pd.DataFrame(row, columns=['gid', 'lats1', 'lons1', 'lats2', 'lons2', 'secs', 'dist'])
-	
-	# Delete the temp data
-	sqlCommand  = "	delete from ways_vertices_pgr where id = (%s);" % (newlyInsertVidNum)
-	sqlCommand += "	delete from ways_vertices_pgr where id = (%s);" % (newlyInsertVidNum + 1)
-	sqlCommand += "	delete from ways where class_id = %s;" % (dummyClassID)
-	cur.execute(sqlCommand)
-
-	# The last row is junk info, drop it
-	summary.drop(summary.index[len(summary) - 1], inplace = True)
-
-	# Sorting the coordinates so that they can be linked to each other
-	lats1 = summary['lats1'].tolist()
-	lons1 = summary['lons1'].tolist()
-	lats2 = summary['lats2'].tolist()
-	lons2 = summary['lons2'].tolist()
-	path = []
-	path.append(startLoc)
-	for i in range(1, len(lats1)):
-		if (lats1[i] != lats1[i - 1] and lats1[i] != lats2[i - 1]):
-			path.append([lats1[i], lons1[i]])
+	with privPgrConnection(databaseName) as conn:
+		cur = conn.cursor()
+
+		[startSnap, endSnap] = _pgrSnapLocs(cur, [startLoc, endLoc])
+
+		# Virtual points: -1 is the start, -2 is the end
+		sqlCommand  = " select a.node, a.cost, v.lat, v.lon, %s as dist" % (_pgrEdgeDistSQL)
+		sqlCommand += "	from "
+		sqlCommand += "		(%s) a" % (_pgrTraversalSQL([startSnap, endSnap], "-1", "-2", ""))
+		sqlCommand += "	left join"
+		sqlCommand += "		ways_vertices_pgr v"
+		sqlCommand += "	on a.node = v.id"
+		sqlCommand += "	left join"
+		sqlCommand += "		ways b"
+		sqlCommand += "	on a.edge = b.gid"
+		sqlCommand += "	order by a.path_seq"
+		cur.execute(sqlCommand, (_pgrEdgesSQL, _pgrPointsSQL([startSnap, endSnap])))
+		row = cur.fetchall()
+
+	# Each row is a node on the route (the first and last are the virtual points), along with the 
+	# cost/distance of the edge leaving it.
+	path = [startSnap['snapLoc']]
+	timeSecs = [0]
+	distMeters = [0]
+	for i in range(1, len(row)):
+		if (row[i][0] == -2):
+			path.append(endSnap['snapLoc'])
 		else:
-			path.append([lats2[i], lons2[i]])
-	timeSecs = summary['secs'].tolist()
-	distMeters = summary['dist'].tolist()
-
-	conn.close()
+			path.append([row[i][2], row[i][3]])
+		timeSecs.append(row[i - 1][1])
+		distMeters.append(row[i - 1][4])
 
 	return [path, timeSecs, distMeters]
 
-def pgrGetTimeDist(fromLocs, toLocs, databaseName):
+def _pgrSnapLocs(cur, locs):
+	"""
+	Snaps every location in `locs` to its nearest street in a single query.
+
+	Returns a list (in the order of `locs`) of dictionaries, with the gid, source, and target of the street, the fraction (from the source vertex of the street) at which the snapped location lies, and the snapped location itself, in [lat, lon] format.  Locations that could not be snapped (e.g., if the `ways` table is empty) are None.
 	"""
-	This function generated time and distance matrix using pgRouting
+
+	lats = [float(loc2Dict(loc)['lat']) for loc in locs]
+	lons = [float(loc2Dict(loc)['lon']) for loc in locs]
+
+	# For each location, the GiST index on `the_geom` gives the nearest candidates (by `<->`), and 
+	# the nearest of those (in meters) wins.
+	sqlCommand  = " select p.idx, w.gid, w.source, w.target,"
+	sqlCommand += " 	ST_LineLocatePoint(w.the_geom, p.point) as fraction,"
+	sqlCommand += " 	ST_Y(ST_ClosestPoint(w.the_geom, p.point)), ST_X(ST_ClosestPoint(w.the_geom, p.point))"
+	sqlCommand += " from ("
+	sqlCommand += " 	select idx, ST_SetSRID(ST_MakePoint(lon, lat), 4326) as point"
+	sqlCommand += " 	from unnest($1, $2) with ordinality as u(lat, lon, idx)"
+	sqlCommand += " ) p"
+	sqlCommand += " cross join lateral ("
+	sqlCommand += " 	select gid, source, target, the_geom"
+	sqlCommand += " 	from ("
+	sqlCommand += " 		select gid, source, target, the_geom"
+	sqlCommand += " 		from ways"
+	sqlCommand += " 		order by the_geom <-> p.point"
+	sqlCommand += " 		limit %s" % (VRV_PGROUTING_SNAP_CANDIDATES)
+	sqlCommand += " 	) c"
+	sqlCommand += " 	order by ST_Distance(c.the_geom::geography, p.point::geography)"
+	sqlCommand += " 	limit 1"
+	sqlCommand += " ) w"
+	sqlCommand += " order by p.idx"
+	privPgrExecute(cur, 'vrv_snap_locs', ['float8[]', 'float8[]'], sqlCommand, (lats, lons))
+	row = cur.fetchall()
+
+	snaps = [None] * len(locs)
+	for i in range(len(row)):
+		snaps[int(row[i][0]) - 1] = {
+			"gid" : int(row[i][1]),
+			"source" : int(row[i][2]),
+			"target" : int(row[i][3]),
+			"fraction" : float(row[i][4]),
+			"snapLoc" : [row[i][5], row[i][6]]
+		}
+
+	return snaps
+
+def pgrGetNearestStreetBatch(locs, databaseName):
+	"""
+	A function to find the nearest street, and the snapped location on that street, for every location in `locs`.  All locations are looked up in one query (using the spatial index on the `ways` table).
 
 	Parameters
 	----------
-	fromLoc: list, Conditional
-		Used in 'one2many' mode. To state the coordinate of the starting node
 	locs: list of lists
-		Used in 'all2all', 'one2many', 'many2one' modes. A list of coordinates, in the format of [[lat1, lon1], [lat2, lon2], ...]
-	toLoc: list, Conditional
-		Used in 'many2one' mode. To state the coordinate of the ending node
-	databaseName: string	
-		If you are hosting a data provider on your local machine (e.g., pgRouting), you'll need to specify the name of the local database. 
+		The locations to be snapped, in the format of [[lat, lon], [lat, lon], ...]
+	databaseName: string, Require
+		If you are hosting a data provider on your local machine (e.g., pgRouting), you'll need to specify the name of the local database.
 
 	Returns
 	-------
-	timeSecs: dictionary
-		The key of each item in this dictionary is in (coordID1, coordID2) format, the travelling time from first entry to second entry, the units are seconds
-	distMeters: dictionary
-		The key of each item in this dictionary is in (coordID1, coordID2) format, the travelling distance from first entry to second entry, the units are meters
+	list of dictionaries
+		In the order of `locs`.  Each dictionary contains the 'gid', 'source', and 'target' of the nearest street (from the Ways table), the 'fraction' along the street (from its source vertex) at which the snapped location lies, and the snapped location ('snapLoc') in the format of [lat, lon].  None if a location could not be snapped.
 	"""
 
-	conn = psycopg2.connect("dbname='%s' user='%s' host='%s' password='%s'" % (
-		databaseName, 
-		config['VRV_SETTING_PGROUTING_USERNAME'], 
-		config['VRV_SETTING_PGROUTING_HOST'], 
-		config['VRV_SETTING_PGROUTING_PASSWORD']))
-	conn.autocommit = True
-	cur = conn.cursor()
-
-	dummyClassID = 821 # Hard-coded number, no specific meaning
-	# FIXME! For database security reason, we need to testify if class_id = 821 is not used in the original database	
-
-	sqlCommand  = " select max(id) from ways_vertices_pgr;"
-	cur.execute(sqlCommand)
-	row = cur.fetchone()
-	newlyInsertVidNum = int(row[0]) + 1
-
-	locs = fromLocs.copy()
-	for i in range(len(toLocs)):
-		try:
-			locs.index(toLocs[i])
-		except ValueError:
-			locs.append(toLocs[i])
-
-	startVidList = []
-	endVidList = []
-	for i in range(len(fromLocs)):
-		startVidList.append(newlyInsertVidNum + locs.index(fromLocs[i]))
-	for i in range(len(toLocs)):
-		endVidList.append(newlyInsertVidNum + locs.index(toLocs[i]))
+	if (len(locs) == 0):
+		return []
+
+	with privPgrConnection(databaseName) as conn:
+		cur = conn.cursor()
+		snaps = _pgrSnapLocs(cur, locs)
+
+	return snaps
 
+def pgrGetSnapToRoadLatLonBatch(locs, databaseName):
+	"""
+	A function to get snapped latlng for a list of coordinates using pgRouting, in one query.
+
+	Parameters
+	----------
+	locs: list of lists
+		The locations to be snapped, in the format of [[lat, lon], [lat, lon], ...]
+	databaseName: string, Require
+		If you are hosting a data provider on your local machine (e.g., pgRouting), you'll need to specify the name of the local database.
+
+	Returns
+	-------
+	list of lists
+		The snapped locations in the format of [[lat, lon], [lat, lon], ...].  Notice that this function will lost the info of altitude of the locations.
+	"""
+
+	snaps = pgrGetNearestStreetBatch(locs, databaseName)
+
+	snapLocs = []
 	for i in range(len(locs)):
-		# Add dummy vertices
-		street = pgrGetNearestStreet(locs[i], databaseName)
-		snapLoc = pgrGetSnapToRoadLatLon(street['gid'], locs[i], databaseName)
-		dicSnapLoc = loc2Dict(snapLoc)
-		sqlCommand	= "	insert into ways_vertices_pgr (id, lon, lat) values (%s, %s, %s);" % (
-			newlyInsertVidNum + locs.index(locs[i]),
-			dicSnapLoc['lon'],
-			dicSnapLoc['lat'])
-		cur.execute(sqlCommand)
-
-		# Add four two road segments
-		distSource2Snapped = geoDistance2D(street['sourceLoc'], snapLoc)
-		distSnapped2Target = geoDistance2D(snapLoc, street['targetLoc'])
-		ratio = distSource2Snapped / (distSource2Snapped + distSnapped2Target)
-		dicSourceLoc = loc2Dict(street['sourceLoc'])
-		dicTargetLoc = loc2Dict(street['targetLoc'])
-		sqlCommand  = "	insert into ways (class_id, source, target, length_m, x1, y1, x2, y2, cost_s, reverse_cost_s) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);" % (
-			dummyClassID, 
-			street['source'],
-			newlyInsertVidNum + locs.index(locs[i]),
-			distSource2Snapped,
-			dicSourceLoc['lon'],
-			dicSourceLoc['lat'],
-			dicSnapLoc['lon'],
-			dicSnapLoc['lat'],
-			street['cost_s'] * ratio,
-			street['reverse_cost_s'] * ratio)
-		cur.execute(sqlCommand)
-		sqlCommand  = "	insert into ways (class_id, source, target, length_m, x1, y1, x2, y2, cost_s, reverse_cost_s) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);" % (
-			dummyClassID, 
-			newlyInsertVidNum + locs.index(locs[i]),
-			street['target'],
-			distSnapped2Target,
-			dicSnapLoc['lon'],
-			dicSnapLoc['lat'],
-			dicTargetLoc['lon'],
-			dicTargetLoc['lat'],
-			street['cost_s'] * (1 - ratio),
-			street['reverse_cost_s'] * (1 - ratio))
-		cur.execute(sqlCommand)
-
-	sqlCommand  = "	select " 
-	sqlCommand += "		start_vid as start_node, "
-	sqlCommand += "		end_vid as end_node, "
-	sqlCommand += "		sum(cost) as time, "
-	sqlCommand += "		sum(length_m) as distance "
-	sqlCommand += "	from ("
-	sqlCommand += "		select "
-	sqlCommand += "			a.*, "
-	sqlCommand += "			b.length_m"
-	sqlCommand += "		from pgr_dijkstra("
-	sqlCommand += "			'select gid as id, source, target, cost_s as cost, reverse_cost_s as reverse_cost from ways', "
-	sqlCommand += "			ARRAY%s, " % (startVidList)
-	sqlCommand += "			ARRAY%s, " % (endVidList)
-	sqlCommand += "			directed := true) a "
-	sqlCommand += "		left join "
-	sqlCommand += "			ways b "
-	sqlCommand += "		on "
-	sqlCommand += "			a.edge = b.gid "
-	sqlCommand += "		order by "
-	sqlCommand += "			a.path_seq"
-	sqlCommand += "		) x "
-	sqlCommand += "	group by "
-	sqlCommand += "		start_vid, "
-	sqlCommand += "		end_vid;"
-	cur.execute(sqlCommand)
-	row = cur.fetchall()
+		if (snaps[i] is not None):
+			snapLocs.append(snaps[i]['snapLoc'])
+		else:
+			snapLocs.append([locs[i][0], locs[i][1]])
 
-	for i in range(len(startVidList)):
-		sqlCommand  = "	delete from ways_vertices_pgr where id = %s;" % (startVidList[i])
-		cur.execute(sqlCommand)
-	for i in range(len(endVidList)):
-		sqlCommand  = "	delete from ways_vertices_pgr where id = %s;" % (endVidList[i])
-		cur.execute(sqlCommand)
-	sqlCommand  = "	delete from ways where class_id = %s;" % (dummyClassID)
-	cur.execute(sqlCommand)
+	return snapLocs
 
-	conn.close()
+def _pgrPointsSQL(snaps):
+	# The `points_sql` for pgr_withPoints, with pid i+1 for snaps[i]
+	return " select pid, edge_id, fraction from (values %s) as p(pid, edge_id, fraction)" % (
+		", ".join("(%s, %s, %s)" % (i + 1, snaps[i]['gid'], snaps[i]['fraction']) for i in range(len(snaps)) if snaps[i] is not None))
+
+def _pgrTraversalSQL(snaps, startVidsSQL, endVidsSQL, partitionSQL):
+	# A pgr_withPoints query between the virtual points of `snaps` (the edges SQL and points SQL are 
+	# left as %s parameters).  pgr_withPoints gives the node at which each edge is entered, which for a 
+	# virtual point (with a negative id) does not tell the direction of its partial edge.  So each row 
+	# also gets the node that follows it (`next_node`) and the fractions of the virtual points at either 
+	# end (`fraction` and `next_fraction`).
+	sqlCommand  = " select r.*, lead(r.node) over w as next_node, p.fraction, lead(p.fraction) over w as next_fraction"
+	sqlCommand += " from pgr_withPoints(%s, %s, " + startVidsSQL + ", " + endVidsSQL + ", directed := true, details := false) r"
+	sqlCommand += " left join (" + _pgrPointsSQL(snaps) + ") p on p.pid = -r.node"
+	sqlCommand += " window w as (" + partitionSQL + " order by r.path_seq)"
+
+	return sqlCommand
+
+def pgrGetTimeDist(fromLocs, toLocs, databaseName):
+	"""
+	This function generated time and distance matrix using pgRouting.  All locations are snapped to the road network in one query, and the whole matrix is then computed in one (read-only) many-to-many `pgr_withPoints` query.
+
+	Parameters
+	----------
+	fromLocs: list of lists
+		The start coordinates, in the format of [[lat1, lon1], [lat2, lon2], ...]
+	toLocs: list of lists
+		The end coordinates, in the format of [[lat1, lon1], [lat2, lon2], ...]
+	databaseName: string	
+		If you are hosting a data provider on your local machine (e.g., pgRouting), you'll need to specify the name of the local database. 
+
+	Returns
+	-------
+	timeSecs: numpy array
+		timeSecs[i, j] is the travelling time from fromLocs[i] to toLocs[j], the units are seconds.  NaN if either location could not be snapped to the road network.
+	distMeters: numpy array
+		distMeters[i, j] is the travelling distance from fromLocs[i] to toLocs[j], the units are meters.  NaN if either location could not be snapped to the road network.
+	"""
+
+	# Each distinct location becomes one virtual point (pid = position in `locs` + 1)
+	locs = []
+	locIndex = {}
+	fromPids = []
+	toPids = []
+	for [inLocs, pids] in [[fromLocs, fromPids], [toLocs, toPids]]:
+		for loc in inLocs:
+			key = tuple(loc)
+			if (key not in locIndex):
+				locIndex[key] = len(locs)
+				locs.append(loc)
+			pids.append(locIndex[key] + 1)
+
+	with privPgrConnection(databaseName) as conn:
+		cur = conn.cursor()
+
+		snaps = _pgrSnapLocs(cur, locs)
+
+		# Locations that could not be snapped have no virtual point, so they are left out of the query
+		startVids = [-pid for pid in sorted(set(fromPids)) if snaps[pid - 1] is not None]
+		endVids = [-pid for pid in sorted(set(toPids)) if snaps[pid - 1] is not None]
+
+		# Virtual points are identified by negative ids
+		sqlCommand  = "	select " 
+		sqlCommand += "		abs(a.start_pid), "
+		sqlCommand += "		abs(a.end_pid), "
+		sqlCommand += "		sum(a.cost) as time, "
+		sqlCommand += "		sum(%s) as distance " % (_pgrEdgeDistSQL)
+		sqlCommand += "	from (%s) a " % (_pgrTraversalSQL(snaps, "%s::bigint[]", "%s::bigint[]", "partition by r.start_pid, r.end_pid"))
+		sqlCommand += "	left join "
+		sqlCommand += "		ways b "
+		sqlCommand += "	on "
+		sqlCommand += "		a.edge = b.gid "
+		sqlCommand += "	group by "
+		sqlCommand += "		a.start_pid, "
+		sqlCommand += "		a.end_pid;"
+		if (len(startVids) > 0 and len(endVids) > 0):
+			cur.execute(sqlCommand, (_pgrEdgesSQL, _pgrPointsSQL(snaps), startVids, endVids))
+			row = cur.fetchall()
+		else:
+			row = []
 
-	rawDist = {}
 	rawTime = {}
+	rawDist = {}
 	for i in range(len(row)):
-		rawTime[row[i][0], row[i][1]] = row[i][2]
-		rawDist[row[i][0], row[i][1]] = row[i][3]
-	distMeters = {}
-	timeSecs = {}
+		rawTime[int(row[i][0]), int(row[i][1])] = row[i][2]
+		rawDist[int(row[i][0]), int(row[i][1])] = row[i][3]
 
+	# Unroutable pairs (and a location to itself) are given 0, as before; locations that could not be 
+	# snapped are given NaN
+	timeSecs = np.zeros((len(fromLocs), len(toLocs)))
+	distMeters = np.zeros((len(fromLocs), len(toLocs)))
 	for i in range(len(fromLocs)):
 		for j in range(len(toLocs)):
-			try:
-				distMeters[i, j] = rawDist[startVidList[i], endVidList[j]]
-			except:
-				distMeters[i, j] = 0
-			try:
-				timeSecs[i, j] = rawTime[startVidList[i], endVidList[j]]
-			except:
-				timeSecs[i, j] = 0
-
-	return [timeSecs, distMeters]
\ No newline at end of file
+			if (snaps[fromPids[i] - 1] is None or snaps[toPids[j] - 1] is None):
+				timeSecs[i, j] = np.nan
+				distMeters[i, j] = np.nan
+			elif ((fromPids[i], toPids[j]) in rawTime):
+				timeSecs[i, j] = rawTime[fromPids[i], toPids[j]]
+				distMeters[i, j] = rawDist[fromPids[i], toPids[j]]
+
+	return [timeSecs, distMeters]
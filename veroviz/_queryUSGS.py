@@ -1,4 +1,5 @@
 from veroviz._common import *
+from veroviz._httpClient import privHttpRequest
 
 def usgsGetElevation(locs):
 	"""
@@ -21,8 +22,7 @@ def usgsGetElevation(locs):
 			# USGS uses x=lon, y=lat:
 			elevUrl = ('https://nationalmap.gov/epqs/pqs.php?x=%s&y=%s&units=Meters&output=json' % (locs[i][1], locs[i][0]))
 	
-			http = urllib3.PoolManager()
-			response = http.request('GET', elevUrl)
+			response = privHttpRequest('GET', elevUrl)
 			data = json.loads(response.data.decode('utf-8'))
 
 			http_status = response.status
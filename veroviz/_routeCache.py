@@ -0,0 +1,234 @@
+from veroviz._common import *
+import collections
+import copy
+import sqlite3
+import threading
+
+# Coordinates are quantized to 1e-6 degrees (roughly 0.1 meters) before they are used as cache keys
+VRV_ROUTE_CACHE_QUANTUM = 1e6
+
+# Hit/miss counters for the current session
+_cacheStats = {'hits': 0, 'misses': 0}
+_cacheLock = threading.Lock()
+
+class _MemoryRouteCache(object):
+	"""
+	An in-memory, thread-safe, least-recently-used route cache, holding up to `config['VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES']` routes.
+	"""
+
+	def __init__(self):
+		self._routes = collections.OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key):
+		with self._lock:
+			if (key not in self._routes):
+				return None
+			self._routes.move_to_end(key)
+			return self._routes[key]
+
+	def put(self, key, route):
+		maxEntries = config['VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES']
+		with self._lock:
+			self._routes[key] = route
+			self._routes.move_to_end(key)
+			while (maxEntries is not None and len(self._routes) > maxEntries):
+				self._routes.popitem(last=False)
+
+	def count(self):
+		with self._lock:
+			return len(self._routes)
+
+	def clear(self):
+		with self._lock:
+			self._routes.clear()
+
+def _jsonDefault(value):
+	# Numpy scalars (e.g., from a provider's response) are stored as the equivalent Python values
+	if (isinstance(value, np.generic)):
+		return value.item()
+
+	raise TypeError("Object of type %s is not JSON serializable" % (type(value).__name__))
+
+class _SqliteRouteCache(object):
+	"""
+	An on-disk route cache, stored as JSON in the SQLite file `filename`.  Routes expire after `config['VRV_SETTING_ROUTE_CACHE_TTL_SECONDS']`.
+	"""
+
+	def __init__(self, filename):
+		self.filename = filename
+
+	def _connect(self):
+		conn = sqlite3.connect(self.filename, timeout=60)
+		conn.execute("""CREATE TABLE IF NOT EXISTS routes (
+							provider TEXT, profile TEXT,
+							startLat INTEGER, startLon INTEGER, endLat INTEGER, endLon INTEGER,
+							route BLOB, created REAL,
+							PRIMARY KEY (provider, profile, startLat, startLon, endLat, endLon)
+						) WITHOUT ROWID""")
+
+		return conn
+
+	def _oldest(self):
+		ttl = config['VRV_SETTING_ROUTE_CACHE_TTL_SECONDS']
+
+		return (time.time() - ttl) if (ttl is not None) else -np.inf
+
+	def get(self, key):
+		conn = self._connect()
+		try:
+			row = conn.execute("SELECT route FROM routes WHERE provider = ? AND profile = ? AND startLat = ? AND startLon = ? AND endLat = ? AND endLon = ? AND created >= ?", key + (self._oldest(), )).fetchone()
+		finally:
+			conn.close()
+
+		if (row is None):
+			return None
+
+		# Routes written by an older version (or otherwise unreadable) are treated as missing, and replaced by the next `put()`
+		try:
+			[path, extras, timeSecs, distMeters] = json.loads(row[0])
+		except ValueError:
+			return None
+
+		# JSON object keys are strings; the extras are keyed by shapepoint index
+		extras = {int(i): extras[i] for i in extras}
+
+		return [path, extras, timeSecs, distMeters]
+
+	def put(self, key, route):
+		conn = self._connect()
+		try:
+			with conn:
+				conn.execute("INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", key + (json.dumps(route, default=_jsonDefault), time.time()))
+				conn.execute("DELETE FROM routes WHERE created < ?", (self._oldest(), ))
+		finally:
+			conn.close()
+
+	def count(self):
+		conn = self._connect()
+		try:
+			return conn.execute("SELECT COUNT(*) FROM routes").fetchone()[0]
+		finally:
+			conn.close()
+
+	def clear(self):
+		conn = self._connect()
+		try:
+			with conn:
+				conn.execute("DELETE FROM routes")
+		finally:
+			conn.close()
+
+_memoryCache = _MemoryRouteCache()
+
+def _getTiers():
+	# The memory tier is checked first, then the on-disk tier (if enabled)
+	tiers = []
+	if (config['VRV_SETTING_ROUTE_CACHE_MAX_ENTRIES'] != 0):
+		tiers.append(_memoryCache)
+	if (config['VRV_SETTING_ROUTE_CACHE_FILE'] is not None):
+		tiers.append(_SqliteRouteCache(config['VRV_SETTING_ROUTE_CACHE_FILE']))
+
+	return tiers
+
+def _routeKey(startLoc, endLoc, provider, profile):
+	[startLat, startLon, endLat, endLon] = np.rint(np.array([startLoc[0], startLoc[1], endLoc[0], endLoc[1]], dtype=float) * VRV_ROUTE_CACHE_QUANTUM).astype(np.int64).tolist()
+
+	return (provider, profile, startLat, startLon, endLat, endLon)
+
+def privGetCachedRoute(startLoc, endLoc, provider, profile, queryFunction):
+	"""
+	Returns the route (shapepoints, per-segment times and distances, and any extras) from `startLoc` to `endLoc`, from the route cache if possible.  Otherwise, the route is requested from the data provider and added to the cache.
+
+	Parameters
+	----------
+	startLoc: list
+		The start location, in [lat, lon] or [lat, lon, alt] format
+	endLoc: list
+		The end location, in [lat, lon] or [lat, lon, alt] format
+	provider: string
+		Identifies the data provider (and, for local providers, the server or database)
+	profile: string
+		Identifies the routeType, and any other options that change the result
+	queryFunction: function
+		Called with no arguments to fetch the route from the data provider.  It should return `[path, extras, timeSecs, distMeters]`, or None if the query failed (in which case nothing is cached).
+
+	Returns
+	-------
+	list
+		`[path, extras, timeSecs, distMeters]`, or None if the data provider query failed.  The caller may modify the returned lists.
+	"""
+
+	key = _routeKey(startLoc, endLoc, provider, profile)
+	tiers = _getTiers()
+
+	for i in range(len(tiers)):
+		route = tiers[i].get(key)
+		if (route is not None):
+			with _cacheLock:
+				_cacheStats['hits'] += 1
+			# Promote the route to the faster tiers
+			for j in range(i):
+				tiers[j].put(key, route)
+			return copy.deepcopy(route)
+
+	with _cacheLock:
+		_cacheStats['misses'] += 1
+
+	route = queryFunction()
+	if (route is None):
+		return None
+
+	for tier in tiers:
+		tier.put(key, copy.deepcopy(route))
+
+	return route
+
+def getRouteCacheStats():
+	"""
+	Returns statistics for the route (shapepoint) cache.  See :ref:`Global Settings and Defaults` for the settings that control the cache.
+
+	Returns
+	-------
+	dictionary
+		'hits' and 'misses' give the number of routes found in (or missing from) the cache during this session.  Each miss is a route that was requested from a data provider.  'memoryEntries' and 'fileEntries' give the number of routes currently stored in memory and in the cache file (None if the file cache is disabled).
+
+	Example
+	-------
+		>>> import veroviz as vrv
+		>>> shapepoints = vrv.getShapepoints2D(startLoc=[42.80, -78.90], endLoc=[42.85, -78.85], routeType='fastest', dataProvider='OSRM-online')
+		>>> shapepoints = vrv.getShapepoints2D(startLoc=[42.80, -78.90], endLoc=[42.85, -78.85], routeType='fastest', dataProvider='OSRM-online')
+		>>> vrv.getRouteCacheStats()
+		{'hits': 1, 'misses': 1, 'memoryEntries': 1, 'fileEntries': None}
+	"""
+
+	with _cacheLock:
+		stats = dict(_cacheStats)
+
+	stats['memoryEntries'] = _memoryCache.count()
+	stats['fileEntries'] = None
+	if (config['VRV_SETTING_ROUTE_CACHE_FILE'] is not None):
+		stats['fileEntries'] = _SqliteRouteCache(config['VRV_SETTING_ROUTE_CACHE_FILE']).count()
+
+	return stats
+
+def clearRouteCache(resetStats=True):
+	"""
+	Deletes every route from the in-memory route cache and (if enabled) the route cache file.
+
+	Parameters
+	----------
+	resetStats: boolean, Optional, default as True
+		If True, the hit/miss counters returned by `getRouteCacheStats()` are also reset to zero.
+	"""
+
+	_memoryCache.clear()
+	if (config['VRV_SETTING_ROUTE_CACHE_FILE'] is not None):
+		_SqliteRouteCache(config['VRV_SETTING_ROUTE_CACHE_FILE']).clear()
+
+	if (resetStats):
+		with _cacheLock:
+			_cacheStats['hits'] = 0
+			_cacheStats['misses'] = 0
+
+	return
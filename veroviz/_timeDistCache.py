@@ -0,0 +1,216 @@
+from veroviz._common import *
+import sqlite3
+import threading
+
+from veroviz._timeDistMatrix import privTimeDistToArray
+
+# Coordinates are quantized to 1e-6 degrees (roughly 0.1 meters) before they are used as cache keys
+VRV_TIMEDIST_CACHE_QUANTUM = 1e6
+
+# When the cache exceeds its maximum size, the least-recently-used entries are evicted
+# until it is at this fraction of the maximum (so eviction doesn't run on every insert).
+VRV_TIMEDIST_CACHE_EVICT_TO = 0.9
+
+# Hit/miss counters for the current session
+_cacheStats = {'hits': 0, 'misses': 0}
+_cacheLock = threading.Lock()
+
+def _connectCache(filename):
+	conn = sqlite3.connect(filename, timeout=60)
+	conn.execute("""CREATE TABLE IF NOT EXISTS timedist (
+						provider TEXT, profile TEXT,
+						fromLat INTEGER, fromLon INTEGER, toLat INTEGER, toLon INTEGER,
+						timeSecs REAL, distMeters REAL,
+						created REAL, accessed REAL,
+						PRIMARY KEY (provider, profile, fromLat, fromLon, toLat, toLon)
+					) WITHOUT ROWID""")
+	conn.execute("CREATE INDEX IF NOT EXISTS timedist_accessed ON timedist (accessed)")
+
+	return conn
+
+def _quantize(locs):
+	return np.rint(np.array([[loc[0], loc[1]] for loc in locs], dtype=float) * VRV_TIMEDIST_CACHE_QUANTUM).astype(np.int64).tolist()
+
+def privTimeDistCacheEnabled():
+	return (config['VRV_SETTING_TIMEDIST_CACHE_FILE'] is not None)
+
+def privGetCachedTimeDist(fromLocs, toLocs, provider, profile, queryFunction):
+	"""
+	Returns travel time and distance arrays between `fromLocs` and `toLocs`, using values from the on-disk cache (see `config['VRV_SETTING_TIMEDIST_CACHE_FILE']`) where possible.  Only the cells that are not in the cache are requested from the data provider, and these are then added to the cache.
+
+	Parameters
+	----------
+	fromLocs: list
+		The start coordinates, in [[lat, lon], [lat, lon], ...] format
+	toLocs: list
+		The end coordinates, in [[lat, lon], [lat, lon], ...] format
+	provider: string
+		Identifies the data provider (and, for local providers, the server or database)
+	profile: string
+		Identifies the routeType/travel mode
+	queryFunction: function
+		Called as `queryFunction(subFromLocs, subToLocs)` to fetch missing cells from the data provider.  It should return `[timeSecs, distMeters]` (as arrays, or dictionaries keyed by `(i, j)`), without applying any constant speed.
+
+	Returns
+	-------
+	timeSecs: numpy array
+		Travel times, in seconds.  None if the data provider query failed.
+	distMeters: numpy array
+		Travel distances, in meters.  None if the data provider query failed.
+	"""
+
+	numRows = len(fromLocs)
+	numCols = len(toLocs)
+
+	fromKeys = _quantize(fromLocs)
+	toKeys = _quantize(toLocs)
+
+	timeSecs = np.full((numRows, numCols), np.nan)
+	distMeters = np.full((numRows, numCols), np.nan)
+
+	ttl = config['VRV_SETTING_TIMEDIST_CACHE_TTL_SECONDS']
+	now = time.time()
+	oldest = (now - ttl) if (ttl is not None) else -np.inf
+
+	conn = _connectCache(config['VRV_SETTING_TIMEDIST_CACHE_FILE'])
+	try:
+		# Look up each distinct origin once, and match its cached destinations
+		toIndex = {}
+		for j, key in enumerate(toKeys):
+			toIndex.setdefault(tuple(key), []).append(j)
+		fromIndex = {}
+		for i, key in enumerate(fromKeys):
+			fromIndex.setdefault(tuple(key), []).append(i)
+
+		hitKeys = []
+		for fromKey, rows in fromIndex.items():
+			cursor = conn.execute("SELECT toLat, toLon, timeSecs, distMeters FROM timedist WHERE provider = ? AND profile = ? AND fromLat = ? AND fromLon = ? AND created >= ?", (provider, profile, fromKey[0], fromKey[1], oldest))
+			for [toLat, toLon, t, d] in cursor:
+				if ((toLat, toLon) in toIndex):
+					cols = toIndex[(toLat, toLon)]
+					timeSecs[np.ix_(rows, cols)] = t
+					distMeters[np.ix_(rows, cols)] = d
+					hitKeys.append((now, provider, profile, fromKey[0], fromKey[1], toLat, toLon))
+
+		missing = np.isnan(distMeters)
+		numMisses = int(missing.sum())
+		with _cacheLock:
+			_cacheStats['hits'] += numRows * numCols - numMisses
+			_cacheStats['misses'] += numMisses
+
+		if (numMisses > 0):
+			# First, fetch origins with no cached values at all (against every destination).
+			# Then, fetch whatever remains (e.g., the columns of newly-added destinations).
+			fullRows = np.nonzero(missing.all(axis=1))[0].tolist()
+			requests = []
+			if (len(fullRows) > 0):
+				requests.append([fullRows, list(range(numCols))])
+			fullRowSet = set(fullRows)
+			partRows = [i for i in np.nonzero(missing.any(axis=1))[0].tolist() if (i not in fullRowSet)]
+			if (len(partRows) > 0):
+				partCols = np.nonzero(missing[partRows, :].any(axis=0))[0].tolist()
+				requests.append([partRows, partCols])
+
+			newRecords = []
+			for [rows, cols] in requests:
+				subFromLocs = [fromLocs[i] for i in rows]
+				subToLocs = [toLocs[j] for j in cols]
+
+				result = queryFunction(subFromLocs, subToLocs)
+				if (result is None):
+					return [None, None]
+
+				subTime = privTimeDistToArray(result[0], len(rows), len(cols))
+				subDist = privTimeDistToArray(result[1], len(rows), len(cols))
+
+				timeSecs[np.ix_(rows, cols)] = subTime
+				distMeters[np.ix_(rows, cols)] = subDist
+
+				for a, i in enumerate(rows):
+					for b, j in enumerate(cols):
+						# Don't cache unroutable pairs; they may be a transient provider problem
+						if (np.isfinite(subTime[a, b]) and np.isfinite(subDist[a, b])):
+							newRecords.append((provider, profile, fromKeys[i][0], fromKeys[i][1], toKeys[j][0], toKeys[j][1], float(subTime[a, b]), float(subDist[a, b]), now, now))
+
+			with conn:
+				conn.executemany("INSERT OR REPLACE INTO timedist VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", newRecords)
+				_evictCache(conn, oldest)
+
+		if (len(hitKeys) > 0):
+			with conn:
+				conn.executemany("UPDATE timedist SET accessed = ? WHERE provider = ? AND profile = ? AND fromLat = ? AND fromLon = ? AND toLat = ? AND toLon = ?", hitKeys)
+
+	finally:
+		conn.close()
+
+	return [timeSecs, distMeters]
+
+def _evictCache(conn, oldest):
+	# Drop expired entries, then the least-recently-used entries if the cache is too large
+	if (oldest > -np.inf):
+		conn.execute("DELETE FROM timedist WHERE created < ?", (oldest, ))
+
+	maxEntries = config['VRV_SETTING_TIMEDIST_CACHE_MAX_ENTRIES']
+	if (maxEntries is None):
+		return
+
+	numEntries = conn.execute("SELECT COUNT(*) FROM timedist").fetchone()[0]
+	if (numEntries > maxEntries):
+		numDelete = numEntries - int(maxEntries * VRV_TIMEDIST_CACHE_EVICT_TO)
+		conn.execute("DELETE FROM timedist WHERE (provider, profile, fromLat, fromLon, toLat, toLon) IN (SELECT provider, profile, fromLat, fromLon, toLat, toLon FROM timedist ORDER BY accessed LIMIT ?)", (numDelete, ))
+
+def getTimeDistCacheStats():
+	"""
+	Returns statistics for the travel time/distance cache.  The cache is enabled by setting `config['VRV_SETTING_TIMEDIST_CACHE_FILE']` (see :ref:`Global Settings and Defaults`).
+
+	Returns
+	-------
+	dictionary
+		'hits' and 'misses' give the number of matrix cells found in (or missing from) the cache during this session.  Each miss is a cell that was requested from a data provider.  'entries' gives the number of cells currently stored in the cache file (or None if the cache is disabled).
+
+	Example
+	-------
+		>>> import veroviz as vrv
+		>>> vrv.setGlobal({'VRV_SETTING_TIMEDIST_CACHE_FILE': 'timedist_cache.sqlite'})
+		>>> [time, dist] = vrv.getTimeDist2D(nodes=myNodes, routeType='fastest', dataProvider='OSRM-online')
+		>>> vrv.getTimeDistCacheStats()
+		{'hits': 0, 'misses': 9, 'entries': 9}
+	"""
+
+	with _cacheLock:
+		stats = dict(_cacheStats)
+
+	stats['entries'] = None
+	if (privTimeDistCacheEnabled()):
+		conn = _connectCache(config['VRV_SETTING_TIMEDIST_CACHE_FILE'])
+		try:
+			stats['entries'] = conn.execute("SELECT COUNT(*) FROM timedist").fetchone()[0]
+		finally:
+			conn.close()
+
+	return stats
+
+def clearTimeDistCache(resetStats=True):
+	"""
+	Deletes every entry from the travel time/distance cache file (if the cache is enabled).
+
+	Parameters
+	----------
+	resetStats: boolean, Optional, default as True
+		If True, the hit/miss counters returned by `getTimeDistCacheStats()` are also reset to zero.
+	"""
+
+	if (privTimeDistCacheEnabled()):
+		conn = _connectCache(config['VRV_SETTING_TIMEDIST_CACHE_FILE'])
+		try:
+			with conn:
+				conn.execute("DELETE FROM timedist")
+		finally:
+			conn.close()
+
+	if (resetStats):
+		with _cacheLock:
+			_cacheStats['hits'] = 0
+			_cacheStats['misses'] = 0
+
+	return
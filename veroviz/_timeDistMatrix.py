@@ -0,0 +1,338 @@
+from veroviz._common import *
+from collections.abc import Mapping
+import scipy.sparse
+
+from veroviz._utilities import privConvertDistance
+from veroviz._utilities import privConvertTime
+
+class TimeDistMatrix(Mapping):
+	"""
+	A travel time or travel distance matrix, stored as a dense numpy array plus an index of node IDs.  This is returned by :meth:`~veroviz.getTimeDist2D.getTimeDist2D` and :meth:`~veroviz.getTimeDist3D.getTimeDist3D` if `outputFormat` is 'matrix' or 'matrix32'.
+
+	A `TimeDistMatrix` behaves like a read-only version of the dictionaries returned by default.  The travel time from node 1 to node 2 is still given by `time[1, 2]`, and `keys()`, `items()`, `len()` and `in` work as they do for a dictionary.  However, the values are kept in a single array, so large matrices need a fraction of the memory and can be handed to solvers without copying.
+
+	Parameters
+	----------
+	values: numpy array
+		A 2D array, with one row per origin ID and one column per destination ID.
+	fromIDs: list
+		The origin node IDs, in row order.
+	toIDs: list
+		The destination node IDs, in column order.
+	units: string
+		The time or distance units of `values`.  See :ref:`Units` for options.
+	metric: string, {'time', 'distance'}
+		Indicates whether `values` contains times or distances.  This determines how units are converted.
+	"""
+
+	def __init__(self, values, fromIDs, toIDs, units, metric):
+		self._values = values
+		self.fromIDs = list(fromIDs)
+		self.toIDs = list(toIDs)
+		self.units = units
+		self.metric = metric
+		self._rowIndex = {nodeID: i for i, nodeID in enumerate(self.fromIDs)}
+		self._colIndex = {nodeID: j for j, nodeID in enumerate(self.toIDs)}
+
+	def __getitem__(self, key):
+		[fromID, toID] = key
+		return float(self._values[self._rowIndex[fromID], self._colIndex[toID]])
+
+	def __iter__(self):
+		for fromID in self.fromIDs:
+			for toID in self.toIDs:
+				yield (fromID, toID)
+
+	def __len__(self):
+		return len(self.fromIDs) * len(self.toIDs)
+
+	def __contains__(self, key):
+		try:
+			[fromID, toID] = key
+		except (TypeError, ValueError):
+			return False
+		return (fromID in self._rowIndex and toID in self._colIndex)
+
+	def __repr__(self):
+		return "TimeDistMatrix(%s, %d x %d, units='%s', dtype=%s)" % (self.metric, len(self.fromIDs), len(self.toIDs), self.units, self._values.dtype)
+
+	@property
+	def shape(self):
+		return self._values.shape
+
+	@property
+	def dtype(self):
+		return self._values.dtype
+
+	def to_numpy(self):
+		"""
+		Returns the underlying array (not a copy).  Rows follow `fromIDs` and columns follow `toIDs`.
+		"""
+		return self._values
+
+	def row(self, fromID):
+		"""
+		Returns the values from node `fromID` to every node in `toIDs`, as a 1D array view.
+		"""
+		return self._values[self._rowIndex[fromID], :]
+
+	def col(self, toID):
+		"""
+		Returns the values from every node in `fromIDs` to node `toID`, as a 1D array view.
+		"""
+		return self._values[:, self._colIndex[toID]]
+
+	def to_dataframe(self):
+		"""
+		Returns a pandas dataframe, with `fromIDs` as the index and `toIDs` as the columns.
+		"""
+		return pd.DataFrame(self._values, index=self.fromIDs, columns=self.toIDs)
+
+	def to_dict(self):
+		"""
+		Returns a dictionary, keyed by `(fromID, toID)`, in the same format as the default output of `getTimeDist2D()`.
+		"""
+		rows = self._values.tolist()
+		return {(fromID, toID): rows[i][j] for i, fromID in enumerate(self.fromIDs) for j, toID in enumerate(self.toIDs)}
+
+	def convert(self, toUnits):
+		"""
+		Returns a new `TimeDistMatrix` with values expressed in `toUnits`.  The node ID index is shared with the original matrix.
+
+		Parameters
+		----------
+		toUnits: string
+			The desired time units (if `metric` is 'time') or distance units (if `metric` is 'distance').  See :ref:`Units` for options.
+		"""
+
+		if (self.metric == 'time'):
+			factor = privConvertTime(1.0, self.units, toUnits)
+		else:
+			factor = privConvertDistance(1.0, self.units, toUnits)
+
+		newMatrix = TimeDistMatrix.__new__(TimeDistMatrix)
+		newMatrix._values = (self._values * factor).astype(self._values.dtype, copy=False)
+		newMatrix.fromIDs = self.fromIDs
+		newMatrix.toIDs = self.toIDs
+		newMatrix.units = toUnits
+		newMatrix.metric = self.metric
+		newMatrix._rowIndex = self._rowIndex
+		newMatrix._colIndex = self._colIndex
+
+		return newMatrix
+
+def privCreateTimeDistMatrix(values, fromIDs, toIDs, units, metric, outputFormat):
+	"""
+	Packages a 2D array of values, with rows indexed by `fromIDs` and columns indexed by `toIDs`, according to `outputFormat`.
+
+	Parameters
+	----------
+	values: numpy array
+		A 2D array of times or distances.
+	fromIDs: list
+		The origin node IDs, in row order.
+	toIDs: list
+		The destination node IDs, in column order.
+	units: string
+		The units of `values`.
+	metric: string, {'time', 'distance'}
+		Indicates whether `values` contains times or distances.
+	outputFormat: string, {'dict', 'matrix', 'matrix32'}
+		'dict' returns a dictionary keyed by `(fromID, toID)`; 'matrix' and 'matrix32' return a `TimeDistMatrix` backed by a float64 or float32 array, respectively.
+
+	Returns
+	-------
+	dictionary or TimeDistMatrix
+	"""
+
+	try:
+		outputFormat = outputFormat.lower()
+	except:
+		pass
+
+	if (outputFormat == 'dict'):
+		rows = np.asarray(values).tolist()
+		return {(fromID, toID): rows[i][j] for i, fromID in enumerate(fromIDs) for j, toID in enumerate(toIDs)}
+
+	dtype = np.float32 if (outputFormat == 'matrix32') else np.float64
+
+	return TimeDistMatrix(np.asarray(values, dtype=dtype), fromIDs, toIDs, units, metric)
+
+def privTimeDistToArray(timeDist, numRows, numCols):
+	"""
+	Returns a 2D float64 array from a dictionary keyed by `(row, col)` (as returned by the data provider query functions).  Arrays are returned unchanged.
+	"""
+
+	if (isinstance(timeDist, np.ndarray)):
+		return timeDist
+
+	values = np.empty((numRows, numCols), dtype=np.float64)
+	for i in range(numRows):
+		for j in range(numCols):
+			values[i, j] = timeDist[i, j]
+
+	return values
+
+def privTimeDistSubmatrix(timeDist, fromIDs, toIDs, units=None):
+	"""
+	Returns a 2D float64 array of the values of `timeDist` (a dictionary keyed by `(fromID, toID)`, or a `TimeDistMatrix`) for every pair of `fromIDs` and `toIDs`.  A `TimeDistMatrix` is first converted to `units`, if provided; dictionaries are assumed to be in the desired units already.
+	"""
+
+	if (isinstance(timeDist, TimeDistMatrix)):
+		if (units is not None and units != timeDist.units):
+			timeDist = timeDist.convert(units)
+		rows = [timeDist._rowIndex[fromID] for fromID in fromIDs]
+		cols = [timeDist._colIndex[toID] for toID in toIDs]
+		return np.asarray(timeDist.to_numpy()[np.ix_(rows, cols)], dtype=np.float64)
+
+	return np.array([[timeDist[fromID, toID] for toID in toIDs] for fromID in fromIDs], dtype=np.float64).reshape(len(fromIDs), len(toIDs))
+
+class SparseTimeDistMatrix(Mapping):
+	"""
+	A sparse travel time or travel distance matrix, stored in compressed sparse row (CSR) format plus an index of node IDs.  This is returned by :meth:`~veroviz.getTimeDist2D.getTimeDist2D` if `matrixType` is 'knn' and `outputFormat` is 'matrix' or 'matrix32'.
+
+	Only the stored (fromID, toID) pairs are keys; looking up any other pair raises a `KeyError`, exactly as for the dictionary returned with `outputFormat='dict'`.  Memory grows with the number of stored pairs, rather than with the square of the number of nodes.
+
+	Parameters
+	----------
+	values: scipy.sparse.csr_matrix
+		A square sparse matrix, with one row and one column per node ID.
+	nodeIDs: list
+		The node IDs, in row (and column) order.
+	units: string
+		The time or distance units of `values`.  See :ref:`Units` for options.
+	metric: string, {'time', 'distance'}
+		Indicates whether `values` contains times or distances.
+	"""
+
+	def __init__(self, values, nodeIDs, units, metric):
+		self._values = values
+		self.nodeIDs = list(nodeIDs)
+		self.units = units
+		self.metric = metric
+		self._index = {nodeID: i for i, nodeID in enumerate(self.nodeIDs)}
+
+	def _position(self, fromID, toID):
+		i = self._index[fromID]
+		j = self._index[toID]
+		start = self._values.indptr[i]
+		end = self._values.indptr[i+1]
+		positions = np.nonzero(self._values.indices[start:end] == j)[0]
+		if (len(positions) == 0):
+			raise KeyError((fromID, toID))
+
+		return start + positions[0]
+
+	def __getitem__(self, key):
+		[fromID, toID] = key
+		return float(self._values.data[self._position(fromID, toID)])
+
+	def __iter__(self):
+		for i, fromID in enumerate(self.nodeIDs):
+			for j in self._values.indices[self._values.indptr[i]:self._values.indptr[i+1]]:
+				yield (fromID, self.nodeIDs[j])
+
+	def __len__(self):
+		return self._values.nnz
+
+	def __contains__(self, key):
+		try:
+			[fromID, toID] = key
+			self._position(fromID, toID)
+		except (TypeError, ValueError, KeyError):
+			return False
+		return True
+
+	def __repr__(self):
+		return "SparseTimeDistMatrix(%s, %d x %d, %d pairs, units='%s', dtype=%s)" % (self.metric, len(self.nodeIDs), len(self.nodeIDs), self._values.nnz, self.units, self._values.dtype)
+
+	@property
+	def shape(self):
+		return self._values.shape
+
+	@property
+	def dtype(self):
+		return self._values.dtype
+
+	def to_scipy(self):
+		"""
+		Returns the underlying `scipy.sparse.csr_matrix` (not a copy).  Rows and columns follow `nodeIDs`.
+		"""
+		return self._values
+
+	def neighbors(self, fromID):
+		"""
+		Returns the IDs of the nodes stored in the row of `fromID`, in the order in which they are stored (nearest first, for 'knn' matrices).
+		"""
+		i = self._index[fromID]
+		return [self.nodeIDs[j] for j in self._values.indices[self._values.indptr[i]:self._values.indptr[i+1]]]
+
+	def to_dict(self):
+		"""
+		Returns a dictionary, keyed by `(fromID, toID)`, containing the stored pairs.
+		"""
+		data = self._values.data.tolist()
+		return {key: data[n] for n, key in enumerate(self)}
+
+	def convert(self, toUnits):
+		"""
+		Returns a new `SparseTimeDistMatrix` with values expressed in `toUnits`.
+
+		Parameters
+		----------
+		toUnits: string
+			The desired time units (if `metric` is 'time') or distance units (if `metric` is 'distance').  See :ref:`Units` for options.
+		"""
+
+		if (self.metric == 'time'):
+			factor = privConvertTime(1.0, self.units, toUnits)
+		else:
+			factor = privConvertDistance(1.0, self.units, toUnits)
+
+		values = self._values.copy()
+		values.data = (values.data * factor).astype(self._values.dtype, copy=False)
+
+		return SparseTimeDistMatrix(values, self.nodeIDs, toUnits, self.metric)
+
+def privCreateSparseTimeDistMatrix(values, neighbors, nodeIDs, units, metric, outputFormat):
+	"""
+	Packages the values for each node's neighbors according to `outputFormat`.
+
+	Parameters
+	----------
+	values: numpy array
+		A `len(nodeIDs)` x k array.  `values[i, n]` is the time or distance from node `nodeIDs[i]` to node `nodeIDs[neighbors[i, n]]`.
+	neighbors: numpy array
+		A `len(nodeIDs)` x k integer array of positions in `nodeIDs`.
+	nodeIDs: list
+		The node IDs.
+	units: string
+		The units of `values`.
+	metric: string, {'time', 'distance'}
+		Indicates whether `values` contains times or distances.
+	outputFormat: string, {'dict', 'matrix', 'matrix32'}
+		'dict' returns a dictionary keyed by `(fromID, toID)`, containing only the neighbor pairs; 'matrix' and 'matrix32' return a `SparseTimeDistMatrix` backed by float64 or float32 values, respectively.
+
+	Returns
+	-------
+	dictionary or SparseTimeDistMatrix
+	"""
+
+	try:
+		outputFormat = outputFormat.lower()
+	except:
+		pass
+
+	[numRows, k] = neighbors.shape
+
+	if (outputFormat == 'dict'):
+		rows = np.asarray(values).tolist()
+		cols = neighbors.tolist()
+		return {(nodeIDs[i], nodeIDs[cols[i][n]]): rows[i][n] for i in range(numRows) for n in range(k)}
+
+	dtype = np.float32 if (outputFormat == 'matrix32') else np.float64
+
+	# Each row already lists its neighbors nearest-first; CSR keeps that order
+	matrix = scipy.sparse.csr_matrix((np.asarray(values, dtype=dtype).ravel(), neighbors.ravel(), np.arange(numRows + 1) * k), shape=(len(nodeIDs), len(nodeIDs)))
+
+	return SparseTimeDistMatrix(matrix, nodeIDs, units, metric)
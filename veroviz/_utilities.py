@@ -1,6 +1,7 @@
 from veroviz._common import *
 from veroviz._internal import *
 from veroviz._geometry import *
+import functools
 
 def privConvertDistance(distance, fromUnits, toUnits):
 	
@@ -184,26 +185,102 @@ def privGetMapBoundary(nodes, arcs, locs):
 	return [[minLat, maxLon], [maxLat, minLon]]
 	
 	
-def privInitDataframe(dataframeType):
+def privInitDataframe(dataframeType, data=None):
+	"""
+	Returns a nodes, assignments, or arcs dataframe.  If `data` is None, the dataframe is empty; otherwise, it is built (in one step) from `data`, which may be a dictionary of columns (lists, arrays, or scalars that are repeated in every row) or a list of row dictionaries.  Columns are always in the standard order, with the types given by `nodesColumnTypes`, `assignmentsColumnTypes`, or `arcsColumnTypes`.
+	"""
 	
 	try:
 		dataframeType = dataframeType.lower()
 	except:
 		pass
-	
+
 	if (dataframeType == 'nodes'):
-		dataframe = pd.DataFrame(
-			columns=nodesColumnList)
+		[columnList, columnTypes] = [nodesColumnList, nodesColumnTypes]
 	elif (dataframeType == 'assignments'):
-		dataframe = pd.DataFrame(
-			columns=assignmentsColumnList)
+		[columnList, columnTypes] = [assignmentsColumnList, assignmentsColumnTypes]
 	elif (dataframeType == 'arcs'):
-		dataframe = pd.DataFrame(
-			columns=arcsColumnList)
+		[columnList, columnTypes] = [arcsColumnList, arcsColumnTypes]
 	else:
 		return
 
-	return dataframe	
+	if (data is None):
+		data = {}
+	elif (type(data) is not dict):
+		data = {column: [row[column] if (column in row) else None for row in data] for column in columnList}
+
+	numRows = max([len(value) for value in data.values() if np.ndim(value) > 0], default=0)
+
+	# Missing columns are None in every row
+	dataframe = pd.DataFrame(
+		{column: _typedColumn(data[column] if (column in data) else None, columnTypes[column] if (column in columnTypes) else 'object', numRows) for column in columnList}, 
+		columns=columnList)
+
+	return dataframe
+
+def _typedColumn(values, columnType, numRows):
+	# Returns `values` (a list or array, or a scalar that is repeated in every row) as an array of type `columnType`, or as objects if that fails
+	isScalar = (np.ndim(values) == 0)
+	try:
+		if (columnType == 'float64'):
+			return np.full(numRows, np.nan if (values is None) else values, dtype=float) if (isScalar) else np.array(values, dtype=float)
+		elif (columnType == 'Int64'):
+			return pd.array([values] * numRows if (isScalar) else values, dtype='Int64')
+		elif (columnType == 'category'):
+			if (not isScalar and all(value is None for value in values)):
+				[values, isScalar] = [None, True]
+			if (isScalar):
+				return pd.Categorical.from_codes(np.full(numRows, -1 if (pd.isnull(values)) else 0, dtype=np.int8), dtype=_categoryDtype(values))
+			return pd.Categorical(values)
+	except (TypeError, ValueError):
+		pass
+
+	# Other columns hold Python objects (pandas would turn a scalar None into NaN, and a list of booleans into a bool column)
+	column = np.empty(numRows, dtype=object)
+	try:
+		column[:] = [values] * numRows if (isScalar) else list(values)
+	except ValueError:
+		# e.g., a list of equal-length lists
+		column = pd.Series(list(values), dtype=object)
+
+	return column
+
+@functools.lru_cache(maxsize=256)
+def _categoryDtype(value):
+	return pd.CategoricalDtype([] if (pd.isnull(value)) else [value])
+	
+def privSetColumnTypes(dataframe, dataframeType):
+	"""
+	Converts the standard columns of a nodes, assignments, or arcs dataframe to the types in `nodesColumnTypes`, `assignmentsColumnTypes`, or `arcsColumnTypes` (e.g., after `pd.concat()`, which turns categories with different values into objects).  Columns that can not be converted, and any other columns, are unchanged.
+	"""
+
+	try:
+		dataframeType = dataframeType.lower()
+	except:
+		pass
+
+	if (dataframeType == 'nodes'):
+		columnTypes = nodesColumnTypes
+	elif (dataframeType == 'assignments'):
+		columnTypes = assignmentsColumnTypes
+	elif (dataframeType == 'arcs'):
+		columnTypes = arcsColumnTypes
+	else:
+		return dataframe
+
+	newTypes = {column: columnTypes[column] for column in dataframe.columns if (column in columnTypes and str(dataframe[column].dtype) != columnTypes[column])}
+	try:
+		dataframe = dataframe.astype(newTypes)
+	except (TypeError, ValueError):
+		# Convert the columns one at a time, skipping the ones that fail
+		dataframe = dataframe.copy()
+		for column in newTypes:
+			try:
+				dataframe[column] = dataframe[column].astype(newTypes[column])
+			except (TypeError, ValueError):
+				pass
+
+	return dataframe
 	
 	
 def privExportDataframe(dataframe, filename):
@@ -1,4 +1,8 @@
 from veroviz._common import *
+from veroviz._nodeIndex import privGetNodeLocs
+from veroviz._pgrConnection import privPgrConnection
+from veroviz._pgrConnection import privPgrExecute
+from veroviz._timeDistMatrix import TimeDistMatrix
 from veroviz._geometry import *
 from veroviz._internal import *
 
@@ -119,7 +123,7 @@ def valSnapNodesToRoad(nodes, dataProvider, dataProviderArgs):
 
 	return [valFlag, errorMsg, warningMsg]
 
-def valGetTimeDist2D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs):
+def valGetTimeDist2D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, outputFormat='dict', k=None):
 	valFlag = True
 	errorMsg = ""
 	warningMsg = ""
@@ -137,7 +141,7 @@ def valGetTimeDist2D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, o
 		errorMsg = "Error: `nodes` should not be None."
 
 	if (valFlag):
-		[valFlag, errorMsg, newWarningMsg] = _valMatrixType(matrixType, fromNodeID, toNodeID)
+		[valFlag, errorMsg, newWarningMsg] = _valMatrixType(matrixType, fromNodeID, toNodeID, k)
 		warningMsg += newWarningMsg
 
 	if (valFlag):
@@ -162,6 +166,10 @@ def valGetTimeDist2D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, o
 		[valFlag, errorMsg, newWarningMsg] = _valRouteType2DForScalar(routeType, speedMPS, dataProvider)
 		warningMsg += newWarningMsg
 
+	if (valFlag):
+		[valFlag, errorMsg, newWarningMsg] = _valMatrixOutputFormat(outputFormat)
+		warningMsg += newWarningMsg
+
 	if (valFlag and routeType != 'euclidean2d' and routeType != 'manhattan'):
 		locs = list(zip(nodes.lat, nodes.lon))
 		[valFlag, errorMsg, newWarningMsg] = _valDatabase(locs, dataProvider, dataProviderArgs)
@@ -169,6 +177,83 @@ def valGetTimeDist2D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, o
 
 	return [valFlag, errorMsg, warningMsg]
 
+def valExtendTimeDist2D(time, dist, oldNodes, newNodes, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, outputFormat):
+	valFlag = True
+	errorMsg = ""
+	warningMsg = ""
+
+	try:
+		routeType = routeType.lower()
+	except:
+		pass
+
+	for [matrix, parameterName] in [[time, '`time`'], [dist, '`dist`']]:
+		if (valFlag):
+			if (matrix is None):
+				valFlag = False
+				errorMsg = "Error: %s should not be None." % (parameterName)
+			elif (not isinstance(matrix, (dict, TimeDistMatrix))):
+				valFlag = False
+				errorMsg = "Error: %s should be a dictionary or TimeDistMatrix, as returned by `getTimeDist2D()`." % (parameterName)
+
+	for [nodes, parameterName] in [[oldNodes, '`oldNodes`'], [newNodes, '`newNodes`']]:
+		if (valFlag):
+			if (nodes is None):
+				valFlag = False
+				errorMsg = "Error: %s should not be None." % (parameterName)
+			else:
+				[valFlag, errorMsg, newWarningMsg] = valNodes(nodes)
+				warningMsg += newWarningMsg
+
+	if (valFlag):
+		oldIDs = set(oldNodes['id'].tolist())
+		for nodeID in oldIDs:
+			if ((nodeID, nodeID) not in time or (nodeID, nodeID) not in dist):
+				valFlag = False
+				errorMsg = "Error: Node ID %s from `oldNodes` is not in `time` and `dist`.  These should have been generated by `getTimeDist2D()`, with `matrixType = 'all2all'`, for the `oldNodes` dataframe." % (nodeID)
+				break
+
+	if (valFlag):
+		newIDs = [nodeID for nodeID in newNodes['id'].tolist() if (nodeID not in oldIDs)]
+		if (len(newIDs) == 0):
+			warningMsg += "Warning: `newNodes` does not contain any node IDs that are not already in `oldNodes`.\n"
+		elif (len(set(newIDs)) != len(newIDs)):
+			valFlag = False
+			errorMsg = "Error: `newNodes` contains duplicate node IDs."
+
+	if (valFlag):
+		try:
+			outputDistUnits = outputDistUnits.lower()
+		except:
+			pass
+			
+		[valFlag, errorMsg, newWarningMsg] = _valDistanceUnits(outputDistUnits, "output")
+		warningMsg += newWarningMsg
+
+	if (valFlag):
+		try:
+			outputTimeUnits = outputTimeUnits.lower()
+		except:
+			pass
+
+		[valFlag, errorMsg, newWarningMsg] = _valTimeUnits(outputTimeUnits, "output")
+		warningMsg += newWarningMsg
+
+	if (valFlag):
+		[valFlag, errorMsg, newWarningMsg] = _valRouteType2DForScalar(routeType, speedMPS, dataProvider)
+		warningMsg += newWarningMsg
+
+	if (valFlag):
+		[valFlag, errorMsg, newWarningMsg] = _valMatrixOutputFormat(outputFormat)
+		warningMsg += newWarningMsg
+
+	if (valFlag and routeType != 'euclidean2d' and routeType != 'manhattan'):
+		locs = list(zip(newNodes.lat, newNodes.lon))
+		[valFlag, errorMsg, newWarningMsg] = _valDatabase(locs, dataProvider, dataProviderArgs)
+		warningMsg += newWarningMsg
+
+	return [valFlag, errorMsg, warningMsg]
+
 def valGetTimeDistScalar2D(startLoc, endLoc, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs):
 	valFlag = True
 	errorMsg = ""
@@ -224,7 +309,7 @@ def valGetTimeDistScalar2D(startLoc, endLoc, outputDistUnits, outputTimeUnits, r
 
 	return [valFlag, errorMsg, warningMsg]
 
-def valGetTimeDist3D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, takeoffSpeedMPS, climbRateMPS, cruiseSpeedMPS, cruiseAltMetersAGL, landSpeedMPS, descentRateMPS):
+def valGetTimeDist3D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, takeoffSpeedMPS, climbRateMPS, cruiseSpeedMPS, cruiseAltMetersAGL, landSpeedMPS, descentRateMPS, outputFormat='dict'):
 	valFlag = True
 	errorMsg = ""
 	warningMsg = ""
@@ -238,6 +323,14 @@ def valGetTimeDist3D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, o
 		[valFlag, errorMsg, newWarningMsg] = valNodes(nodes)
 		warningMsg += newWarningMsg
 
+	if (valFlag):
+		try:
+			if (matrixType.lower() == 'knn'):
+				valFlag = False
+				errorMsg = "Error: The 'knn' matrixType is not supported by `getTimeDist3D()`."
+		except:
+			pass
+
 	if (valFlag):
 		[valFlag, errorMsg, newWarningMsg] = _valMatrixType(matrixType, fromNodeID, toNodeID)
 		warningMsg += newWarningMsg
@@ -264,6 +357,10 @@ def valGetTimeDist3D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, o
 		[valFlag, errorMsg, newWarningMsg] = _valRouteType3D(routeType, takeoffSpeedMPS, climbRateMPS, cruiseSpeedMPS, landSpeedMPS, descentRateMPS)
 		warningMsg += newWarningMsg
 
+	if (valFlag):
+		[valFlag, errorMsg, newWarningMsg] = _valMatrixOutputFormat(outputFormat)
+		warningMsg += newWarningMsg
+
 	return [valFlag, errorMsg, warningMsg]
 
 def valGetTimeDistScalar3D(startLoc, endLoc, outputDistUnits, outputTimeUnits, takeoffSpeedMPS, cruiseSpeedMPS, landSpeedMPS, cruiseAltMetersAGL, routeType, climbRateMPS, descentRateMPS):
@@ -328,7 +425,7 @@ def valGetTimeDistScalar3D(startLoc, endLoc, outputDistUnits, outputTimeUnits, t
 
 	return [valFlag, errorMsg, warningMsg]
 
-def valGetShapepoints2D(odID, objectID, modelFile, startLoc, endLoc, startTimeSec, expDurationSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, dataProvider, dataProviderArgs):
+def valGetShapepoints2D(odID, objectID, modelFile, startLoc, endLoc, startTimeSec, expDurationSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, dataProvider, dataProviderArgs, simplifyToleranceMeters):
 	valFlag = True
 	errorMsg = ""
 	warningMsg = ""
@@ -418,6 +515,10 @@ def valGetShapepoints2D(odID, objectID, modelFile, startLoc, endLoc, startTimeSe
 				[valFlag, errorMsg, newWarningMsg] = _valHexColor(ganttColor)
 				warningMsg += newWarningMsg
 
+	if (valFlag and simplifyToleranceMeters is not None):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterOrEqualToZeroFloat(simplifyToleranceMeters, 'simplifyToleranceMeters')
+		warningMsg += newWarningMsg
+
 	return [valFlag, errorMsg, warningMsg]
 
 def valGetShapepoints3D(odID, objectID, modelFile, startTimeSec, startLoc, endLoc, takeoffSpeedMPS, cruiseSpeedMPS, landSpeedMPS, cruiseAltMetersAGL, routeType, climbRateMPS, descentRateMPS, earliestLandTime, loiterPosition, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorLoiter):
@@ -1518,13 +1619,14 @@ def valCreateArcsFromNodeSeq(nodeSeq, nodes, initArcs, startArc, objectID, leafl
 		warningMsg += newWarningMsg
 
 	if (valFlag):
+		nodeIDs = set(nodes['id'].tolist())
 		for i in range(len(nodeSeq)):
 			if (not valFlag):
 				break
 			if (valFlag):
 				[valFlag, errorMsg, newWarningMsg] = _valGreaterOrEqualToZeroInteger(nodeSeq[i], 'nodeSeq')
 			if (valFlag):
-				if (nodeSeq[i] not in nodes['id'].tolist()):
+				if (nodeSeq[i] not in nodeIDs):
 					valFlag = False
 					errorMsg = "Error: 'nodes' dataframe does not contain a node with `id = %s`." % (nodeSeq[i])
 
@@ -1645,7 +1747,7 @@ def valCreateNodesFromLocs(locs, initNodes, nodeType, nodeName, startNode, incre
 	return [valFlag, errorMsg, warningMsg]
 
 
-def valCreateAssignmentsFromArcs2D(initAssignments, arcs, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs):
+def valCreateAssignmentsFromArcs2D(initAssignments, arcs, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs, maxWorkers, simplifyToleranceMeters):
 
 	valFlag = True
 	errorMsg = ""
@@ -1764,10 +1866,18 @@ def valCreateAssignmentsFromArcs2D(initAssignments, arcs, serviceTimeSec, modelS
 				[valFlag, errorMsg, newWarningMsg] = _valHexColor(ganttColorService)
 				warningMsg += newWarningMsg
 			
+	if (valFlag):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterThanZeroInteger(maxWorkers, 'maxWorkers')
+		warningMsg += newWarningMsg
+
+	if (valFlag and simplifyToleranceMeters is not None):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterOrEqualToZeroFloat(simplifyToleranceMeters, 'simplifyToleranceMeters')
+		warningMsg += newWarningMsg
+
 	return [valFlag, errorMsg, warningMsg]	
 
 
-def valCreateAssignmentsFromNodeSeq2D(initAssignments, nodeSeq, nodes, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs):
+def valCreateAssignmentsFromNodeSeq2D(initAssignments, nodeSeq, nodes, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs, maxWorkers, simplifyToleranceMeters):
 
 	valFlag = True
 	errorMsg = ""
@@ -1796,13 +1906,14 @@ def valCreateAssignmentsFromNodeSeq2D(initAssignments, nodeSeq, nodes, serviceTi
 		warningMsg += newWarningMsg
 
 	if (valFlag):
+		nodeIDs = set(nodes['id'].tolist())
 		for i in range(len(nodeSeq)):
 			if (not valFlag):
 				break
 			if (valFlag):
 				[valFlag, errorMsg, newWarningMsg] = _valGreaterOrEqualToZeroInteger(nodeSeq[i], 'nodeSeq')
 			if (valFlag):
-				if (nodeSeq[i] not in nodes['id'].tolist()):
+				if (nodeSeq[i] not in nodeIDs):
 					valFlag = False
 					errorMsg = "Error: 'nodes' dataframe does not contain a node with `id = %s`." % (nodeSeq[i])
 
@@ -1873,14 +1984,13 @@ def valCreateAssignmentsFromNodeSeq2D(initAssignments, nodeSeq, nodes, serviceTi
 		warningMsg += newWarningMsg
 
 	if (valFlag):
+		seqLocs = privGetNodeLocs(nodes, nodeSeq)
 		for i in range(0, len(nodeSeq)-1):
 			if (not valFlag):
 				break
 
-			startLoc = [nodes.loc[nodes['id'] == nodeSeq[i]]['lat'].values[0],
-						nodes.loc[nodes['id'] == nodeSeq[i]]['lon'].values[0]]
-			endLoc   = [nodes.loc[nodes['id'] == nodeSeq[i+1]]['lat'].values[0],
-						nodes.loc[nodes['id'] == nodeSeq[i+1]]['lon'].values[0]]
+			startLoc = seqLocs[i]
+			endLoc   = seqLocs[i+1]
 	
 			if (startLoc != endLoc):
 				[valFlag, errorMsg, newWarningMsg] = _valRouteType2DForShapepoints(routeType, speedMPS, dummyExpDurationSec, dataProvider)
@@ -1931,9 +2041,17 @@ def valCreateAssignmentsFromNodeSeq2D(initAssignments, nodeSeq, nodes, serviceTi
 				[valFlag, errorMsg, newWarningMsg] = _valHexColor(ganttColorService)
 				warningMsg += newWarningMsg
 
+	if (valFlag):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterThanZeroInteger(maxWorkers, 'maxWorkers')
+		warningMsg += newWarningMsg
+
+	if (valFlag and simplifyToleranceMeters is not None):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterOrEqualToZeroFloat(simplifyToleranceMeters, 'simplifyToleranceMeters')
+		warningMsg += newWarningMsg
+
 	return [valFlag, errorMsg, warningMsg]	
 
-def valCreateAssignmentsFromLocSeq2D(initAssignments, locSeq, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs):
+def valCreateAssignmentsFromLocSeq2D(initAssignments, locSeq, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs, maxWorkers, simplifyToleranceMeters):
 
 	valFlag = True
 	errorMsg = ""
@@ -2063,9 +2181,17 @@ def valCreateAssignmentsFromLocSeq2D(initAssignments, locSeq, serviceTimeSec, mo
 				[valFlag, errorMsg, newWarningMsg] = _valHexColor(ganttColorService)
 				warningMsg += newWarningMsg
 
+	if (valFlag):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterThanZeroInteger(maxWorkers, 'maxWorkers')
+		warningMsg += newWarningMsg
+
+	if (valFlag and simplifyToleranceMeters is not None):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterOrEqualToZeroFloat(simplifyToleranceMeters, 'simplifyToleranceMeters')
+		warningMsg += newWarningMsg
+
 	return [valFlag, errorMsg, warningMsg]	
 
-def valAddAssignment2D(initAssignments, odID, objectID, modelFile, startLoc, endLoc, startTimeSec, expDurationSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, dataProvider, dataProviderArgs):
+def valAddAssignment2D(initAssignments, odID, objectID, modelFile, startLoc, endLoc, startTimeSec, expDurationSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, dataProvider, dataProviderArgs, simplifyToleranceMeters):
 
 	valFlag = True
 	errorMsg = ""
@@ -2160,6 +2286,10 @@ def valAddAssignment2D(initAssignments, odID, objectID, modelFile, startLoc, end
 				[valFlag, errorMsg, newWarningMsg] = _valHexColor(ganttColor)
 				warningMsg += newWarningMsg
 
+	if (valFlag and simplifyToleranceMeters is not None):
+		[valFlag, errorMsg, newWarningMsg] = _valGreaterOrEqualToZeroFloat(simplifyToleranceMeters, 'simplifyToleranceMeters')
+		warningMsg += newWarningMsg
+
 	return [valFlag, errorMsg, warningMsg]
 	
 
@@ -2383,8 +2513,12 @@ def valAssignments(assignments):
 			warningMsg += newWarningMsg
 
 	if (valFlag):
-		for i in assignments.index:
-			assignments.at[i, 'modelFile'] = addHeadSlash(assignments.at[i, 'modelFile'])
+		if (assignments['modelFile'].dtype.name == 'category'):
+			# Only the (few) distinct model files need to be checked
+			assignments['modelFile'] = assignments['modelFile'].map(addHeadSlash).astype('category')
+		else:
+			for i in assignments.index:
+				assignments.at[i, 'modelFile'] = addHeadSlash(assignments.at[i, 'modelFile'])
 
 	return [valFlag, errorMsg, warningMsg]
 
@@ -3471,7 +3605,7 @@ def _valDatabase(locs, dataProvider, dataProviderArgs):
 		pass
 
 	if (dataProvider not in dataProviderDictionary.keys()):
-		errorMsg = "Error: Invalid `dataProvider` value. Valid options include 'pgRouting', 'MapQuest', 'ORS-online', 'OSRM-online', and 'ORS-local'."
+		errorMsg = "Error: Invalid `dataProvider` value. Valid options include 'pgRouting', 'MapQuest', 'ORS-online', 'OSRM-online', 'OSRM-local', and 'ORS-local'."
 		valFlag = False
 	else:
 		if (dataProviderDictionary[dataProvider] == "pgrouting"):
@@ -3484,11 +3618,11 @@ def _valDatabase(locs, dataProvider, dataProviderArgs):
 			else:
 				databaseName = dataProviderArgs['databaseName']
 				try:
-					conn = psycopg2.connect("dbname='%s' user='%s' host='%s' password='%s'" % (databaseName, config['VRV_SETTING_PGROUTING_USERNAME'], config['VRV_SETTING_PGROUTING_HOST'], config['VRV_SETTING_PGROUTING_PASSWORD']))
-					cur = conn.cursor()
-					sqlCommand = "select min(lat), max(lat), min(lon), max(lon) from ways_vertices_pgr;"
-					cur.execute(sqlCommand)
-					row = cur.fetchone()
+					with privPgrConnection(databaseName) as conn:
+						cur = conn.cursor()
+						sqlCommand = "select min(lat), max(lat), min(lon), max(lon) from ways_vertices_pgr"
+						privPgrExecute(cur, 'vrv_database_bounds', [], sqlCommand, ())
+						row = cur.fetchone()
 					minLat = row[0]
 					maxLat = row[1]
 					minLon = row[2]
@@ -3496,7 +3630,6 @@ def _valDatabase(locs, dataProvider, dataProviderArgs):
 					for i in range(len(locs)):
 						if (locs[i][0] < minLat or locs[i][0] > maxLat or locs[i][1] < minLon or locs[i][1] > maxLon):
 							warningMsg += "Warning: The database contains coordinates between latitude: %s to %s and longitude: %s to %s, the coordinates (%s, %s) you provided is not inside. \n" % (minLat, maxLat, minLon, maxLon, locs[i][0], locs[i][1])
-					conn.close()
 				except:
 					valFlag = False
 					errorMsg = "Error: Bad request. Database '%s' doesn't exist." % (databaseName)
@@ -3516,6 +3649,9 @@ def _valDatabase(locs, dataProvider, dataProviderArgs):
 			elif ('APIkey' not in dataProviderArgs):
 				valFlag = False
 				errorMsg = "Error: 'APIkey' is a required key in `dataProviderArgs` if `dataProvider = 'ORS-online'`."
+			elif ('maxWorkers' in dataProviderArgs):
+				[valFlag, errorMsg, newWarningMsg] = _valGreaterThanZeroInteger(dataProviderArgs['maxWorkers'], "'maxWorkers' in `dataProviderArgs`")
+				warningMsg += newWarningMsg
 
 		if (dataProviderDictionary[dataProvider] == "ors-local"):
 			if (dataProviderArgs is None):
@@ -3524,11 +3660,22 @@ def _valDatabase(locs, dataProvider, dataProviderArgs):
 			elif ('port' not in dataProviderArgs):
 				valFlag = False
 				errorMsg = "Error: 'port' is a required key in `dataProviderArgs` if `dataProvider = 'ORS-local'`."
+			elif ('maxWorkers' in dataProviderArgs):
+				[valFlag, errorMsg, newWarningMsg] = _valGreaterThanZeroInteger(dataProviderArgs['maxWorkers'], "'maxWorkers' in `dataProviderArgs`")
+				warningMsg += newWarningMsg
 
 		if (dataProviderDictionary[dataProvider] == "osrm-online"):
 			if (dataProviderArgs is not None):
 				warningMsg += "Warning: `dataProviderArgs` will be ignored if `dataProvider = 'OSRM-online'`.\n"
 
+		if (dataProviderDictionary[dataProvider] == "osrm-local"):
+			if (dataProviderArgs is None):
+				valFlag = False
+				errorMsg = "Error: `dataProviderArgs` is a required parameter if `dataprovider = 'OSRM-local'`."
+			elif ('port' not in dataProviderArgs):
+				valFlag = False
+				errorMsg = "Error: 'port' is a required key in `dataProviderArgs` if `dataProvider = 'OSRM-local'`."
+
 	return [valFlag, errorMsg, warningMsg]
 
 
@@ -3756,7 +3903,7 @@ def _valRouteType2DForScalar(routeType, speedMPS, dataProvider):
 				errorMsg = "Error: For 'manhattan' routeType, speedMPS is required."
 		elif (routeType == 'fastest'):
 			if (dataProvider not in dataProviderDictionary.keys()):
-				errorMsg = "Error: A valid dataProvider is required if routeType = 'fastest'. Valid data providers supporting the 'fastest' routeType are 'ORS-online', 'OSRM-online', 'pgRouting', MapQuest', and 'ORS-local'."
+				errorMsg = "Error: A valid dataProvider is required if routeType = 'fastest'. Valid data providers supporting the 'fastest' routeType are 'ORS-online', 'OSRM-online', 'OSRM-local', 'pgRouting', MapQuest', and 'ORS-local'."
 				valFlag = False
 			elif (speedMPS is not None):
 				warningMsg += "Warning:  An explicit constant vehicle speed was specified by speedMPS.  Speeds from the data provider will be ignored. \n"
@@ -3844,7 +3991,7 @@ def _valRouteType2DForShapepoints(routeType, speedMPS, expDurationSec, dataProvi
 		elif (routeType in ['fastest', 'shortest', 'pedestrian', 'cycling', 'truck', 'wheelchair']):
 			if (routeType == 'fastest'):
 				if (dataProvider not in dataProviderDictionary.keys()):
-					errorMsg = "Error: A valid dataProvider is required if routeType = 'fastest'. Valid data providers supporting the 'fastest' routeType are 'ORS-online', 'OSRM-online', 'pgRouting', 'MapQuest', and 'ORS-local'."
+					errorMsg = "Error: A valid dataProvider is required if routeType = 'fastest'. Valid data providers supporting the 'fastest' routeType are 'ORS-online', 'OSRM-online', 'OSRM-local', 'pgRouting', 'MapQuest', and 'ORS-local'."
 					valFlag = False
 			elif (routeType == 'shortest'):
 				if (dataProviderDictionary[dataProvider] not in ['ors-online', 'mapquest']):
@@ -3879,7 +4026,7 @@ def _valRouteType2DForShapepoints(routeType, speedMPS, expDurationSec, dataProvi
 
 	return [valFlag, errorMsg, warningMsg]
 
-def _valMatrixType(matrixType, fromNodeID, toNodeID):
+def _valMatrixType(matrixType, fromNodeID, toNodeID, k=None):
 	valFlag = True
 	errorMsg = ""
 	warningMsg = ""
@@ -3906,6 +4053,34 @@ def _valMatrixType(matrixType, fromNodeID, toNodeID):
 		if (toNodeID is None):
 			valFlag = False
 			errorMsg = "Error: `toNodeID` is needed for 'many2one' option; the destination node is required."
+	elif (matrixType == 'knn'):
+		if (fromNodeID is not None or toNodeID is not None):
+			warningMsg += "Warning: `fromNodeID` and `toNodeID` will be ignored.\n"
+		if (k is None):
+			valFlag = False
+			errorMsg = "Error: `k` is needed for 'knn' option; the number of nearest neighbors is required."
+		else:
+			[valFlag, errorMsg, newWarningMsg] = _valGreaterThanZeroInteger(k, "`k`")
+			warningMsg += newWarningMsg
+
+	if (valFlag and matrixType != 'knn' and k is not None):
+		warningMsg += "Warning: `k` is ignored unless `matrixType = 'knn'`.\n"
+
+	return [valFlag, errorMsg, warningMsg]
+
+def _valMatrixOutputFormat(outputFormat):
+	valFlag = True
+	errorMsg = ""
+	warningMsg = ""
+
+	try:
+		outputFormat = outputFormat.lower()
+	except:
+		pass
+
+	if (outputFormat not in matrixOutputFormatList):
+		valFlag = False
+		errorMsg = "Error: Invalid `outputFormat` value. Valid options include 'dict', 'matrix', and 'matrix32'."
 
 	return [valFlag, errorMsg, warningMsg]
 
@@ -0,0 +1,94 @@
+from veroviz._common import *
+import asyncio
+import concurrent.futures
+import functools
+import threading
+
+from veroviz.getTimeDist2D import getTimeDist2D
+from veroviz.getShapepoints2D import getShapepoints2D
+from veroviz.snapNodesToRoad import getSnapLocBatch
+from veroviz.utilities import geocode
+from veroviz.utilities import getElevationLocs
+from veroviz.utilities import isochrones
+
+# The worker threads that run data provider queries for the async functions
+_executor = None
+_executorSize = None
+_executorLock = threading.Lock()
+
+def _getExecutor():
+	global _executor, _executorSize
+	maxWorkers = config['VRV_SETTING_ASYNC_MAX_WORKERS']
+	if (_executor is None or _executorSize != maxWorkers):
+		with _executorLock:
+			if (_executor is None or _executorSize != maxWorkers):
+				if (_executor is not None):
+					_executor.shutdown(wait=False)
+				_executor = concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='veroviz')
+				_executorSize = maxWorkers
+
+	return _executor
+
+async def _runAsync(function, *args, **kwargs):
+	# Run the (blocking) function in a worker thread, so the event loop is not blocked
+	loop = asyncio.get_running_loop()
+
+	return await loop.run_in_executor(_getExecutor(), functools.partial(function, *args, **kwargs))
+
+async def getTimeDist2DAsync(*args, **kwargs):
+	"""
+	An asynchronous version of :meth:`~veroviz.getTimeDist2D.getTimeDist2D`, for use in `asyncio` applications.  It accepts the same arguments and returns the same result; the query runs in a worker thread, so the event loop is not blocked while waiting for the data provider.  At most `config['VRV_SETTING_ASYNC_MAX_WORKERS']` queries (from all of the async functions) run at once; the rest wait their turn.
+
+	Example
+	-------
+		>>> import asyncio
+		>>> import veroviz as vrv
+		>>> async def main():
+		...     return await vrv.getTimeDist2DAsync(nodes=myNodes, routeType='fastest', dataProvider='OSRM-online')
+		>>> [time, dist] = asyncio.run(main())
+	"""
+
+	return await _runAsync(getTimeDist2D, *args, **kwargs)
+
+async def getShapepoints2DAsync(*args, **kwargs):
+	"""
+	An asynchronous version of :meth:`~veroviz.getShapepoints2D.getShapepoints2D`.  It accepts the same arguments and returns the same result.  See :meth:`getTimeDist2DAsync` for details.
+
+	Example
+	-------
+		>>> import asyncio
+		>>> import veroviz as vrv
+		>>> async def main(odPairs):
+		...     return await asyncio.gather(*[vrv.getShapepoints2DAsync(odID=i, startLoc=od[0], endLoc=od[1], routeType='fastest', dataProvider='OSRM-online') for i, od in enumerate(odPairs)])
+		>>> shapepoints = asyncio.run(main(odPairs))
+	"""
+
+	return await _runAsync(getShapepoints2D, *args, **kwargs)
+
+async def getSnapLocBatchAsync(*args, **kwargs):
+	"""
+	An asynchronous version of :meth:`~veroviz.snapNodesToRoad.getSnapLocBatch`.  It accepts the same arguments and returns the same result.  See :meth:`getTimeDist2DAsync` for details.
+	"""
+
+	return await _runAsync(getSnapLocBatch, *args, **kwargs)
+
+async def geocodeAsync(*args, **kwargs):
+	"""
+	An asynchronous version of :meth:`~veroviz.utilities.geocode`.  It accepts the same arguments and returns the same result.  See :meth:`getTimeDist2DAsync` for details.
+	"""
+
+	return await _runAsync(geocode, *args, **kwargs)
+
+async def getElevationLocsAsync(*args, **kwargs):
+	"""
+	An asynchronous version of :meth:`~veroviz.utilities.getElevationLocs`.  It accepts the same arguments and returns the same result.  See :meth:`getTimeDist2DAsync` for details.
+	"""
+
+	return await _runAsync(getElevationLocs, *args, **kwargs)
+
+async def isochronesAsync(*args, **kwargs):
+	"""
+	An asynchronous version of :meth:`~veroviz.utilities.isochrones`.  It accepts the same arguments and returns the same result.  See :meth:`getTimeDist2DAsync` for details.
+	"""
+
+	return await _runAsync(isochrones, *args, **kwargs)
@@ -6,17 +6,22 @@ from veroviz._validation import valAddStaticAssignment
 from veroviz._validation import valCreateAssignmentsFromArcs2D
 from veroviz._validation import valCreateAssignmentsFromNodeSeq2D
 from veroviz._validation import valCreateAssignmentsFromLocSeq2D
+from veroviz._validation import valAssignments
 
 from veroviz._createAssignments import privAddStaticAssignment
 from veroviz._getShapepoints import privGetShapepoints2D
 from veroviz._getShapepoints import privGetShapepoints3D
+from veroviz._getShapepoints import privGetRoute2D
 
 from veroviz._utilities import privInitDataframe
+from veroviz._utilities import privSetColumnTypes
 from veroviz._getTimeDistFromLocs2D import getTimeDistFromLocs2D
+from veroviz._nodeIndex import privGetNodeLocs
+from veroviz._httpClient import privMapConcurrent
 
 from veroviz._internal import stripCesiumColor
 
-def addAssignment2D(initAssignments=None, odID=1, objectID=None, modelFile=None, startLoc=None, endLoc=None, startTimeSec=0.0, expDurationSec=None, routeType='euclidean2D', speedMPS=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None, dataProvider=None, dataProviderArgs=None):
+def addAssignment2D(initAssignments=None, odID=1, objectID=None, modelFile=None, startLoc=None, endLoc=None, startTimeSec=0.0, expDurationSec=None, routeType='euclidean2D', speedMPS=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None, dataProvider=None, dataProviderArgs=None, simplifyToleranceMeters=None):
 
 	"""
 	This function appends to an existing :ref:`Assignments` dataframe, or creates a new :ref:`Assignments` dataframe if `initAssignments` is None.  The new rows in this dataframe describe all of the "shapepoints" between given starting and ending locations, including timestamps indicating the departure and arrival times for each shapepoint. Shapepoints are pairs of GPS coordinates that are connected by straight lines.  For a given origin and destination, numerous individual shapepoints can be combined to define a travel route along a road network.   
@@ -81,6 +86,8 @@ def addAssignment2D(initAssignments=None, odID=1, objectID=None, modelFile=None,
 		Specifies the data source to be used for obtaining the shapepoints. See :ref:`Data Providers` for options and requirements.
 	dataProviderArgs: dictionary, Conditional, default as None
 		For some data providers, additional parameters are required (e.g., API keys or database names). See :ref:`Data Providers` for the additional arguments required for each supported data provider.
+	simplifyToleranceMeters: float, Optional, default as None
+		If provided, the route's shapepoints are simplified (using the Douglas-Peucker algorithm) so that no removed shapepoint is more than this many meters from the simplified route.  The total travel time and distance are unchanged.  Any extras returned by the data provider (e.g., wayname, surface, or steepness) are taken from the longest of the merged segments.
 
 	Returns
 	-------
@@ -299,27 +306,9 @@ def addAssignment2D(initAssignments=None, odID=1, objectID=None, modelFile=None,
 
 	"""
 	
-	# validatation
-	[valFlag, errorMsg, warningMsg] = valAddAssignment2D(initAssignments, odID, objectID, modelFile, startLoc, endLoc, startTimeSec, expDurationSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, dataProvider, dataProviderArgs)
-	
-	if (not valFlag):
-		print (errorMsg)
-		return (None, None)
-	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
-		print (warningMsg)
-		
-	# Initialize an assignments dataframe:
-	assignmentsDF = privInitDataframe('assignments')
-
-	# if the user provided an initAssignments dataframe, add the new points after it
-	if (type(initAssignments) is pd.core.frame.DataFrame):
-		assignmentsDF = pd.concat([assignmentsDF, initAssignments], ignore_index=True, sort=False)
-		
-		# Increase odID as necessary:
-		if (len(assignmentsDF) > 0):
-			odID = max(max(assignmentsDF['odID'])+1, odID)
-	
-	tmpShapepoints = privGetShapepoints2D(
+	# The builder validates `initAssignments` and the new assignment
+	builder = AssignmentsBuilder(initAssignments)
+	endTimeSec = builder.add2D(
 		odID             = odID, 
 		objectID         = objectID, 
 		modelFile        = modelFile, 
@@ -338,22 +327,20 @@ def addAssignment2D(initAssignments=None, odID=1, objectID=None, modelFile=None,
 		useArrows        = useArrows, 
 		modelScale       = modelScale, 
 		modelMinPxSize   = modelMinPxSize, 
-		cesiumColor      = stripCesiumColor(cesiumColor), 
+		cesiumColor      = cesiumColor, 
 		cesiumWeight     = cesiumWeight, 
 		cesiumStyle      = cesiumStyle, 
 		cesiumOpacity    = cesiumOpacity,
 		ganttColor       = ganttColor, 
 		popupText        = popupText,
 		dataProvider     = dataProvider, 
-		dataProviderArgs = dataProviderArgs)
+		dataProviderArgs = dataProviderArgs,
+		simplifyToleranceMeters = simplifyToleranceMeters)
 
-	# Capture the end time
-	endTimeSec = max(tmpShapepoints['endTimeSec'])
-
-	# Update the assignments dataframe:
-	assignmentsDF = pd.concat([assignmentsDF, tmpShapepoints], ignore_index=True, sort=False)
+	if (endTimeSec is None):
+		return (None, None)
 	
-	return (assignmentsDF, endTimeSec)
+	return (builder.toDataFrame(), endTimeSec)
 	
 
 def addAssignment3D(initAssignments=None, odID=1, objectID=None, modelFile=None, startTimeSec=0.0, startLoc=None, endLoc=None, takeoffSpeedMPS=None, cruiseSpeedMPS=None, landSpeedMPS=None, cruiseAltMetersAGL=None, routeType='square', climbRateMPS=None, descentRateMPS=None, earliestLandTime=-1, loiterPosition='arrivalAtAlt', leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'],  useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None):
@@ -694,27 +681,9 @@ def addAssignment3D(initAssignments=None, odID=1, objectID=None, modelFile=None,
 
 	"""	
 	
-	# validatation
-	[valFlag, errorMsg, warningMsg] = valAddAssignment3D(initAssignments, odID, objectID, modelFile, startTimeSec, startLoc, endLoc, takeoffSpeedMPS, cruiseSpeedMPS, landSpeedMPS, cruiseAltMetersAGL, routeType, climbRateMPS, descentRateMPS, earliestLandTime, loiterPosition, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor)
-	
-	if (not valFlag):
-		print (errorMsg)
-		return
-	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
-		print (warningMsg)
-
-	# Initialize an assignments dataframe:
-	assignmentsDF = privInitDataframe('assignments')
-
-	# if the user provided an initAssignments dataframe, add the new points after it
-	if (type(initAssignments) is pd.core.frame.DataFrame):
-		assignmentsDF = pd.concat([assignmentsDF, initAssignments], ignore_index=True, sort=False)
-
-		# Increase odID as necessary:
-		if (len(assignmentsDF) > 0):
-			odID = max(max(assignmentsDF['odID'])+1, odID)
-
-	tmpShapepoints = privGetShapepoints3D(
+	# The builder validates `initAssignments` and the new assignment
+	builder = AssignmentsBuilder(initAssignments)
+	endTimeSec = builder.add3D(
 		odID               = odID, 
 		objectID           = objectID, 
 		modelFile          = modelFile, 
@@ -739,20 +708,17 @@ def addAssignment3D(initAssignments=None, odID=1, objectID=None, modelFile=None,
 		useArrows          = useArrows, 
 		modelScale         = modelScale, 
 		modelMinPxSize     = modelMinPxSize, 
-		cesiumColor        = stripCesiumColor(cesiumColor), 
+		cesiumColor        = cesiumColor, 
 		cesiumWeight       = cesiumWeight, 
 		cesiumStyle        = cesiumStyle, 
 		cesiumOpacity      = cesiumOpacity,
 		ganttColor         = ganttColor, 
 		popupText          = popupText)
 
-	# Capture the end time
-	endTimeSec = max(tmpShapepoints['endTimeSec'])
-
-	# Update the assignments dataframe:
-	assignmentsDF = pd.concat([assignmentsDF, tmpShapepoints], ignore_index=True, sort=False)
+	if (endTimeSec is None):
+		return
 	
-	return (assignmentsDF, endTimeSec)
+	return (builder.toDataFrame(), endTimeSec)
 
 
 def addStaticAssignment(initAssignments=None, odID=1, objectID=None, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], loc=None, startTimeSec=None, endTimeSec=None, ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None):
@@ -854,22 +820,9 @@ def addStaticAssignment(initAssignments=None, odID=1, objectID=None, modelFile=N
 		...     problemDir  = 'static_object_demo')
 	"""
 
-	# validatation
-	[valFlag, errorMsg, warningMsg] = valAddStaticAssignment(initAssignments, odID, objectID, modelFile, modelScale, modelMinPxSize, loc, startTimeSec, endTimeSec, ganttColor)
-	if (not valFlag):
-		print (errorMsg)
-		return
-	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
-		print (warningMsg)
-
-	# if the user provided an initAssignments dataframe, add the new points after it
-	if (type(initAssignments) is pd.core.frame.DataFrame):
-		# Increase odID as necessary:
-		if (len(initAssignments) > 0):
-			odID = max(max(initAssignments['odID'])+1, odID)
-		
-	assignments = privAddStaticAssignment(
-		initAssignments = initAssignments, 
+	# The builder validates `initAssignments` and the new assignment
+	builder = AssignmentsBuilder(initAssignments)
+	valEndTimeSec = builder.addStatic(
 		odID            = odID, 
 		objectID        = objectID, 
 		modelFile       = modelFile, 
@@ -881,9 +834,12 @@ def addStaticAssignment(initAssignments=None, odID=1, objectID=None, modelFile=N
 		ganttColor      = ganttColor, 
 		popupText       = popupText)
 
-	return assignments
+	if (valEndTimeSec is None):
+		return
+
+	return builder.toDataFrame()
 	
-def createAssignmentsFromArcs2D(initAssignments=None, arcs=None, serviceTimeSec=0.0, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], startTimeSec=0.0, expDurationArgs=None, routeType='euclidean2D', speedMPS=None, leafletColor=None, leafletWeight=None, leafletStyle=None, leafletOpacity=None, leafletCurveType=None, leafletCurvature=None, useArrows=True, cesiumColor=None, cesiumWeight=None, cesiumStyle=None, cesiumOpacity=None, ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], ganttColorService=config['VRV_DEFAULT_GANTTCOLORSERVICE'], popupText=None, dataProvider=None, dataProviderArgs=None):
+def createAssignmentsFromArcs2D(initAssignments=None, arcs=None, serviceTimeSec=0.0, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], startTimeSec=0.0, expDurationArgs=None, routeType='euclidean2D', speedMPS=None, leafletColor=None, leafletWeight=None, leafletStyle=None, leafletOpacity=None, leafletCurveType=None, leafletCurvature=None, useArrows=True, cesiumColor=None, cesiumWeight=None, cesiumStyle=None, cesiumOpacity=None, ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], ganttColorService=config['VRV_DEFAULT_GANTTCOLORSERVICE'], popupText=None, dataProvider=None, dataProviderArgs=None, maxWorkers=1, simplifyToleranceMeters=None):
 	"""
 	This function generates an "assignments" dataframe containing all of the "shapepoints" between successive arcs, including timestamps indicating the departure and arrival times for each shapepoint. Shapepoints are pairs of GPS coordinates that are connected by straight lines.  For a particular origin and destination, numerous individual shapepoints can be combined to define a travel route along a road network.  
 
@@ -946,6 +902,10 @@ def createAssignmentsFromArcs2D(initAssignments=None, arcs=None, serviceTimeSec=
 		Specifies the data source to be used for obtaining the shapepoints. See :ref:`Data Providers` for options and requirements.
 	dataProviderArgs: dictionary, Conditional, default as None
 		For some data providers, additional parameters are required (e.g., API keys or database names). See :ref:`Data Providers` for the additional arguments required for each supported data provider.
+	maxWorkers: int, Optional, default as 1
+		The number of arcs whose shapepoints (and travel times, if requested by `expDurationArgs`) are requested from the data provider at the same time.  Values greater than 1 can make this function much faster for long sequences with road-network route types.  The resulting dataframe is the same in either case.
+	simplifyToleranceMeters: float, Optional, default as None
+		If provided, the route's shapepoints are simplified (using the Douglas-Peucker algorithm) so that no removed shapepoint is more than this many meters from the simplified route.  The total travel time and distance are unchanged.  Any extras returned by the data provider (e.g., wayname, surface, or steepness) are taken from the longest of the merged segments.
 
 	Return
 	------
@@ -989,7 +949,7 @@ def createAssignmentsFromArcs2D(initAssignments=None, arcs=None, serviceTimeSec=
 	"""
 	
 	# validatation
-	[valFlag, errorMsg, warningMsg] = valCreateAssignmentsFromArcs2D(initAssignments, arcs, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs)
+	[valFlag, errorMsg, warningMsg] = valCreateAssignmentsFromArcs2D(initAssignments, arcs, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs, maxWorkers, simplifyToleranceMeters)
 	
 	if (not valFlag):
 		print (errorMsg)
@@ -997,31 +957,9 @@ def createAssignmentsFromArcs2D(initAssignments=None, arcs=None, serviceTimeSec=
 	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
 		print (warningMsg)
 		
-	# Initialize an assignments dataframe:
-	assignmentsDF = privInitDataframe('assignments')
-
-	# if the user provided an initAssignments dataframe, add the new points after it
-	if (type(initAssignments) is pd.core.frame.DataFrame):
-		assignmentsDF = pd.concat([assignmentsDF, initAssignments], ignore_index=True, sort=False)
-
-	startTime = startTimeSec
-
-	for i in arcs.index:		
-		startLoc = [arcs['startLat'].at[i], arcs['startLon'].at[i]]
-		endLoc   = [arcs['endLat'].at[i], arcs['endLon'].at[i]]
-
-		if (expDurationArgs == None):
-			expDurationSec = None
-		elif ('getTravelTimes' in expDurationArgs):
-			if (expDurationArgs['getTravelTimes']):
-				# Call the data provider to get travel time
-				[dicTime, dicDist] = getTimeDistFromLocs2D(fromLocs=[startLoc], fromRows=[0], toLocs=[endLoc], toCols=[0], outputDistUnits='meters', outputTimeUnits='seconds', routeType=routeType, speedMPS=speedMPS, dataProvider=dataProvider, dataProviderArgs=dataProviderArgs)
-
-				[expDurationSec, distMeters] = [dicTime[0, 0], dicDist[0, 0]]
-
-		odID     = arcs['odID'].at[i]
-		objectID = arcs['objectID'].at[i]
-
+	# Collect the arcs, in order:
+	legs = []
+	for i in arcs.index:
 		leafletColor = leafletColor if (leafletColor is not None) else arcs['leafletColor'].at[i]		 
 		leafletWeight = leafletWeight if (leafletWeight is not None) else arcs['leafletWeight'].at[i]				
 		leafletStyle = leafletStyle if (leafletStyle is not None) else arcs['leafletStyle'].at[i]
@@ -1033,38 +971,67 @@ def createAssignmentsFromArcs2D(initAssignments=None, arcs=None, serviceTimeSec=
 		cesiumWeight = cesiumWeight if (cesiumWeight is not None) else arcs['cesiumWeight'].at[i]
 		cesiumStyle = cesiumStyle if (cesiumStyle is not None) else arcs['cesiumStyle'].at[i]
 		cesiumOpacity = cesiumOpacity if (cesiumOpacity is not None) else arcs['cesiumOpacity'].at[i]
-		
+
+		legs.append({
+			'startLoc'         : [arcs['startLat'].at[i], arcs['startLon'].at[i]],
+			'endLoc'           : [arcs['endLat'].at[i], arcs['endLon'].at[i]],
+			'odID'             : arcs['odID'].at[i],
+			'objectID'         : arcs['objectID'].at[i],
+			'leafletColor'     : leafletColor,
+			'leafletWeight'    : leafletWeight,
+			'leafletStyle'     : leafletStyle,
+			'leafletOpacity'   : leafletOpacity,
+			'leafletCurveType' : leafletCurveType,
+			'leafletCurvature' : leafletCurvature,
+			'useArrows'        : useArrows,
+			'cesiumColor'      : cesiumColor,
+			'cesiumWeight'     : cesiumWeight,
+			'cesiumStyle'      : cesiumStyle,
+			'cesiumOpacity'    : cesiumOpacity})
+
+	# Query the data provider for all of the arcs (up to `maxWorkers` at a time)
+	getTravelTimes = (expDurationArgs is not None and 'getTravelTimes' in expDurationArgs and expDurationArgs['getTravelTimes'])
+	[expDurationSecs, routes] = _getTravelTimesAndRoutes2D([leg['startLoc'] for leg in legs], [leg['endLoc'] for leg in legs], [None] * len(legs), getTravelTimes, routeType, speedMPS, dataProvider, dataProviderArgs, maxWorkers)
+
+	# Each arc starts when the previous arc (and its service) ends, so the times are assigned in order
+	newAssignments = []
+	startTime = startTimeSec
+
+	for i in range(0, len(legs)):
+		odID     = legs[i]['odID']
+		objectID = legs[i]['objectID']
+
 		tmpShapepoints = privGetShapepoints2D(
 			odID=odID, 
 			objectID=objectID, 
 			modelFile=modelFile, 
-			startLoc=startLoc, 
-			endLoc=endLoc, 
+			startLoc=legs[i]['startLoc'], 
+			endLoc=legs[i]['endLoc'], 
 			startTimeSec=startTime, 
-			expDurationSec=expDurationSec,
+			expDurationSec=expDurationSecs[i],
 			routeType=routeType, 
 			speedMPS=speedMPS,   
-			leafletColor=leafletColor, 
-			leafletWeight=leafletWeight, 
-			leafletStyle=leafletStyle, 
-			leafletOpacity=leafletOpacity, 
-			leafletCurveType=leafletCurveType, 
-			leafletCurvature=leafletCurvature, 
-			useArrows=useArrows, 
+			leafletColor=legs[i]['leafletColor'], 
+			leafletWeight=legs[i]['leafletWeight'], 
+			leafletStyle=legs[i]['leafletStyle'], 
+			leafletOpacity=legs[i]['leafletOpacity'], 
+			leafletCurveType=legs[i]['leafletCurveType'], 
+			leafletCurvature=legs[i]['leafletCurvature'], 
+			useArrows=legs[i]['useArrows'], 
 			modelScale=modelScale, 
 			modelMinPxSize=modelMinPxSize, 
-			cesiumColor=stripCesiumColor(cesiumColor), 
-			cesiumWeight=cesiumWeight, 
-			cesiumStyle=cesiumStyle, 
-			cesiumOpacity=cesiumOpacity,
+			cesiumColor=stripCesiumColor(legs[i]['cesiumColor']), 
+			cesiumWeight=legs[i]['cesiumWeight'], 
+			cesiumStyle=legs[i]['cesiumStyle'], 
+			cesiumOpacity=legs[i]['cesiumOpacity'],
 			ganttColor=ganttColor,
 			popupText=popupText,
 			dataProvider=dataProvider, 
-			dataProviderArgs=dataProviderArgs)
+			dataProviderArgs=dataProviderArgs,
+			route=routes[i],
+			simplifyToleranceMeters=simplifyToleranceMeters)
 
-
-		# Update the assignments dataframe:
-		assignmentsDF = pd.concat([assignmentsDF, tmpShapepoints], ignore_index=True, sort=False)
+		newAssignments.append(tmpShapepoints)
 
 		odID += 1
 
@@ -1073,28 +1040,30 @@ def createAssignmentsFromArcs2D(initAssignments=None, arcs=None, serviceTimeSec=
 	
 		if (serviceTimeSec > 0):
 			# Add loitering for service
-			assignmentsDF = privAddStaticAssignment(
-				initAssignments = assignmentsDF, 
+			newAssignments.append(privAddStaticAssignment(
+				initAssignments = None, 
 				odID            = odID, 
 				objectID        = objectID, 
 				modelFile       = modelFile, 
 				modelScale      = modelScale, 
 				modelMinPxSize  = modelMinPxSize, 
-				loc             = endLoc,
+				loc             = legs[i]['endLoc'],
 				startTimeSec    = startTime,
 				endTimeSec      = startTime + serviceTimeSec,
 				ganttColor      = ganttColorService, 
-				popupText       = popupText)
+				popupText       = popupText))
 
 			odID += 1
 
 			# Update the time again
 			startTime = startTime + serviceTimeSec
 
-    			
+	# Build the assignments dataframe (after the initAssignments dataframe, if provided):
+	assignmentsDF = _concatAssignments(initAssignments, newAssignments)
+
 	return assignmentsDF
 
-def createAssignmentsFromNodeSeq2D(initAssignments=None, nodeSeq=None, nodes=None, serviceTimeSec=0.0, odID=1, objectID=None, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], startTimeSec=0.0, expDurationArgs=None, routeType='euclidean2D', speedMPS=None,   leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], ganttColorService=config['VRV_DEFAULT_GANTTCOLORSERVICE'], popupText=None, dataProvider=None, dataProviderArgs=None):
+def createAssignmentsFromNodeSeq2D(initAssignments=None, nodeSeq=None, nodes=None, serviceTimeSec=0.0, odID=1, objectID=None, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], startTimeSec=0.0, expDurationArgs=None, routeType='euclidean2D', speedMPS=None,   leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], ganttColorService=config['VRV_DEFAULT_GANTTCOLORSERVICE'], popupText=None, dataProvider=None, dataProviderArgs=None, maxWorkers=1, simplifyToleranceMeters=None):
 	"""
 	This function generates an "assignments" dataframe containing all of the "shapepoints" between successive node locations, including timestamps indicating the departure and arrival times for each shapepoint. Shapepoints are pairs of GPS coordinates that are connected by straight lines.  For a particular origin and destination, numerous individual shapepoints can be combined to define a travel route along a road network.  
 
@@ -1164,6 +1133,10 @@ def createAssignmentsFromNodeSeq2D(initAssignments=None, nodeSeq=None, nodes=Non
 		Specifies the data source to be used for obtaining the shapepoints. See :ref:`Data Providers` for options and requirements.
 	dataProviderArgs: dictionary, Conditional, default as None
 		For some data providers, additional parameters are required (e.g., API keys or database names). See :ref:`Data Providers` for the additional arguments required for each supported data provider.
+	maxWorkers: int, Optional, default as 1
+		The number of origin/destination pairs whose shapepoints (and travel times, if requested by `expDurationArgs`) are requested from the data provider at the same time.  Values greater than 1 can make this function much faster for long sequences with road-network route types.  The resulting dataframe is the same in either case.
+	simplifyToleranceMeters: float, Optional, default as None
+		If provided, the route's shapepoints are simplified (using the Douglas-Peucker algorithm) so that no removed shapepoint is more than this many meters from the simplified route.  The total travel time and distance are unchanged.  Any extras returned by the data provider (e.g., wayname, surface, or steepness) are taken from the longest of the merged segments.
 
 	Returns
 	-------
@@ -1278,7 +1251,7 @@ def createAssignmentsFromNodeSeq2D(initAssignments=None, nodeSeq=None, nodes=Non
 	"""	
 	
 	# validatation
-	[valFlag, errorMsg, warningMsg] = valCreateAssignmentsFromNodeSeq2D(initAssignments, nodeSeq, nodes, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs)
+	[valFlag, errorMsg, warningMsg] = valCreateAssignmentsFromNodeSeq2D(initAssignments, nodeSeq, nodes, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs, maxWorkers, simplifyToleranceMeters)
 	
 	if (not valFlag):
 		print (errorMsg)
@@ -1286,45 +1259,39 @@ def createAssignmentsFromNodeSeq2D(initAssignments=None, nodeSeq=None, nodes=Non
 	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
 		print (warningMsg)
 		
-	# Initialize an assignments dataframe:
-	assignmentsDF = privInitDataframe('assignments')
-
-	# if the user provided an initAssignments dataframe, add the new points after it
+	# if the user provided an initAssignments dataframe, the new points will be added after it
 	if (type(initAssignments) is pd.core.frame.DataFrame):
-		assignmentsDF = pd.concat([assignmentsDF, initAssignments], ignore_index=True, sort=False)
-
 		# Increase odID as necessary:
-		if (len(assignmentsDF) > 0):
-			odID = max(max(assignmentsDF['odID'])+1, odID)
+		if (len(initAssignments) > 0):
+			odID = max(max(initAssignments['odID'])+1, odID)
 
+	seqLocs = privGetNodeLocs(nodes, nodeSeq)
+	startLocs = seqLocs[:-1]
+	endLocs = seqLocs[1:]
+
+	if (expDurationArgs is not None and 'timeSecDict' in expDurationArgs):
+		# The user has provided a time dictionary
+		expDurationSecs = [expDurationArgs['timeSecDict'][nodeSeq[i], nodeSeq[i+1]] for i in range(0, len(nodeSeq)-1)]
+	else:
+		expDurationSecs = [None] * (len(nodeSeq) - 1)
+
+	# Query the data provider for all of the origin/destination pairs (up to `maxWorkers` at a time)
+	getTravelTimes = (expDurationArgs is not None and 'timeSecDict' not in expDurationArgs and 'getTravelTimes' in expDurationArgs and expDurationArgs['getTravelTimes'])
+	[expDurationSecs, routes] = _getTravelTimesAndRoutes2D(startLocs, endLocs, expDurationSecs, getTravelTimes, routeType, speedMPS, dataProvider, dataProviderArgs, maxWorkers)
+
+	# Each leg starts when the previous leg (and its service) ends, so the times are assigned in order
+	newAssignments = []
 	startTime = startTimeSec
 
 	for i in range(0, len(nodeSeq)-1):
-		startLoc = [nodes.loc[nodes['id'] == nodeSeq[i]]['lat'].values[0],
-					nodes.loc[nodes['id'] == nodeSeq[i]]['lon'].values[0]]
-		endLoc   = [nodes.loc[nodes['id'] == nodeSeq[i+1]]['lat'].values[0],
-					nodes.loc[nodes['id'] == nodeSeq[i+1]]['lon'].values[0]]
-
-		if (expDurationArgs == None):
-			expDurationSec = None
-		elif ('timeSecDict' in expDurationArgs):
-			# The user has provided a time dictionary
-			expDurationSec = expDurationArgs['timeSecDict'][nodeSeq[i], nodeSeq[i+1]]	
-		elif ('getTravelTimes' in expDurationArgs):
-			if (expDurationArgs['getTravelTimes']):
-				# Call the data provider to get travel time
-				[dicTime, dicDist] = getTimeDistFromLocs2D(fromLocs=[startLoc], fromRows=[0], toLocs=[endLoc], toCols=[0], outputDistUnits='meters', outputTimeUnits='seconds', routeType=routeType, speedMPS=speedMPS, dataProvider=dataProvider, dataProviderArgs=dataProviderArgs)
-
-				[expDurationSec, distMeters] = [dicTime[0, 0], dicDist[0, 0]]
-
 		tmpShapepoints = privGetShapepoints2D(
 			odID=odID, 
 			objectID=objectID, 
 			modelFile=modelFile, 
-			startLoc=startLoc, 
-			endLoc=endLoc, 
+			startLoc=startLocs[i], 
+			endLoc=endLocs[i], 
 			startTimeSec=startTime, 
-			expDurationSec=expDurationSec,
+			expDurationSec=expDurationSecs[i],
 			routeType=routeType, 
 			speedMPS=speedMPS,   
 			leafletColor=leafletColor, 
@@ -1343,10 +1310,11 @@ def createAssignmentsFromNodeSeq2D(initAssignments=None, nodeSeq=None, nodes=Non
 			ganttColor=ganttColor, 
 			popupText=popupText,
 			dataProvider=dataProvider, 
-			dataProviderArgs=dataProviderArgs)
+			dataProviderArgs=dataProviderArgs,
+			route=routes[i],
+			simplifyToleranceMeters=simplifyToleranceMeters)
 
-		# Update the assignments dataframe:
-		assignmentsDF = pd.concat([assignmentsDF, tmpShapepoints], ignore_index=True, sort=False)
+		newAssignments.append(tmpShapepoints)
 
 		odID += 1
 
@@ -1355,30 +1323,32 @@ def createAssignmentsFromNodeSeq2D(initAssignments=None, nodeSeq=None, nodes=Non
 	
 		if (serviceTimeSec > 0):
 			# Add loitering for service
-			assignmentsDF = privAddStaticAssignment(
-				initAssignments = assignmentsDF, 
+			newAssignments.append(privAddStaticAssignment(
+				initAssignments = None, 
 				odID            = odID, 
 				objectID        = objectID, 
 				modelFile       = modelFile, 
 				modelScale      = modelScale, 
 				modelMinPxSize  = modelMinPxSize, 
-				loc             = endLoc,
+				loc             = endLocs[i],
 				startTimeSec    = startTime,
 				endTimeSec      = startTime + serviceTimeSec,
 				ganttColor      = ganttColorService,
-				popupText       = popupText)
+				popupText       = popupText))
 
 			odID += 1
 
 			# Update the time again
 			startTime = startTime + serviceTimeSec
 
-    			
+	# Build the assignments dataframe (after the initAssignments dataframe, if provided):
+	assignmentsDF = _concatAssignments(initAssignments, newAssignments)
+
 	return assignmentsDF		
 	
 	
 
-def createAssignmentsFromLocSeq2D(initAssignments=None, locSeq=None, serviceTimeSec=0.0, odID=1, objectID=None, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], startTimeSec=0.0, expDurationArgs=None, routeType='euclidean2D', speedMPS=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], ganttColorService=config['VRV_DEFAULT_GANTTCOLORSERVICE'], popupText=None, dataProvider=None, dataProviderArgs=None):
+def createAssignmentsFromLocSeq2D(initAssignments=None, locSeq=None, serviceTimeSec=0.0, odID=1, objectID=None, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], startTimeSec=0.0, expDurationArgs=None, routeType='euclidean2D', speedMPS=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], ganttColorService=config['VRV_DEFAULT_GANTTCOLORSERVICE'], popupText=None, dataProvider=None, dataProviderArgs=None, maxWorkers=1, simplifyToleranceMeters=None):
 	"""
 	This function generates an "assignments" dataframe containing all of the "shapepoints" between successive locations, including timestamps indicating the departure and arrival times for each shapepoint. Shapepoints are pairs of GPS coordinates that are connected by straight lines.  For a particular origin and destination, numerous individual shapepoints can be combined to define a travel route along a road network.  
 
@@ -1446,6 +1416,10 @@ def createAssignmentsFromLocSeq2D(initAssignments=None, locSeq=None, serviceTime
 		Specifies the data source to be used for obtaining the shapepoints. See :ref:`Data Providers` for options and requirements.
 	dataProviderArgs: dictionary, Conditional, default as None
 		For some data providers, additional parameters are required (e.g., API keys or database names). See :ref:`Data Providers` for the additional arguments required for each supported data provider.
+	maxWorkers: int, Optional, default as 1
+		The number of origin/destination pairs whose shapepoints (and travel times, if requested by `expDurationArgs`) are requested from the data provider at the same time.  Values greater than 1 can make this function much faster for long sequences with road-network route types.  The resulting dataframe is the same in either case.
+	simplifyToleranceMeters: float, Optional, default as None
+		If provided, the route's shapepoints are simplified (using the Douglas-Peucker algorithm) so that no removed shapepoint is more than this many meters from the simplified route.  The total travel time and distance are unchanged.  Any extras returned by the data provider (e.g., wayname, surface, or steepness) are taken from the longest of the merged segments.
 
 	Returns
 	-------
@@ -1539,7 +1513,7 @@ def createAssignmentsFromLocSeq2D(initAssignments=None, locSeq=None, serviceTime
 	"""	
 	
 	# validatation
-	[valFlag, errorMsg, warningMsg] = valCreateAssignmentsFromLocSeq2D(initAssignments, locSeq, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs)
+	[valFlag, errorMsg, warningMsg] = valCreateAssignmentsFromLocSeq2D(initAssignments, locSeq, serviceTimeSec, modelScale, modelMinPxSize, expDurationArgs, odID, objectID, modelFile, startTimeSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, ganttColorService, dataProvider, dataProviderArgs, maxWorkers, simplifyToleranceMeters)
 	
 	if (not valFlag):
 		print (errorMsg)
@@ -1547,40 +1521,32 @@ def createAssignmentsFromLocSeq2D(initAssignments=None, locSeq=None, serviceTime
 	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
 		print (warningMsg)
 		
-	# Initialize an assignments dataframe:
-	assignmentsDF = privInitDataframe('assignments')
-
-	# if the user provided an initAssignments dataframe, add the new points after it
+	# if the user provided an initAssignments dataframe, the new points will be added after it
 	if (type(initAssignments) is pd.core.frame.DataFrame):
-		assignmentsDF = pd.concat([assignmentsDF, initAssignments], ignore_index=True, sort=False)
-
 		# Increase odID as necessary:
-		if (len(assignmentsDF) > 0):
-			odID = max(max(assignmentsDF['odID'])+1, odID)
-
-	startTime = startTimeSec
+		if (len(initAssignments) > 0):
+			odID = max(max(initAssignments['odID'])+1, odID)
 
-	for i in range(0, len(locSeq)-1):
-		startLoc = locSeq[i]
-		endLoc   = locSeq[i+1]
+	startLocs = locSeq[:-1]
+	endLocs = locSeq[1:]
 
-		if (expDurationArgs == None):
-			expDurationSec = None
-		elif ('getTravelTimes' in expDurationArgs):
-			if (expDurationArgs['getTravelTimes']):
-				# Call the data provider to get travel time
-				[dicTime, dicDist] = getTimeDistFromLocs2D(fromLocs=[startLoc], fromRows=[0], toLocs=[endLoc], toCols=[0], outputDistUnits='meters', outputTimeUnits='seconds', routeType=routeType, speedMPS=speedMPS, dataProvider=dataProvider, dataProviderArgs=dataProviderArgs)
+	# Query the data provider for all of the origin/destination pairs (up to `maxWorkers` at a time)
+	getTravelTimes = (expDurationArgs is not None and 'getTravelTimes' in expDurationArgs and expDurationArgs['getTravelTimes'])
+	[expDurationSecs, routes] = _getTravelTimesAndRoutes2D(startLocs, endLocs, [None] * len(startLocs), getTravelTimes, routeType, speedMPS, dataProvider, dataProviderArgs, maxWorkers)
 
-				[expDurationSec, distMeters] = [dicTime[0, 0], dicDist[0, 0]]
+	# Each leg starts when the previous leg (and its service) ends, so the times are assigned in order
+	newAssignments = []
+	startTime = startTimeSec
 
+	for i in range(0, len(locSeq)-1):
 		tmpShapepoints = privGetShapepoints2D(
 			odID=odID, 
 			objectID=objectID, 
 			modelFile=modelFile, 
-			startLoc=startLoc, 
-			endLoc=endLoc, 
+			startLoc=startLocs[i], 
+			endLoc=endLocs[i], 
 			startTimeSec=startTime, 
-			expDurationSec=expDurationSec,
+			expDurationSec=expDurationSecs[i],
 			routeType=routeType, 
 			speedMPS=speedMPS,   
 			leafletColor=leafletColor, 
@@ -1599,11 +1565,11 @@ def createAssignmentsFromLocSeq2D(initAssignments=None, locSeq=None, serviceTime
 			ganttColor=ganttColor, 
 			popupText=popupText,
 			dataProvider=dataProvider, 
-			dataProviderArgs=dataProviderArgs)
+			dataProviderArgs=dataProviderArgs,
+			route=routes[i],
+			simplifyToleranceMeters=simplifyToleranceMeters)
 
-
-		# Update the assignments dataframe:
-		assignmentsDF = pd.concat([assignmentsDF, tmpShapepoints], ignore_index=True, sort=False)
+		newAssignments.append(tmpShapepoints)
 
 		odID += 1
 
@@ -1612,23 +1578,319 @@ def createAssignmentsFromLocSeq2D(initAssignments=None, locSeq=None, serviceTime
 	
 		if (serviceTimeSec > 0):
 			# Add loitering for service
-			assignmentsDF = privAddStaticAssignment(
-				initAssignments = assignmentsDF, 
+			newAssignments.append(privAddStaticAssignment(
+				initAssignments = None, 
 				odID            = odID, 
 				objectID        = objectID, 
 				modelFile       = modelFile, 
 				modelScale      = modelScale, 
 				modelMinPxSize  = modelMinPxSize, 
-				loc             = endLoc,
+				loc             = endLocs[i],
 				startTimeSec    = startTime,
 				endTimeSec      = startTime + serviceTimeSec,
 				ganttColor      = ganttColorService,
-				popupText       = popupText)
+				popupText       = popupText))
 
 			odID += 1
 
 			# Update the time again
 			startTime = startTime + serviceTimeSec
 
-    			
-	return assignmentsDF		
\ No newline at end of file
+	# Build the assignments dataframe (after the initAssignments dataframe, if provided):
+	assignmentsDF = _concatAssignments(initAssignments, newAssignments)
+
+	return assignmentsDF
+
+
+def _getTravelTimesAndRoutes2D(startLocs, endLocs, expDurationSecs, getTravelTimes, routeType, speedMPS, dataProvider, dataProviderArgs, maxWorkers):
+	"""
+	Returns `[expDurationSecs, routes]` for the legs from `startLocs[i]` to `endLocs[i]`.  If `getTravelTimes` is True, the given `expDurationSecs` are replaced by travel times from the data provider.  `routes[i]` is the route to pass to `privGetShapepoints2D()` (None if the start and end locations are the same).  Up to `maxWorkers` legs are requested from the data provider at a time.
+	"""
+
+	legs = list(range(0, len(startLocs)))
+
+	if (getTravelTimes):
+		# Call the data provider to get travel time
+		def _getTravelTime(i):
+			[dicTime, dicDist] = getTimeDistFromLocs2D(fromLocs=[startLocs[i]], fromRows=[0], toLocs=[endLocs[i]], toCols=[0], outputDistUnits='meters', outputTimeUnits='seconds', routeType=routeType, speedMPS=speedMPS, dataProvider=dataProvider, dataProviderArgs=dataProviderArgs)
+			return dicTime[0, 0]
+		expDurationSecs = privMapConcurrent(_getTravelTime, legs, maxWorkers)
+
+	def _getRoute(i):
+		if (startLocs[i] == endLocs[i]):
+			return None
+		return privGetRoute2D(startLocs[i], endLocs[i], routeType, speedMPS, expDurationSecs[i], dataProvider, dataProviderArgs)
+	routes = privMapConcurrent(_getRoute, legs, maxWorkers)
+
+	return [expDurationSecs, routes]
+
+def _concatAssignments(initAssignments, newAssignments):
+	# Combine the initial assignments (if any) and a list of new assignments dataframes, with a single concat
+	assignmentsList = [privInitDataframe('assignments')]
+	if (type(initAssignments) is pd.core.frame.DataFrame):
+		assignmentsList.append(initAssignments)
+	assignmentsList.extend(newAssignments)
+
+	return privSetColumnTypes(pd.concat(assignmentsList, ignore_index=True, sort=False), 'Assignments')
+
+
+class AssignmentsBuilder(object):
+	"""
+	Builds an :ref:`Assignments` dataframe from many individual assignments.  Calling `addAssignment2D()`, `addAssignment3D()`, or `addStaticAssignment()` in a loop (passing each result back in as `initAssignments`) copies the whole dataframe on every call, so the time to build a large schedule grows with the square of its length.  An `AssignmentsBuilder` instead keeps the new rows in column lists, and creates the dataframe once, when `toDataFrame()` is called.
+
+	The `add2D()`, `add3D()`, and `addStatic()` methods accept the same arguments as `addAssignment2D()`, `addAssignment3D()`, and `addStaticAssignment()` (except `initAssignments`).  As with those functions, `odID` is increased as necessary, so that it is larger than any `odID` already in the builder.
+
+	Parameters
+	----------
+	initAssignments: :ref:`Assignments` dataframe, Optional, default as None
+		If provided, the new assignments will be appended to this dataframe.
+
+	Example
+	-------
+	Build a schedule for a truck visiting a sequence of locations:
+		>>> import veroviz as vrv
+		>>> locs = [[42.8871085, -78.8731949],
+		...         [42.8888311, -78.8649649],
+		...         [42.8802158, -78.8660787],
+		...         [42.8845705, -78.8762794]]
+		>>> builder = vrv.AssignmentsBuilder()
+		>>> endTimeSec = 0.0
+		>>> for i in range(1, len(locs)):
+		...     endTimeSec = builder.add2D(
+		...         objectID     = 'truck', 
+		...         modelFile    = 'veroviz/models/ub_truck.gltf', 
+		...         startLoc     = locs[i-1], 
+		...         endLoc       = locs[i], 
+		...         startTimeSec = endTimeSec, 
+		...         routeType    = 'euclidean2D', 
+		...         speedMPS     = 10)
+		...     builder.addStatic(
+		...         objectID     = 'truck', 
+		...         modelFile    = 'veroviz/models/ub_truck.gltf', 
+		...         loc          = locs[i], 
+		...         startTimeSec = endTimeSec, 
+		...         endTimeSec   = endTimeSec + 30)
+		...     endTimeSec = builder.getEndTimeSec('truck')
+		>>> myAssignments = builder.toDataFrame()
+	"""
+
+	def __init__(self, initAssignments=None):
+		self._initAssignments = None
+		self._errorMsg = None
+		self._columns = {column: [] for column in assignmentsColumnList}
+		self._maxOdID = None
+		self._endTimeSec = {}
+
+		if (initAssignments is not None):
+			[valFlag, errorMsg, warningMsg] = valAssignments(initAssignments)
+			if (not valFlag):
+				# Every later call fails (returns None) with this message
+				self._errorMsg = errorMsg
+				print (errorMsg)
+				return
+			elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
+				print (warningMsg)
+
+			self._initAssignments = initAssignments
+			if (len(initAssignments) > 0):
+				self._maxOdID = max(initAssignments['odID'])
+				for objectID, endTimeSec in initAssignments.groupby('objectID', sort=False, dropna=False)['endTimeSec'].max().items():
+					self._endTimeSec[None if pd.isnull(objectID) else objectID] = endTimeSec
+
+	def __len__(self):
+		numRows = len(self._columns['odID'])
+		if (self._initAssignments is not None):
+			numRows += len(self._initAssignments)
+
+		return numRows
+
+	def _getOdID(self, odID):
+		# Increase odID as necessary:
+		if (self._maxOdID is not None):
+			odID = max(self._maxOdID + 1, odID)
+
+		return odID
+
+	def _append(self, assignments, objectID):
+		for column in assignmentsColumnList:
+			self._columns[column].extend(assignments[column].tolist())
+
+		if (len(assignments) > 0):
+			maxOdID = max(assignments['odID'])
+			self._maxOdID = maxOdID if (self._maxOdID is None) else max(self._maxOdID, maxOdID)
+
+			endTimeSec = max(assignments['endTimeSec'])
+			if (objectID in self._endTimeSec):
+				endTimeSec = max(self._endTimeSec[objectID], endTimeSec)
+			self._endTimeSec[objectID] = endTimeSec
+
+	def add2D(self, odID=1, objectID=None, modelFile=None, startLoc=None, endLoc=None, startTimeSec=0.0, expDurationSec=None, routeType='euclidean2D', speedMPS=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None, dataProvider=None, dataProviderArgs=None, simplifyToleranceMeters=None):
+		"""
+		Adds the shapepoints between `startLoc` and `endLoc`.  See `addAssignment2D()` for a description of the arguments.
+
+		Returns
+		-------
+		float
+			The time, in seconds, at which the end location is reached (None if the arguments are invalid).
+		"""
+
+		if (self._errorMsg is not None):
+			print (self._errorMsg)
+			return
+
+		[valFlag, errorMsg, warningMsg] = valAddAssignment2D(None, odID, objectID, modelFile, startLoc, endLoc, startTimeSec, expDurationSec, routeType, speedMPS, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor, dataProvider, dataProviderArgs, simplifyToleranceMeters)
+		if (not valFlag):
+			print (errorMsg)
+			return
+		elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
+			print (warningMsg)
+
+		tmpShapepoints = privGetShapepoints2D(
+			odID             = self._getOdID(odID), 
+			objectID         = objectID, 
+			modelFile        = modelFile, 
+			startLoc         = startLoc, 
+			endLoc           = endLoc, 
+			startTimeSec     = startTimeSec, 
+			expDurationSec   = expDurationSec,
+			routeType        = routeType, 
+			speedMPS         = speedMPS,   
+			leafletColor     = leafletColor, 
+			leafletWeight    = leafletWeight, 
+			leafletStyle     = leafletStyle, 
+			leafletOpacity   = leafletOpacity, 
+			leafletCurveType = leafletCurveType, 
+			leafletCurvature = leafletCurvature,		
+			useArrows        = useArrows, 
+			modelScale       = modelScale, 
+			modelMinPxSize   = modelMinPxSize, 
+			cesiumColor      = stripCesiumColor(cesiumColor), 
+			cesiumWeight     = cesiumWeight, 
+			cesiumStyle      = cesiumStyle, 
+			cesiumOpacity    = cesiumOpacity,
+			ganttColor       = ganttColor, 
+			popupText        = popupText,
+			dataProvider     = dataProvider, 
+			dataProviderArgs = dataProviderArgs,
+			simplifyToleranceMeters = simplifyToleranceMeters)
+
+		self._append(tmpShapepoints, objectID)
+
+		return max(tmpShapepoints['endTimeSec'])
+
+	def add3D(self, odID=1, objectID=None, modelFile=None, startTimeSec=0.0, startLoc=None, endLoc=None, takeoffSpeedMPS=None, cruiseSpeedMPS=None, landSpeedMPS=None, cruiseAltMetersAGL=None, routeType='square', climbRateMPS=None, descentRateMPS=None, earliestLandTime=-1, loiterPosition='arrivalAtAlt', leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None):
+		"""
+		Adds the flight path between `startLoc` and `endLoc`.  See `addAssignment3D()` for a description of the arguments.
+
+		Returns
+		-------
+		float
+			The time, in seconds, at which the end location is reached (None if the arguments are invalid).
+		"""
+
+		if (self._errorMsg is not None):
+			print (self._errorMsg)
+			return
+
+		[valFlag, errorMsg, warningMsg] = valAddAssignment3D(None, odID, objectID, modelFile, startTimeSec, startLoc, endLoc, takeoffSpeedMPS, cruiseSpeedMPS, landSpeedMPS, cruiseAltMetersAGL, routeType, climbRateMPS, descentRateMPS, earliestLandTime, loiterPosition, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, ganttColor)
+		if (not valFlag):
+			print (errorMsg)
+			return
+		elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
+			print (warningMsg)
+
+		tmpShapepoints = privGetShapepoints3D(
+			odID               = self._getOdID(odID), 
+			objectID           = objectID, 
+			modelFile          = modelFile, 
+			startTimeSec       = startTimeSec, 
+			startLoc           = startLoc, 
+			endLoc             = endLoc, 
+			takeoffSpeedMPS    = takeoffSpeedMPS, 
+			cruiseSpeedMPS     = cruiseSpeedMPS, 
+			landSpeedMPS       = landSpeedMPS, 
+			cruiseAltMetersAGL = cruiseAltMetersAGL, 
+			routeType          = routeType, 
+			climbRateMPS       = climbRateMPS, 
+			descentRateMPS     = descentRateMPS, 
+			earliestLandTime   = earliestLandTime, 
+			loiterPosition     = loiterPosition, 
+			leafletColor       = leafletColor, 
+			leafletWeight      = leafletWeight, 
+			leafletStyle       = leafletStyle, 
+			leafletOpacity     = leafletOpacity, 
+			leafletCurveType   = leafletCurveType, 
+			leafletCurvature   = leafletCurvature, 
+			useArrows          = useArrows, 
+			modelScale         = modelScale, 
+			modelMinPxSize     = modelMinPxSize, 
+			cesiumColor        = stripCesiumColor(cesiumColor), 
+			cesiumWeight       = cesiumWeight, 
+			cesiumStyle        = cesiumStyle, 
+			cesiumOpacity      = cesiumOpacity,
+			ganttColor         = ganttColor, 
+			popupText          = popupText)
+
+		self._append(tmpShapepoints, objectID)
+
+		return max(tmpShapepoints['endTimeSec'])
+
+	def addStatic(self, odID=1, objectID=None, modelFile=None, modelScale=config['VRV_DEFAULT_CESIUMMODELSCALE'], modelMinPxSize=config['VRV_DEFAULT_CESIUMMODELMINPXSIZE'], loc=None, startTimeSec=None, endTimeSec=None, ganttColor=config['VRV_DEFAULT_GANTTCOLOR'], popupText=None):
+		"""
+		Adds a stationary object (or a vehicle waiting at a location).  See `addStaticAssignment()` for a description of the arguments.
+
+		Returns
+		-------
+		float
+			`endTimeSec` (None if the arguments are invalid).
+		"""
+
+		if (self._errorMsg is not None):
+			print (self._errorMsg)
+			return
+
+		[valFlag, errorMsg, warningMsg] = valAddStaticAssignment(None, odID, objectID, modelFile, modelScale, modelMinPxSize, loc, startTimeSec, endTimeSec, ganttColor)
+		if (not valFlag):
+			print (errorMsg)
+			return
+		elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
+			print (warningMsg)
+
+		assignments = privAddStaticAssignment(
+			initAssignments = None, 
+			odID            = self._getOdID(odID), 
+			objectID        = objectID, 
+			modelFile       = modelFile, 
+			modelScale      = modelScale, 
+			modelMinPxSize  = modelMinPxSize, 
+			loc             = loc, 
+			startTimeSec    = startTimeSec, 
+			endTimeSec      = endTimeSec, 
+			ganttColor      = ganttColor, 
+			popupText       = popupText)
+
+		self._append(assignments, objectID)
+
+		return endTimeSec
+
+	def getEndTimeSec(self, objectID=None):
+		"""
+		Returns the latest `endTimeSec` of the assignments for `objectID` (None if there aren't any).  This is typically the time at which that object is free to start its next assignment.
+		"""
+
+		return self._endTimeSec[objectID] if (objectID in self._endTimeSec) else None
+
+	def toDataFrame(self):
+		"""
+		Returns an :ref:`Assignments` dataframe with all of the assignments (including `initAssignments`).  The builder may be used afterwards; later assignments are included the next time this is called.
+		"""
+
+		if (self._errorMsg is not None):
+			print (self._errorMsg)
+			return
+
+		assignmentsDF = privInitDataframe('assignments', self._columns)
+		if (self._initAssignments is not None):
+			assignmentsDF = privSetColumnTypes(pd.concat([privInitDataframe('assignments'), self._initAssignments, assignmentsDF], ignore_index=True, sort=False), 'Assignments')
+
+		return assignmentsDF
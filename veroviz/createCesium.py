@@ -338,7 +338,7 @@ def _writeNodes(nodes, cesiumIconColor, fullDir):
 			jsStr += "    pin[%s] = viewer.entities.add({\n" % (i)
 			jsStr += "        name : '%s',\n" % (tmpIconText)
 			jsStr += "        parent : nodePins,\n"
-			if (popupText is not None):
+			if (not pd.isnull(popupText)):
 				jsStr += "        description : '%s',\n" % (str(popupText).replace("'", r"\'"))	
 			jsStr += "        position : Cesium.Cartesian3.fromDegrees(%s, %s),\n" % (indNodes.iloc[i]['lon'], indNodes.iloc[i]['lat'])
 			jsStr += "        billboard : {\n"
@@ -618,7 +618,8 @@ def _writeAssignmentsJS(lstSubAssignments, cesiumColor, cesiumWeight, cesiumStyl
 		elif (style == 'solid'):
 			dashLength = 0
 
-		popupText = str(lstSubAssignments[i].iloc[0]['popupText']).replace("'", r"\'")
+		popupText = lstSubAssignments[i].iloc[0]['popupText']
+		popupText = str(popupText).replace("'", r"\'") if (not pd.isnull(popupText)) else None
 		tmpObjectID = str(lstSubAssignments[i].iloc[0]['objectID']).replace("'", r"")
 		
 		if (assignmentDimension == 3):
@@ -418,8 +418,10 @@ def _createLeafletNodes(mapObject=None, nodes=None, iconPrefix=None, iconType=No
 def _drawLeafletNode(mapObject, loc, popupText, iconPrefix, iconType, iconColor, iconText):
 	
 	# Format popup text
-	if (popupText is not None):
+	if (not pd.isnull(popupText)):
 		popupText = str(popupText)
+	else:
+		popupText = None
 
 	if (iconPrefix in ['fa', 'glyphicon']):
 		# Folium draw nodes
@@ -668,7 +670,7 @@ def _createLeafletArcs(mapObject=None, arcs=None, arcWeight=None, arcOpacity=Non
 
 		for j in range(1, len(arcPath)):
 			# Format popup text
-			if (lstPath[i]['popupText'][j-1] is not None):
+			if (not pd.isnull(lstPath[i]['popupText'][j-1])):
 				popupText = str(lstPath[i]['popupText'][j-1])
 			else:
 				popupText = None	
@@ -3,6 +3,7 @@ from veroviz._validation import valCreateArcsFromLocSeq
 from veroviz._validation import valCreateArcsFromNodeSeq
 
 from veroviz._createEntitiesFromList import privCreateArcsFromLocSeq
+from veroviz._nodeIndex import privGetNodeLocs
 
 def createArcsFromLocSeq(locSeq=None, initArcs=None, startArc=1, objectID=None, leafletColor=config['VRV_DEFAULT_LEAFLETARCCOLOR'], leafletWeight=config['VRV_DEFAULT_LEAFLETARCWEIGHT'], leafletStyle=config['VRV_DEFAULT_LEAFLETARCSTYLE'], leafletOpacity=config['VRV_DEFAULT_LEAFLETARCOPACITY'], leafletCurveType=config['VRV_DEFAULT_ARCCURVETYPE'], leafletCurvature=config['VRV_DEFAULT_ARCCURVATURE'], useArrows=True, cesiumColor=config['VRV_DEFAULT_CESIUMPATHCOLOR'], cesiumWeight=config['VRV_DEFAULT_CESIUMPATHWEIGHT'], cesiumStyle=config['VRV_DEFAULT_CESIUMPATHSTYLE'], cesiumOpacity=config['VRV_DEFAULT_CESIUMPATHOPACITY'], popupText=None):
 
@@ -206,12 +207,7 @@ def createArcsFromNodeSeq(nodeSeq=None, nodes=None, initArcs=None, startArc=1, o
 	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
 		print (warningMsg)
 
-	locSeq = []
-	for i in range(len(nodeSeq)):
-		locSeq.append([
-				nodes.loc[nodes['id'] == nodeSeq[i]]['lat'].values[0],
-				nodes.loc[nodes['id'] == nodeSeq[i]]['lon'].values[0],
-			])
+	locSeq = privGetNodeLocs(nodes, nodeSeq)
 
 	arcs = privCreateArcsFromLocSeq(locSeq, initArcs, startArc, objectID, leafletColor, leafletWeight, leafletStyle, leafletOpacity, leafletCurveType, leafletCurvature, useArrows, cesiumColor, cesiumWeight, cesiumStyle, cesiumOpacity, popupText)
 
@@ -1,9 +1,15 @@
 from veroviz._common import *
 from veroviz._validation import valGetTimeDist2D
+from veroviz._validation import valExtendTimeDist2D
 
 from veroviz._getTimeDistFromLocs2D import getTimeDistFromLocs2D
+from veroviz._getTimeDistFromLocs2D import getTimeDistNeighbors2D
+from veroviz._geometry import geoNearestNeighbors
+from veroviz._nodeIndex import privGetNodeLocs
+from veroviz._timeDistMatrix import privCreateTimeDistMatrix
+from veroviz._timeDistMatrix import privTimeDistSubmatrix
 
-def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=None, outputDistUnits='meters', outputTimeUnits='seconds', routeType='euclidean2D', speedMPS=None, dataProvider=None, dataProviderArgs=None):
+def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=None, outputDistUnits='meters', outputTimeUnits='seconds', routeType='euclidean2D', speedMPS=None, dataProvider=None, dataProviderArgs=None, outputFormat='dict', k=None):
 	
 	"""
 	Generates two dictionaries; one for distance, one for time.  This is for vehicles that travel only on the ground (2-dimensional movement).
@@ -13,7 +19,7 @@ def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 	nodes: :ref:`Nodes`, Required, default as None
 		This :ref:`Nodes` dataframe contains the locations between which the travel time and distance will be calculated.
 	matrixType: string, Optional, default as 'all2all'
-		Specifies the structure of the travel matrices.  Valid options include 'all2all', 'many2one', and 'one2many'.  The default 'all2all' option will return square matrices (one for time, one for distance) describing the directed travel time and travel distance between all pairs of nodes.  The 'one2many' option will return vectors describing the directed travel from one node to all other nodes.  Similarly, the 'many2one' option will return vectors describing the directed travel from all nodes to a given node.  See the table in the note below for details.
+		Specifies the structure of the travel matrices.  Valid options include 'all2all', 'many2one', 'one2many', and 'knn'.  The default 'all2all' option will return square matrices (one for time, one for distance) describing the directed travel time and travel distance between all pairs of nodes.  The 'one2many' option will return vectors describing the directed travel from one node to all other nodes.  Similarly, the 'many2one' option will return vectors describing the directed travel from all nodes to a given node.  The 'knn' option will return sparse matrices describing the directed travel from each node to its `k` geometrically nearest nodes.  See the table in the note below for details.
 	fromNodeID: int, Optional, default as None
 		Specifies the node ID (from the `id` column of the input `nodes` dataframe) of the origin node.  This parameter is required for the 'one2many' matrix type; it is ignored by all other matrix types.  See the table in the note below for details.
 	toNodeID: int, Optional, default as None
@@ -30,13 +36,17 @@ def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 		Specifies the data source to be used for obtaining the travel data. See :ref:`Data Providers` for options and requirements.
 	dataProviderArgs: dictionary, Conditional, default as None
 		For some data providers, additional parameters are required (e.g., API keys or database names). See :ref:`Data Providers` for the additional arguments required for each supported data provider.
+	outputFormat: string, Optional, default as 'dict'
+		Specifies the type of the returned time and distance objects.  Valid options are 'dict', 'matrix', and 'matrix32'.  The default 'dict' option returns Python dictionaries.  The 'matrix' and 'matrix32' options return :class:`~veroviz._timeDistMatrix.TimeDistMatrix` objects, backed by float64 and float32 numpy arrays, respectively.  These may be indexed exactly like the dictionaries (e.g., `time[1, 2]`), but require far less memory for large matrices.  If `matrixType` is 'knn', the 'matrix' and 'matrix32' options return :class:`~veroviz._timeDistMatrix.SparseTimeDistMatrix` objects instead.
+	k: int, Conditional, default as None
+		The number of nearest nodes (by straight-line distance) for which travel times and distances are found, for each node.  This parameter is required for the 'knn' matrix type; it is ignored by all other matrix types.
 
 
 	Returns
 	-------
-	time: dictionary
+	time: dictionary or TimeDistMatrix
 		A Python dictionary containing travel times.  Time units are defined by `outputTimeUnits`.  The format of key values is: `(fromID, toID)`.  The travel time from ID 1 to ID 2 is provided by `time[1, 2]`. 
-	dist: dictionary
+	dist: dictionary or TimeDistMatrix
 		A Python dictionary containing travel distances.  Distance units are defined by `outputDistUnits`.  The format of key values is: `(fromID, toID)`.  The travel distance from ID 1 to ID 2 is provided by `dist[1, 2]`.  
 
 	Note
@@ -52,6 +62,8 @@ def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 	+----------------------+--------------+------------+------------------+
 	| 'many2one'           | ignored      | required   | Column vectors   |
 	+----------------------+--------------+------------+------------------+
+	| 'knn'                | ignored      | ignored    | Sparse matrices  |
+	+----------------------+--------------+------------+------------------+
 
 	In 'all2all', square matrices will be generated for all node pairs in the  
 	provided `nodes` dataframe.
@@ -64,6 +76,11 @@ def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 	In 'many2one', column vectors will be returned for the time and distance 
 	from all nodes in the provided `nodes` dataframe to the node indicated 
 	by `toNodeID`.
+
+	In 'knn', a spatial index is used to find the `k` nearest nodes of each
+	node.  Only those n * k pairs are requested from the data provider, so 
+	memory use and data provider queries grow with n * k, rather than n^2.  
+	Pairs that were not requested are not keys of the returned objects.
 	
 
 
@@ -140,10 +157,31 @@ def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 		...         'APIkey': ORS_API_KEY})
 		>>> [timeHours, distMiles]
 
+	Example 6 - For large problems, request array-backed matrices instead of dictionaries.  These can be indexed like dictionaries, and also converted to numpy arrays or pandas dataframes.
+		>>> [timeSec, distMeters] = vrv.getTimeDist2D(
+		...     nodes        = exampleNodes,
+		...     routeType    = 'euclidean2D',
+		...     speedMPS     = 15,
+		...     outputFormat = 'matrix')
+		>>> timeSec[1, 2]
+		>>> timeSec.to_numpy()
+		>>> distMeters.convert('miles').to_dataframe()
+
+	Example 7 - For very large problems, find the travel time/distance from each node to its 2 nearest nodes only.  With `outputFormat = 'matrix'`, the results are stored as sparse (CSR) matrices.
+		>>> [timeSec, distMeters] = vrv.getTimeDist2D(
+		...     nodes        = exampleNodes,
+		...     matrixType   = 'knn',
+		...     k            = 2,
+		...     routeType    = 'euclidean2D',
+		...     speedMPS     = 15,
+		...     outputFormat = 'matrix')
+		>>> distMeters.neighbors(1)
+		>>> distMeters.to_scipy()
+
 	"""
 
 	# validation
-	[valFlag, errorMsg, warningMsg] = valGetTimeDist2D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs)
+	[valFlag, errorMsg, warningMsg] = valGetTimeDist2D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, outputFormat, k)
 	if (not valFlag):
 		print (errorMsg)
 		return [None, None]
@@ -167,18 +205,148 @@ def getTimeDist2D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 	elif (matrixType == "many2one"):
 		fromRows = nodes['id'].tolist()
 		toCols = [toNodeID]
+	elif (matrixType == "knn"):
+		nodeIDs = nodes['id'].tolist()
+		locs = privGetNodeLocs(nodes, nodeIDs)
+		neighbors = geoNearestNeighbors(locs, k)
+
+		[time, dist] = getTimeDistNeighbors2D(locs, nodeIDs, neighbors, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, outputFormat)
+
+		return [time, dist]
 	else:
 		return 
 
 	# Specify the list of coordinations, for each coordinate, it is in [lat, lon] format
-	fromLocs = []
-	toLocs = []
-	for i in range(0, len(fromRows)):
-		fromLocs.append([nodes.loc[nodes['id'] == fromRows[i], 'lat'].values[0], nodes.loc[nodes['id'] == fromRows[i], 'lon'].values[0]])
-	for i in range(0, len(toCols)):
-		toLocs.append([nodes.loc[nodes['id'] == toCols[i], 'lat'].values[0], nodes.loc[nodes['id'] == toCols[i], 'lon'].values[0]])
+	fromLocs = privGetNodeLocs(nodes, fromRows)
+	toLocs = privGetNodeLocs(nodes, toCols)
 
 	# get time/dist
-	[time, dist] = getTimeDistFromLocs2D(fromLocs, fromRows, toLocs, toCols, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs)
+	[time, dist] = getTimeDistFromLocs2D(fromLocs, fromRows, toLocs, toCols, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, outputFormat)
+
+	return [time, dist]
+
+def extendTimeDist2D(time=None, dist=None, oldNodes=None, newNodes=None, outputDistUnits='meters', outputTimeUnits='seconds', routeType='euclidean2D', speedMPS=None, dataProvider=None, dataProviderArgs=None, outputFormat='dict'):
+	
+	"""
+	Extends existing 'all2all' travel time and distance matrices to include additional nodes.  Only the rows and columns of the new nodes are requested from the data provider (from each new node to every node, and from every existing node to each new node), so the cost of an update grows with the number of new nodes, rather than with the total number of nodes.
+
+	Parameters
+	----------
+	time: dictionary or TimeDistMatrix, Required, default as None
+		The travel time matrix for `oldNodes`, as returned by :meth:`~veroviz.getTimeDist2D.getTimeDist2D` with `matrixType='all2all'`.
+	dist: dictionary or TimeDistMatrix, Required, default as None
+		The travel distance matrix for `oldNodes`, as returned by :meth:`~veroviz.getTimeDist2D.getTimeDist2D` with `matrixType='all2all'`.
+	oldNodes: :ref:`Nodes`, Required, default as None
+		The :ref:`Nodes` dataframe from which `time` and `dist` were generated.
+	newNodes: :ref:`Nodes`, Required, default as None
+		A :ref:`Nodes` dataframe containing the nodes to be added.  Nodes whose IDs are already in `oldNodes` are ignored, so this may either contain only the new nodes or be the complete (updated) :ref:`Nodes` dataframe.
+	outputDistUnits: string, Optional, default as 'meters'
+		Specifies the desired distance units for the function's output.  If `dist` is a dictionary, it must already be in these units.  See :ref:`Units` for options and abbreviations.
+	outputTimeUnits: string, Optional, default as 'seconds'
+		Specifies the desired time units for the function's output.  If `time` is a dictionary, it must already be in these units.  See :ref:`Units` for options and abbreviations.
+	routeType: string, Optional, default as 'euclidean2D'
+		This describes a characteristic of the travel mode.  This should match the `routeType` used to generate `time` and `dist`.  See :meth:`~veroviz.getTimeDist2D.getTimeDist2D` for options.
+	speedMPS: float, Conditional, default as None
+		Speed of the vehicle, in units of meters per second.  See :meth:`~veroviz.getTimeDist2D.getTimeDist2D` for details.
+	dataProvider: string, Conditional, default as None
+		Specifies the data source to be used for obtaining the travel data.  This should match the data provider used to generate `time` and `dist`.  See :ref:`Data Providers` for options and requirements.
+	dataProviderArgs: dictionary, Conditional, default as None
+		For some data providers, additional parameters are required (e.g., API keys or database names). See :ref:`Data Providers` for the additional arguments required for each supported data provider.
+	outputFormat: string, Optional, default as 'dict'
+		Specifies the type of the returned time and distance objects.  Valid options are 'dict', 'matrix', and 'matrix32'.  See :meth:`~veroviz.getTimeDist2D.getTimeDist2D` for details.
+
+	Returns
+	-------
+	time: dictionary or TimeDistMatrix
+		Travel times between all pairs of nodes in `oldNodes` and `newNodes`.  The format of key values is: `(fromID, toID)`.
+	dist: dictionary or TimeDistMatrix
+		Travel distances between all pairs of nodes in `oldNodes` and `newNodes`.  The format of key values is: `(fromID, toID)`.
+
+	Note
+	----
+	The coordinates of existing nodes are assumed not to have changed.  Values for pairs of existing nodes are copied from `time` and `dist` without being re-queried.
+
+	Examples
+	--------
+	Import veroviz and check if the version is up-to-date
+	    >>> import veroviz as vrv
+	    >>> vrv.checkVersion()
+
+	Generate time and distance matrices for three nodes:
+	    >>> exampleNodes = vrv.createNodesFromLocs(locs=[
+	    ...     [42.1538, -78.4253], 
+	    ...     [42.3465, -78.6234], 
+	    ...     [42.6343, -78.1146]])
+	    >>> [timeSec, distMeters] = vrv.getTimeDist2D(
+	    ...     nodes        = exampleNodes,
+	    ...     routeType    = 'fastest',
+	    ...     dataProvider = 'OSRM-online')
+
+	Add two more nodes.  Only the travel times/distances to and from nodes 4 and 5 are requested from the data provider:
+	    >>> moreNodes = vrv.createNodesFromLocs(
+	    ...     locs      = [[42.2538, -78.5253], [42.5465, -78.3234]],
+	    ...     startNode = 4)
+	    >>> [timeSec, distMeters] = vrv.extendTimeDist2D(
+	    ...     time         = timeSec,
+	    ...     dist         = distMeters,
+	    ...     oldNodes     = exampleNodes,
+	    ...     newNodes     = moreNodes,
+	    ...     routeType    = 'fastest',
+	    ...     dataProvider = 'OSRM-online')
+	    >>> timeSec[4, 1]
+	"""
+
+	# validation
+	[valFlag, errorMsg, warningMsg] = valExtendTimeDist2D(time, dist, oldNodes, newNodes, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, outputFormat)
+	if (not valFlag):
+		print (errorMsg)
+		return [None, None]
+	elif (config['VRV_SETTING_SHOWWARNINGMESSAGE'] and warningMsg != ""):
+		print (warningMsg)
+
+	try:
+		outputDistUnits = outputDistUnits.lower()
+	except:
+		pass
+
+	try:
+		outputTimeUnits = outputTimeUnits.lower()
+	except:
+		pass
+
+	oldIDs = oldNodes['id'].tolist()
+	oldIDSet = set(oldIDs)
+	newIDs = [nodeID for nodeID in newNodes['id'].tolist() if (nodeID not in oldIDSet)]
+	allIDs = oldIDs + newIDs
+
+	oldLocs = privGetNodeLocs(oldNodes, oldIDs)
+	newLocs = privGetNodeLocs(newNodes, newIDs)
+
+	numOld = len(oldIDs)
+	timeValues = np.empty((len(allIDs), len(allIDs)), dtype=np.float64)
+	distValues = np.empty((len(allIDs), len(allIDs)), dtype=np.float64)
+
+	# Existing pairs are copied, not re-queried
+	timeValues[:numOld, :numOld] = privTimeDistSubmatrix(time, oldIDs, oldIDs, outputTimeUnits)
+	distValues[:numOld, :numOld] = privTimeDistSubmatrix(dist, oldIDs, oldIDs, outputDistUnits)
+
+	if (len(newIDs) > 0):
+		# From each new node to every node (a one2many query if there is only one new node)
+		newRows = getTimeDistFromLocs2D(newLocs, newIDs, oldLocs + newLocs, allIDs, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, 'matrix')
+		if (newRows is None):
+			return [None, None]
+		timeValues[numOld:, :] = newRows[0].to_numpy()
+		distValues[numOld:, :] = newRows[1].to_numpy()
+
+		# From every existing node to each new node (a many2one query if there is only one new node)
+		if (numOld > 0):
+			newCols = getTimeDistFromLocs2D(oldLocs, oldIDs, newLocs, newIDs, outputDistUnits, outputTimeUnits, routeType, speedMPS, dataProvider, dataProviderArgs, 'matrix')
+			if (newCols is None):
+				return [None, None]
+			timeValues[:numOld, numOld:] = newCols[0].to_numpy()
+			distValues[:numOld, numOld:] = newCols[1].to_numpy()
+
+	time = privCreateTimeDistMatrix(timeValues, allIDs, allIDs, outputTimeUnits, 'time', outputFormat)
+	dist = privCreateTimeDistMatrix(distValues, allIDs, allIDs, outputDistUnits, 'distance', outputFormat)
 
 	return [time, dist]
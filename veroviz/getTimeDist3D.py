@@ -1,14 +1,17 @@
 from veroviz._common import *
 from veroviz._validation import *
 
-from veroviz._buildFlightProfile import buildNoLoiteringFlight
-from veroviz._buildFlightProfile import getTimeDistFromFlight
+from veroviz._buildFlightProfile import getTimeDistFromFlightArray
 
 from veroviz._utilities import privConvertDistance
 from veroviz._utilities import privConvertTime
 
+from veroviz._timeDistMatrix import privCreateTimeDistMatrix
+
+from veroviz._nodeIndex import privGetNodeCoords
+
 def getTimeDist3D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=None, takeoffSpeedMPS=None, cruiseSpeedMPS=None, landSpeedMPS=None, cruiseAltMetersAGL=None,
-	routeType='square',	climbRateMPS=None, descentRateMPS=None, outputDistUnits='meters', outputTimeUnits='seconds'):
+	routeType='square',	climbRateMPS=None, descentRateMPS=None, outputDistUnits='meters', outputTimeUnits='seconds', outputFormat='dict'):
 
 	"""
 	This function calculates travel time and distance for vehicles that travel in 3-dimensional space (e.g., drones).  The function returns three dictionaries; one for time, one for ground distance, and one for overall (3D) travel distance.
@@ -41,14 +44,16 @@ def getTimeDist3D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 		Specifies the desired distance units for the function's output.  Valid values are 'meters', 'm', 'kilometers', 'km', 'miles', 'mi', 'feet', 'ft', 'nm', and 'nmi' (nautical miles). See :ref:`Units` for options and abbreviations.
 	outputTimeUnits: string, Optional, default as 'seconds'
 		Specifies the desired time units for the function's output.  Valid values are 'seconds', 'hours', and 'minutes'. See :ref:`Units` for options and abbreviations.
+	outputFormat: string, Optional, default as 'dict'
+		Specifies the type of the returned time and distance objects.  Valid options are 'dict', 'matrix', and 'matrix32'.  The default 'dict' option returns Python dictionaries.  The 'matrix' and 'matrix32' options return :class:`~veroviz._timeDistMatrix.TimeDistMatrix` objects, backed by float64 and float32 numpy arrays, respectively.  These may be indexed exactly like the dictionaries (e.g., `totalTime[1, 2]`), but require far less memory for large matrices.
 	
 	Returns
 	-------
-	totalTime: dictionary
+	totalTime: dictionary or TimeDistMatrix
 		A Python dictionary containing travel times.  Time units are defined by `outputTimeUnits`.  The format of key values is: `(fromID, toID)`.  The travel time from ID 1 to ID 2 is provided by `time[1, 2]`. 
-	totalGroundDistance: dictionary
+	totalGroundDistance: dictionary or TimeDistMatrix
 		A Python dictionary containing ground travel distances (i.e., ignoring any vertical distances).  Distance units are defined by `outputDistUnits`.  The format of key values is: `(fromID, toID)`.  The horizontal-only travel distance from ID 1 to ID 2 is provided by `totalGroundDistance[1, 2]`.  
-	totalFlightDistance: dictionary
+	totalFlightDistance: dictionary or TimeDistMatrix
 		A Python dictionary containing total travel distances (i.e., including both the horizontal and vertical components of flight).  Distance units are defined by `outputDistUnits`.  The format of key values is: `(fromID, toID)`.  The total travel distance from ID 1 to ID 2 is provided by `totalFlightDistance[1, 2]`.  
 
 	Note
@@ -77,6 +82,12 @@ def getTimeDist3D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 	from all nodes in the provided `nodes` dataframe to the node indicated 
 	by `toNodeID`.
 
+	The travel matrices are directed; since climbing and descending may 
+	differ, the flight from node 1 to node 2 need not take as long as the 
+	flight from node 2 to node 1.  No 'square' or 'trapezoidal' flight 
+	profile can be built for some pairs of nodes (e.g., if the origin node 
+	is above `cruiseAltMetersAGL`); their travel times and distances are NaN.
+
 
 	Examples
 	--------
@@ -126,7 +137,7 @@ def getTimeDist3D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 	"""
 
 	# validation
-	[valFlag, errorMsg, warningMsg] = valGetTimeDist3D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, takeoffSpeedMPS, climbRateMPS, cruiseSpeedMPS, cruiseAltMetersAGL, landSpeedMPS, descentRateMPS)
+	[valFlag, errorMsg, warningMsg] = valGetTimeDist3D(nodes, matrixType, fromNodeID, toNodeID, outputDistUnits, outputTimeUnits, routeType, takeoffSpeedMPS, climbRateMPS, cruiseSpeedMPS, cruiseAltMetersAGL, landSpeedMPS, descentRateMPS, outputFormat)
 	if (not valFlag):
 		print (errorMsg)
 		return [None, None, None]
@@ -153,55 +164,21 @@ def getTimeDist3D(nodes=None, matrixType='all2all', fromNodeID=None, toNodeID=No
 	else:
 		return 
 
-	# Specify the list of coordinations, for each coordinate, it is in [lat, lon, alt] format
-	fromLocs = []
-	toLocs = []
-	for i in range(0, len(fromIDs)):
-		fromLocs.append([
-			float(nodes.loc[nodes['id'] == fromIDs[i], 'lat']), 
-			float(nodes.loc[nodes['id'] == fromIDs[i], 'lon']), 
-			float(nodes.loc[nodes['id'] == fromIDs[i], 'altMeters'])])
-	for i in range(0, len(toIDs)):
-		toLocs.append([
-			float(nodes.loc[nodes['id'] == toIDs[i], 'lat']), 
-			float(nodes.loc[nodes['id'] == toIDs[i], 'lon']), 
-			float(nodes.loc[nodes['id'] == toIDs[i], 'altMeters'])])
-
-	# Do queries to find DICTIONARIES of distance and time matrices
-	totalTimeSec = {}
-	totalGroundDistMeters = {}
-	totalFlightDistMeters = {}
-	for i in range(len(fromLocs)):
-		for j in range(i, len(toLocs)):
-			# Prepare for fields to generate flight
-			startLoc = fromLocs[i]
-			endLoc = toLocs[j]
-
-			if (i != j):
-				# The flight has no loitering
-				flight = buildNoLoiteringFlight(routeType, startLoc, cruiseAltMetersAGL, endLoc, takeoffSpeedMPS, climbRateMPS, cruiseSpeedMPS, landSpeedMPS, descentRateMPS)
-				
-				# Time and ground/flight distance, notice the matrix is symmetric
-				[time, groundDistance, flightDistance] = getTimeDistFromFlight(flight.copy())
-				totalTimeSec[i, j] = time
-				totalTimeSec[j, i] = time
-				totalGroundDistMeters[i, j] = groundDistance
-				totalGroundDistMeters[j, i] = groundDistance
-				totalFlightDistMeters[i, j] = flightDistance
-				totalFlightDistMeters[j, i] = flightDistance
-			else:
-				totalTimeSec[i, j] = 0
-				totalGroundDistMeters[i, j] = 0
-				totalFlightDistMeters[i, j] = 0
-
-	# Rename the keyvalues by fromRows and toCols and reset output units
-	totalTime = {}
-	totalGroundDistance = {}
-	totalFlightDistance = {}
-	for i in range(len(fromIDs)):
-		for j in range(len(toIDs)):
-			totalTime[fromIDs[i], toIDs[j]] = totalTimeSec[i, j] * privConvertTime(1.0, 's', outputTimeUnits)
-			totalGroundDistance[fromIDs[i], toIDs[j]] = totalGroundDistMeters[i, j] * privConvertDistance(1.0, 'm', outputDistUnits)
-			totalFlightDistance[fromIDs[i], toIDs[j]] = totalFlightDistMeters[i, j] * privConvertDistance(1.0, 'm', outputDistUnits)
+	# Specify the coordinates of each node, as arrays
+	[fromLats, fromLons, fromAlts] = privGetNodeCoords(nodes, fromIDs)
+	[toLats, toLons, toAlts] = privGetNodeCoords(nodes, toIDs)
+
+	# Find time and distance arrays for all (directed) flights at once; climb and descent rates differ, so the matrices need not be symmetric
+	[time, groundDistance, flightDistance] = getTimeDistFromFlightArray(routeType, fromLats[:, None], fromLons[:, None], fromAlts[:, None], toLats[None, :], toLons[None, :], toAlts[None, :], cruiseAltMetersAGL, takeoffSpeedMPS, climbRateMPS, cruiseSpeedMPS, landSpeedMPS, descentRateMPS)
+	sameNode = (np.array(fromIDs, dtype=object)[:, None] == np.array(toIDs, dtype=object)[None, :])
+	totalTimeSec = np.where(sameNode, 0.0, time)
+	totalGroundDistMeters = np.where(sameNode, 0.0, groundDistance)
+	totalFlightDistMeters = np.where(sameNode, 0.0, flightDistance)
+
+	# Reset output units and rename the keyvalues by fromRows and toCols
+	distFactor = privConvertDistance(1.0, 'm', outputDistUnits)
+	totalTime = privCreateTimeDistMatrix(totalTimeSec * privConvertTime(1.0, 's', outputTimeUnits), fromIDs, toIDs, outputTimeUnits, 'time', outputFormat)
+	totalGroundDistance = privCreateTimeDistMatrix(totalGroundDistMeters * distFactor, fromIDs, toIDs, outputDistUnits, 'distance', outputFormat)
+	totalFlightDistance = privCreateTimeDistMatrix(totalFlightDistMeters * distFactor, fromIDs, toIDs, outputDistUnits, 'distance', outputFormat)
 
 	return [totalTime, totalGroundDistance, totalFlightDistance]
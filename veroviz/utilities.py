@@ -9,6 +9,7 @@ from veroviz._elevation import privGetElevationNodes, privGetElevationArcsAsgn
 from veroviz._weather import privGetWeather
 from veroviz._createEntitiesFromList import privCreateNodesFromLocs
 from veroviz._getTimeDistFromLocs2D import getTimeDistFromLocs2D
+from veroviz._nodeIndex import privGetNodeLocs
 from veroviz._nearestNodes import privNearestNodes
 from veroviz._utilities import privInitDataframe, privConvertDistance, privConvertTime, privConvertSpeed, privGetMapBoundary, privExportDataframe, privAssignmentsToPaths, privArcsToPaths, privClosestPointLoc2Path
 
@@ -361,7 +362,7 @@ def initDataframe(dataframeType=None):
 	Returns
 	-------
 	pandas.dataframe
-		A dataframe of the given type.  See :ref:`Nodes`, :ref:`Arcs`, and :ref:`Assignments` for details on each dataframe type.
+		A dataframe of the given type.  See :ref:`Nodes`, :ref:`Arcs`, and :ref:`Assignments` for details on each dataframe type, and :ref:`Dataframes Column Types` for the column types.
 
 	Example
 	-------
@@ -2067,12 +2068,8 @@ def nearestNodes(origin=None, nodes=None, k=1, costDict=None, metric='distance',
 		toCols = nodes[nodes['id'] != originNodeID]['id'].tolist()
 
 		# Specify lists of coordinates, in [lat, lon] format
-		fromLocs = []
-		toLocs = []
-		for i in range(0, len(fromRows)):
-			fromLocs.append([nodes.loc[nodes['id'] == fromRows[i], 'lat'].values[0], nodes.loc[nodes['id'] == fromRows[i], 'lon'].values[0]])
-		for i in range(0, len(toCols)):
-			toLocs.append([nodes.loc[nodes['id'] == toCols[i], 'lat'].values[0], nodes.loc[nodes['id'] == toCols[i], 'lon'].values[0]])
+		fromLocs = privGetNodeLocs(nodes, fromRows)
+		toLocs = privGetNodeLocs(nodes, toCols)
 
 		if (routeType in ['euclidean2D', 'manhatan']):
 			if (metric == 'distance'):
@@ -3244,15 +3241,18 @@ def createGantt(assignments=None, objectIDorder=None, separateByModelFile=False,
 		myLabel = yLabels[i]
 		y = yTicks[i]
 		if (separateByModelFile):
-			dummy = pd.DataFrame(assignments[assignments['objectID'].map(str) + ' - ' + assignments['modelFile'].map(str) == myLabel])
-			dummy['asgnIndex'] = assignments[assignments['objectID'].map(str) + ' - ' + assignments['modelFile'].map(str) == myLabel].index
+			dummy = pd.DataFrame(assignments[assignments['objectID'].map(str) + ' - ' + assignments['modelFile'].astype(str) == myLabel])
+			dummy['asgnIndex'] = assignments[assignments['objectID'].map(str) + ' - ' + assignments['modelFile'].astype(str) == myLabel].index
 		else:    
 			dummy = pd.DataFrame(assignments[assignments['objectID'].isin([myLabel])])
 			dummy['asgnIndex'] = assignments[assignments['objectID'].isin([myLabel])].index
 
 		# Replace -1 endTime:
 		dummy.loc[dummy['endTimeSec'] < 0, 'endTimeSec'] = maxEnd
-		
+
+		# Missing colors are None (not NaN, as in a `category` column):
+		dummy['ganttColor'] = dummy['ganttColor'].astype(object).where(dummy['ganttColor'].notnull(), None)
+
 		# If user doesn't want color change to trigger a break,
 		# and if a missing color name is specified,
 		# go ahead and replace missing colors now.